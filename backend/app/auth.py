@@ -3,18 +3,24 @@ Authentication system using Google OAuth
 """
 
 import os
+import select
+import threading
+import time
 import jwt
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from google.auth import transport
 from google.auth.transport import requests
 from google.oauth2 import id_token
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
 
 from .database import get_db
 from .models.user import User
+from .cache import user_cache
 
 # JWT Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -23,9 +29,78 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 # Google OAuth Configuration
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
+# Overridable so logins can be verified against a local stub (see benchmarks/google_stub.py)
+GOOGLE_CERTS_URL = os.getenv("GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs")
+GOOGLE_CERTS_TIMEOUT = 10
 
 security = HTTPBearer()
 
+
+class CachedCertsRequest(transport.Request):
+    """
+    google-auth transport over one pooled HTTP session that caches GET
+    responses for as long as their Cache-Control header allows
+    """
+
+    def __init__(self, session=None):
+        self._request = requests.Request(session=session)
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.fetches = 0
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = GOOGLE_CERTS_TIMEOUT
+        if method != "GET" or body is not None:
+            return self._request(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+
+        response = self._cached(url)
+        if response is not None:
+            return response
+
+        # One fetch at a time, so an expired entry is refreshed only once
+        with self._lock:
+            response = self._cached(url)
+            if response is not None:
+                return response
+            response = self._request(url, method=method, headers=headers, timeout=timeout, **kwargs)
+            self.fetches += 1
+            max_age = _cache_max_age(response.headers)
+            if response.status == 200 and max_age > 0:
+                self._cache[url] = (time.monotonic() + max_age, response)
+            return response
+
+    def _cached(self, url):
+        entry = self._cache.get(url)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+
+def _cache_max_age(headers) -> int:
+    """
+    Seconds a response may be reused, from its Cache-Control and Age headers
+    """
+    directives = [d.strip().lower() for d in headers.get("Cache-Control", "").split(",")]
+    if "no-store" in directives or "no-cache" in directives:
+        return 0
+    for directive in directives:
+        if directive.startswith("max-age="):
+            try:
+                max_age = int(directive[len("max-age="):])
+                age = int(headers.get("Age", 0))
+            except ValueError:
+                return 0
+            return max(0, max_age - age)
+    return 0
+
+
+# Shared by every login: keeps Google's TLS connection and signing certs warm
+google_request = CachedCertsRequest()
+
+# NOTIFY channel announcing user changes (see migration 0005_users_notify)
+USERS_CHANNEL = "cepip_users"
+
 class AuthService:
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -61,7 +136,7 @@ class AuthService:
     @staticmethod
     def verify_google_token(token: str):
         try:
-            idinfo = id_token.verify_oauth2_token(token, requests.Request(), GOOGLE_CLIENT_ID)
+            idinfo = id_token.verify_token(token, google_request, GOOGLE_CLIENT_ID, certs_url=GOOGLE_CERTS_URL)
             
             if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
                 raise ValueError('Wrong issuer.')
@@ -79,63 +154,57 @@ class AuthService:
             )
 
     @staticmethod
-    def get_or_create_user(db: Session, user_info: dict):
-        # Check if this is the first user (should be admin)
-        user_count_result = db.execute(text("SELECT COUNT(*) FROM users"))
-        is_first_user = user_count_result.scalar() == 0
-        
-        # Try to find existing user
-        result = db.execute(
-            text("SELECT * FROM users WHERE google_id = :google_id OR email = :email"),
-            {"google_id": user_info["google_id"], "email": user_info["email"]}
-        )
-        existing_user = result.fetchone()
-        
-        if existing_user:
-            # Update last login
-            db.execute(
-                text("UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = :id"),
-                {"id": existing_user[0]}
-            )
-            db.commit()
-            return {
-                "id": existing_user[0],
-                "google_id": existing_user[1],
-                "email": existing_user[2],
-                "name": existing_user[3],
-                "picture": existing_user[4],
-                "is_active": existing_user[5],
-                "is_admin": existing_user[6],
-            }
-        else:
-            # Create new user (first user becomes admin)
-            user_data = {**user_info, "is_admin": is_first_user}
-            db.execute(
+    async def get_or_create_user(db: AsyncSession, user_info: dict):
+        """
+        Record a login in one round-trip: insert the user or bump last_login.
+
+        A new user becomes admin only if its statement is the one that claims
+        the users_bootstrap row (migration 0006), so concurrent first logins
+        cannot both become admin.
+        """
+        try:
+            result = await db.execute(
                 text("""
+                    WITH bootstrap AS (
+                        INSERT INTO users_bootstrap (id) VALUES (1)
+                        ON CONFLICT DO NOTHING
+                        RETURNING true AS is_admin
+                    )
                     INSERT INTO users (google_id, email, name, picture, is_active, is_admin, created_at, last_login)
-                    VALUES (:google_id, :email, :name, :picture, true, :is_admin, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                    VALUES (:google_id, :email, :name, :picture, true,
+                            COALESCE((SELECT is_admin FROM bootstrap), false), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                    ON CONFLICT (email) DO UPDATE SET last_login = CURRENT_TIMESTAMP
+                    RETURNING id, google_id, email, name, picture, is_active, is_admin
                 """),
-                user_data
+                user_info
             )
-            db.commit()
-            
-            # Get the newly created user
-            result = db.execute(
-                text("SELECT * FROM users WHERE google_id = :google_id"),
+            user = dict(result.fetchone()._mapping)
+            await db.commit()
+        except IntegrityError:
+            # The Google account is already linked to a row under another email
+            await db.rollback()
+            result = await db.execute(
+                text("""
+                    UPDATE users SET last_login = CURRENT_TIMESTAMP
+                    WHERE google_id = :google_id
+                    RETURNING id, google_id, email, name, picture, is_active, is_admin
+                """),
                 {"google_id": user_info["google_id"]}
             )
-            new_user = result.fetchone()
-            return {
-                "id": new_user[0],
-                "google_id": new_user[1],
-                "email": new_user[2],
-                "name": new_user[3],
-                "picture": new_user[4],
-                "is_active": new_user[5],
-                "is_admin": new_user[6],
-            }
+            row = result.fetchone()
+            await db.commit()
+            if row is None:
+                # The conflicting row was deleted between the two statements
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Login conflicted with a concurrent change to this account, please retry"
+                )
+            user = dict(row._mapping)
+        
+        user_cache.discard(user["email"])
+        return user
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_db)):
     token = credentials.credentials
     email = AuthService.verify_token(token)
     
@@ -151,7 +220,13 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             "is_admin": True,
         }
     
-    result = db.execute(
+    # Hot path: the token signature was verified above, the user comes from the cache
+    cached_user = user_cache.get(email)
+    if cached_user is not None:
+        return dict(cached_user)
+    
+    version = user_cache.version
+    result = await db.execute(
         text("SELECT * FROM users WHERE email = :email AND is_active = true"),
         {"email": email}
     )
@@ -163,7 +238,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             detail="User not found"
         )
     
-    return {
+    current_user = {
         "id": user[0],
         "google_id": user[1],
         "email": user[2],
@@ -172,6 +247,8 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
         "is_active": user[5],
         "is_admin": user[6],
     }
+    user_cache.set(email, current_user, version)
+    return dict(current_user)
 
 def get_current_admin_user(current_user: dict = Depends(get_current_user)):
     if not current_user["is_admin"]:
@@ -179,4 +256,43 @@ def get_current_admin_user(current_user: dict = Depends(get_current_user)):
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def start_user_cache_listener(engine):
+    """
+    Drop cached users whenever the database announces a change to them,
+    including changes made outside the API (e.g. deactivating a user by SQL)
+    """
+    thread = threading.Thread(target=_listen_user_changes, args=(engine,), name="user-cache-listener", daemon=True)
+    thread.start()
+    return thread
+
+def _listen_user_changes(engine):
+    cargs, cparams = engine.dialect.create_connect_args(engine.url)
+    while True:
+        conn = None
+        try:
+            conn = engine.dialect.connect(*cargs, **cparams)
+            conn.autocommit = True
+            cursor = conn.cursor()
+            cursor.execute(f"LISTEN {USERS_CHANNEL}")
+            cursor.close()
+            # Changes made while we were not listening are unknown
+            user_cache.invalidate()
+            
+            while True:
+                if select.select([conn], [], [], 60) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    user_cache.discard(conn.notifies.pop(0).payload)
+        except Exception as e:
+            print(f"⚠️ User cache listener error: {e}")
+            user_cache.invalidate()
+            time.sleep(5)
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
@@ -0,0 +1,118 @@
+"""
+In-process caches
+
+``VersionedCache`` is a bounded LRU cache whose entries expire after a TTL.
+Every ``invalidate()`` clears it and bumps a version number; fills started
+under an older version are dropped, so a request that read the database
+before a concurrent write cannot repopulate the cache with stale data.
+
+The cache is per worker process: with several workers, a write only
+invalidates the worker that served it and the others catch up within the TTL.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class VersionedCache:
+    """
+    Bounded TTL cache with version-checked fills
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value, or None when missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None) -> bool:
+        """
+        Store a value; ignored when ``version`` is older than the current one
+        """
+        with self._lock:
+            if version is not None and version != self.version:
+                return False
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return True
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Drop one entry; fills already in flight are discarded too
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self.version += 1
+
+    def invalidate(self) -> None:
+        """
+        Drop every entry and start a new version
+        """
+        with self._lock:
+            self._entries.clear()
+            self.version += 1
+
+    def stats(self) -> dict:
+        """
+        Size, version and hit/miss counters
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Dropdown lookups (GET /api/records/lookup/*)
+lookup_cache = VersionedCache(
+    maxsize=int(os.getenv("LOOKUP_CACHE_SIZE", "64")),
+    ttl=float(os.getenv("LOOKUP_CACHE_TTL", "300")),
+)
+
+# Active users resolved by get_current_user, keyed by email
+user_cache = VersionedCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "60")),
+)
+
+# GET /api/tables responses, keyed by count mode
+tables_cache = VersionedCache(
+    maxsize=4,
+    ttl=float(os.getenv("TABLES_CACHE_TTL", "30")),
+)
+
+
+def invalidate_data_caches() -> None:
+    """
+    Invalidate every cache derived from table data; called after API writes
+    """
+    lookup_cache.invalidate()
+    tables_cache.invalidate()
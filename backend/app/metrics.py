@@ -0,0 +1,212 @@
+"""
+Per-route request metrics in Prometheus text format
+
+``MetricsMiddleware`` is a plain ASGI middleware (no BaseHTTPMiddleware, no
+per-request allocations beyond one closure) that records, per method and
+route template (``/api/records/{table_name}``, never the raw path):
+
+- request counts by status code
+- a latency histogram
+- a response size histogram
+- an in-flight gauge
+- SQL statement counts and time, fed by ``QueryStatsMiddleware``
+
+Everything runs on the event loop thread, so the counters are plain dicts
+and lists without locks. The route template is read from ``scope["route"]``,
+which the router sets before calling the endpoint; the in-flight gauge reads
+it at scrape time from the scopes still being served.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+# Upper bounds of the histogram buckets (+Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Label for requests no API route matched (static files, 404s)
+OTHER_ROUTE = "other"
+
+
+class _RouteStats:
+    __slots__ = ("statuses", "latency_buckets", "latency_sum", "size_buckets", "size_sum", "db_queries", "db_seconds")
+
+    def __init__(self):
+        self.statuses: Dict[int, int] = {}
+        self.latency_buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.size_buckets: List[int] = [0] * (len(SIZE_BUCKETS) + 1)
+        self.size_sum = 0
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+class RequestMetrics:
+    """
+    Request counters keyed by (method, route template)
+    """
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], _RouteStats] = {}
+        self.in_flight: Dict[int, dict] = {}
+
+    def _route(self, method: str, route: str) -> _RouteStats:
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[(method, route)] = _RouteStats()
+        return stats
+
+    def observe(self, method: str, route: str, status: int, seconds: float, size: int) -> None:
+        stats = self._route(method, route)
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        stats.latency_buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        stats.latency_sum += seconds
+        stats.size_buckets[bisect_left(SIZE_BUCKETS, size)] += 1
+        stats.size_sum += size
+
+    def observe_db(self, method: str, route: str, queries: int, seconds: float) -> None:
+        """
+        Add one request's SQL statements (see querystats.py)
+        """
+        stats = self._route(method, route)
+        stats.db_queries += queries
+        stats.db_seconds += seconds
+
+    def in_flight_by_route(self) -> Dict[Tuple[str, str], int]:
+        counts: Dict[Tuple[str, str], int] = {}
+        for scope in list(self.in_flight.values()):
+            key = (scope["method"], route_template(scope))
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def render(self) -> List[str]:
+        lines = [
+            "# HELP cepip_http_requests_total HTTP requests by route template and status.",
+            "# TYPE cepip_http_requests_total counter",
+        ]
+        for (method, route), stats in sorted(self.routes.items()):
+            labels = _labels(method=method, route=route)
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'cepip_http_requests_total{{{labels},status="{status}"}} {count}')
+
+        lines += [
+            "# HELP cepip_http_request_duration_seconds Time from request start to the last response byte.",
+            "# TYPE cepip_http_request_duration_seconds histogram",
+        ]
+        for (method, route), stats in sorted(self.routes.items()):
+            lines += _histogram("cepip_http_request_duration_seconds", _labels(method=method, route=route),
+                                LATENCY_BUCKETS, stats.latency_buckets, stats.latency_sum)
+
+        lines += [
+            "# HELP cepip_http_response_size_bytes Response body size.",
+            "# TYPE cepip_http_response_size_bytes histogram",
+        ]
+        for (method, route), stats in sorted(self.routes.items()):
+            lines += _histogram("cepip_http_response_size_bytes", _labels(method=method, route=route),
+                                SIZE_BUCKETS, stats.size_buckets, stats.size_sum)
+
+        lines += [
+            "# HELP cepip_http_db_queries_total SQL statements issued while serving the route.",
+            "# TYPE cepip_http_db_queries_total counter",
+        ]
+        for (method, route), stats in sorted(self.routes.items()):
+            lines.append(f"cepip_http_db_queries_total{{{_labels(method=method, route=route)}}} {stats.db_queries}")
+
+        lines += [
+            "# HELP cepip_http_db_seconds_total Time spent executing SQL while serving the route.",
+            "# TYPE cepip_http_db_seconds_total counter",
+        ]
+        for (method, route), stats in sorted(self.routes.items()):
+            lines.append(f"cepip_http_db_seconds_total{{{_labels(method=method, route=route)}}} {stats.db_seconds}")
+
+        lines += [
+            "# HELP cepip_http_requests_in_flight Requests currently being served.",
+            "# TYPE cepip_http_requests_in_flight gauge",
+        ]
+        for (method, route), count in sorted(self.in_flight_by_route().items()):
+            lines.append(f"cepip_http_requests_in_flight{{{_labels(method=method, route=route)}}} {count}")
+        return lines
+
+
+def route_template(scope: dict) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or OTHER_ROUTE
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram(name: str, labels: str, bounds, buckets: List[int], total: float) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(bounds, buckets):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    cumulative += buckets[-1]
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+    lines.append(f"{name}_sum{{{labels}}} {total}")
+    lines.append(f"{name}_count{{{labels}}} {cumulative}")
+    return lines
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware feeding a ``RequestMetrics``
+    """
+
+    def __init__(self, app, metrics: "RequestMetrics" = None):
+        self.app = app
+        self.metrics = metrics if metrics is not None else request_metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_with_metrics(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_flight = self.metrics.in_flight
+        key = id(scope)
+        in_flight[key] = scope
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            del in_flight[key]
+            self.metrics.observe(scope["method"], route_template(scope), status, time.perf_counter() - start, size)
+
+
+def render_gauges(name: str, help_text: str, values: Dict[str, Dict[str, float]], label: str) -> List[str]:
+    """
+    One gauge family per field of ``values`` ({label value: {field: number}})
+    """
+    lines = []
+    fields = sorted({field for stats in values.values() for field, value in stats.items()
+                     if isinstance(value, (int, float))})
+    for field in fields:
+        metric = f"{name}_{field}"
+        lines += [f"# HELP {metric} {help_text} ({field}).", f"# TYPE {metric} gauge"]
+        for key, stats in sorted(values.items()):
+            value = stats.get(field)
+            if isinstance(value, (int, float)):
+                lines.append(f'{metric}{{{label}="{_escape(key)}"}} {float(value)}')
+    return lines
+
+
+# Shared by the middleware installed in main.py and the /metrics endpoint
+request_metrics = RequestMetrics()
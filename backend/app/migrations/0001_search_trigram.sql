@@ -0,0 +1,15 @@
+-- Trigram indexes backing ILIKE '%term%' searches in the records listing
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_ente_razonsocial_trgm ON ente USING gin (razonsocial gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_persona_nombre_apellido_trgm ON persona USING gin (nombre_apellido gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_persona_correo_electronico_trgm ON persona USING gin (correo_electronico gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_persona_telefono_trgm ON persona USING gin (telefono gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_parcela_parcela_trgm ON parcela USING gin (parcela gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_parcela_calle_trgm ON parcela USING gin (calle gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_consorcista_nombre_trgm ON consorcista USING gin (nombre gin_trgm_ops);
+
+-- Exact-match fast path for numeric search terms
+CREATE INDEX IF NOT EXISTS idx_ente_cuit ON ente (cuit);
+CREATE INDEX IF NOT EXISTS idx_ente_nro_socio_cepip ON ente (nro_socio_cepip);
+CREATE INDEX IF NOT EXISTS idx_consorcista_nro_consorcista ON consorcista (nro_consorcista);
@@ -0,0 +1,2 @@
+-- Per-page aggregation of persona relations looks them up by personaid
+CREATE INDEX IF NOT EXISTS idx_relacion_ente_persona_personaid ON relacion_ente_persona (personaid);
@@ -0,0 +1,100 @@
+-- Maintained parcelas/empresas counts per consorcista, kept in sync by
+-- triggers on parcela and ente so listings don't aggregate per request
+LOCK TABLE parcela, ente IN SHARE ROW EXCLUSIVE MODE;
+
+CREATE TABLE IF NOT EXISTS consorcista_counters (
+    consorcistaid INTEGER PRIMARY KEY,
+    parcelas_count INTEGER NOT NULL DEFAULT 0,
+    empresas_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION bump_consorcista_counters(p_consorcistaid INTEGER, p_parcelas INTEGER, p_empresas INTEGER)
+RETURNS void AS $$
+BEGIN
+    IF p_consorcistaid IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO consorcista_counters (consorcistaid, parcelas_count, empresas_count)
+    VALUES (p_consorcistaid, p_parcelas, p_empresas)
+    ON CONFLICT (consorcistaid) DO UPDATE
+    SET parcelas_count = consorcista_counters.parcelas_count + EXCLUDED.parcelas_count,
+        empresas_count = consorcista_counters.empresas_count + EXCLUDED.empresas_count;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION parcela_consorcista_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        UPDATE consorcista_counters SET parcelas_count = 0 WHERE parcelas_count <> 0;
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_consorcista_counters(OLD.consorcistaid, -1, 0);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        PERFORM bump_consorcista_counters(NEW.consorcistaid, 1, 0);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION ente_consorcista_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        UPDATE consorcista_counters SET empresas_count = 0 WHERE empresas_count <> 0;
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_consorcista_counters(OLD.consorcistaid, 0, -1);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        PERFORM bump_consorcista_counters(NEW.consorcistaid, 0, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS parcela_consorcista_counters_write ON parcela;
+CREATE TRIGGER parcela_consorcista_counters_write
+    AFTER INSERT OR DELETE ON parcela
+    FOR EACH ROW EXECUTE FUNCTION parcela_consorcista_counters();
+
+DROP TRIGGER IF EXISTS parcela_consorcista_counters_update ON parcela;
+CREATE TRIGGER parcela_consorcista_counters_update
+    AFTER UPDATE OF consorcistaid ON parcela
+    FOR EACH ROW WHEN (OLD.consorcistaid IS DISTINCT FROM NEW.consorcistaid)
+    EXECUTE FUNCTION parcela_consorcista_counters();
+
+DROP TRIGGER IF EXISTS parcela_consorcista_counters_truncate ON parcela;
+CREATE TRIGGER parcela_consorcista_counters_truncate
+    AFTER TRUNCATE ON parcela
+    FOR EACH STATEMENT EXECUTE FUNCTION parcela_consorcista_counters();
+
+DROP TRIGGER IF EXISTS ente_consorcista_counters_write ON ente;
+CREATE TRIGGER ente_consorcista_counters_write
+    AFTER INSERT OR DELETE ON ente
+    FOR EACH ROW EXECUTE FUNCTION ente_consorcista_counters();
+
+DROP TRIGGER IF EXISTS ente_consorcista_counters_update ON ente;
+CREATE TRIGGER ente_consorcista_counters_update
+    AFTER UPDATE OF consorcistaid ON ente
+    FOR EACH ROW WHEN (OLD.consorcistaid IS DISTINCT FROM NEW.consorcistaid)
+    EXECUTE FUNCTION ente_consorcista_counters();
+
+DROP TRIGGER IF EXISTS ente_consorcista_counters_truncate ON ente;
+CREATE TRIGGER ente_consorcista_counters_truncate
+    AFTER TRUNCATE ON ente
+    FOR EACH STATEMENT EXECUTE FUNCTION ente_consorcista_counters();
+
+-- Backfill from the current assignments
+TRUNCATE consorcista_counters;
+INSERT INTO consorcista_counters (consorcistaid, parcelas_count, empresas_count)
+SELECT consorcistaid, SUM(parcelas), SUM(empresas)
+FROM (
+    SELECT consorcistaid, COUNT(*) AS parcelas, 0 AS empresas
+    FROM parcela WHERE consorcistaid IS NOT NULL GROUP BY consorcistaid
+    UNION ALL
+    SELECT consorcistaid, 0, COUNT(*)
+    FROM ente WHERE consorcistaid IS NOT NULL GROUP BY consorcistaid
+) assignments
+GROUP BY consorcistaid;
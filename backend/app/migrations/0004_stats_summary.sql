@@ -0,0 +1,250 @@
+-- Stats read model: per-table and per-flag counters kept current by
+-- statement-level triggers, so /api/stats reads a handful of rows instead of
+-- scanning the base tables. Each write statement applies one aggregated
+-- delta per metric (bulk loads stay cheap); bucketed metrics (ente.rubro,
+-- consorcista.tipo) keep one row per referenced id.
+LOCK TABLE ente, persona, relacion_ente_persona, consorcista, parcela, sector, rubro, subrubro
+    IN SHARE ROW EXCLUSIVE MODE;
+
+CREATE TABLE IF NOT EXISTS stats_summary (
+    metric TEXT NOT NULL,
+    bucket INTEGER NOT NULL DEFAULT 0,
+    value NUMERIC NOT NULL DEFAULT 0,
+    PRIMARY KEY (metric, bucket)
+);
+
+CREATE OR REPLACE FUNCTION stats_count(p_metric TEXT) RETURNS BIGINT AS $$
+    SELECT COALESCE(SUM(value), 0)::BIGINT FROM stats_summary WHERE metric = p_metric
+$$ LANGUAGE sql STABLE;
+
+-- Per-table delta functions: rows in "removed" count -1, rows in "added" +1,
+-- and metrics whose net change is zero are left untouched
+CREATE OR REPLACE FUNCTION ente_stats_apply(removed ente[], added ente[]) RETURNS void AS $$
+    INSERT INTO stats_summary AS s (metric, bucket, value)
+    SELECT d.metric, d.bucket, SUM(r.sign * d.value)
+    FROM (
+        SELECT -1 AS sign, o.* FROM unnest(removed) o
+        UNION ALL
+        SELECT 1, n.* FROM unnest(added) n
+    ) r
+    CROSS JOIN LATERAL (VALUES
+        ('ente', 0, 1),
+        ('ente.es_socio', 0, CASE WHEN r.es_socio THEN 1 ELSE 0 END),
+        ('ente.esconsorcista', 0, CASE WHEN r.esconsorcista THEN 1 ELSE 0 END),
+        ('ente.rubro', r.actividadprincipalid, 1)
+    ) d (metric, bucket, value)
+    WHERE d.bucket IS NOT NULL
+    GROUP BY d.metric, d.bucket
+    HAVING SUM(r.sign * d.value) <> 0
+    ON CONFLICT (metric, bucket) DO UPDATE SET value = s.value + EXCLUDED.value
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION persona_stats_apply(removed persona[], added persona[]) RETURNS void AS $$
+    INSERT INTO stats_summary AS s (metric, bucket, value)
+    SELECT d.metric, d.bucket, SUM(r.sign * d.value)
+    FROM (
+        SELECT -1 AS sign, o.* FROM unnest(removed) o
+        UNION ALL
+        SELECT 1, n.* FROM unnest(added) n
+    ) r
+    CROSS JOIN LATERAL (VALUES
+        ('persona', 0, 1),
+        ('persona.con_email', 0, CASE WHEN r.correo_electronico <> '' THEN 1 ELSE 0 END),
+        ('persona.con_telefono', 0, CASE WHEN r.telefono <> '' THEN 1 ELSE 0 END)
+    ) d (metric, bucket, value)
+    GROUP BY d.metric, d.bucket
+    HAVING SUM(r.sign * d.value) <> 0
+    ON CONFLICT (metric, bucket) DO UPDATE SET value = s.value + EXCLUDED.value
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION consorcista_stats_apply(removed consorcista[], added consorcista[]) RETURNS void AS $$
+    INSERT INTO stats_summary AS s (metric, bucket, value)
+    SELECT d.metric, d.bucket, SUM(r.sign * d.value)
+    FROM (
+        SELECT -1 AS sign, o.* FROM unnest(removed) o
+        UNION ALL
+        SELECT 1, n.* FROM unnest(added) n
+    ) r
+    CROSS JOIN LATERAL (VALUES
+        ('consorcista', 0, 1),
+        ('consorcista.tipo', r.tipoid, 1)
+    ) d (metric, bucket, value)
+    WHERE d.bucket IS NOT NULL
+    GROUP BY d.metric, d.bucket
+    HAVING SUM(r.sign * d.value) <> 0
+    ON CONFLICT (metric, bucket) DO UPDATE SET value = s.value + EXCLUDED.value
+$$ LANGUAGE sql;
+
+-- superficie_has_ is the text column of the production table; it is read
+-- through to_jsonb so the function does not depend on it being present
+CREATE OR REPLACE FUNCTION parcela_stats_apply(removed parcela[], added parcela[]) RETURNS void AS $$
+    INSERT INTO stats_summary AS s (metric, bucket, value)
+    SELECT d.metric, d.bucket, SUM(r.sign * d.value)
+    FROM (
+        SELECT -1 AS sign, o.* FROM unnest(removed) o
+        UNION ALL
+        SELECT 1, n.* FROM unnest(added) n
+    ) r
+    CROSS JOIN LATERAL (SELECT to_jsonb(r) ->> 'superficie_has_' AS superficie) sup
+    CROSS JOIN LATERAL (VALUES
+        ('parcela', 0, 1),
+        ('parcela.tieneplanta', 0, CASE WHEN r.tieneplanta THEN 1 ELSE 0 END),
+        ('parcela.alquilada', 0, CASE WHEN r.alquilada THEN 1 ELSE 0 END),
+        ('parcela.consorcista', 0, CASE WHEN r.consorcistaid IS NOT NULL THEN 1 ELSE 0 END),
+        ('parcela.superficie', 0,
+            CASE WHEN sup.superficie ~ '^[0-9]+(\.[0-9]+)?$' THEN sup.superficie::NUMERIC ELSE 0 END)
+    ) d (metric, bucket, value)
+    GROUP BY d.metric, d.bucket
+    HAVING SUM(r.sign * d.value) <> 0
+    ON CONFLICT (metric, bucket) DO UPDATE SET value = s.value + EXCLUDED.value
+$$ LANGUAGE sql;
+
+-- Shared statement-level trigger. With an argument it hands the transition
+-- tables to that delta function; without one it only maintains the row count.
+CREATE OR REPLACE FUNCTION stats_summary_trigger() RETURNS trigger AS $$
+DECLARE
+    removed_rows BIGINT := 0;
+    added_rows BIGINT := 0;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM stats_summary WHERE split_part(metric, '.', 1) = TG_TABLE_NAME;
+        RETURN NULL;
+    END IF;
+
+    IF TG_NARGS > 0 THEN
+        -- Transition rows are anonymous records; ROW(...)::table restores the row type
+        EXECUTE format(
+            'SELECT %I(%s, %s)',
+            TG_ARGV[0],
+            CASE WHEN TG_OP = 'INSERT' THEN '''{}'''
+                 ELSE format('ARRAY(SELECT ROW(o.*)::%I.%I FROM old_rows o)', TG_TABLE_SCHEMA, TG_TABLE_NAME) END,
+            CASE WHEN TG_OP = 'DELETE' THEN '''{}'''
+                 ELSE format('ARRAY(SELECT ROW(n.*)::%I.%I FROM new_rows n)', TG_TABLE_SCHEMA, TG_TABLE_NAME) END
+        );
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        EXECUTE 'SELECT COUNT(*) FROM old_rows' INTO removed_rows;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        EXECUTE 'SELECT COUNT(*) FROM new_rows' INTO added_rows;
+    END IF;
+    IF added_rows <> removed_rows THEN
+        INSERT INTO stats_summary AS s (metric, bucket, value)
+        VALUES (TG_TABLE_NAME, 0, added_rows - removed_rows)
+        ON CONFLICT (metric, bucket) DO UPDATE SET value = s.value + EXCLUDED.value;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Tables with flag/bucket metrics
+DROP TRIGGER IF EXISTS ente_stats_insert ON ente;
+CREATE TRIGGER ente_stats_insert AFTER INSERT ON ente REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger('ente_stats_apply');
+DROP TRIGGER IF EXISTS ente_stats_update ON ente;
+CREATE TRIGGER ente_stats_update AFTER UPDATE ON ente REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger('ente_stats_apply');
+DROP TRIGGER IF EXISTS ente_stats_delete ON ente;
+CREATE TRIGGER ente_stats_delete AFTER DELETE ON ente REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger('ente_stats_apply');
+DROP TRIGGER IF EXISTS ente_stats_truncate ON ente;
+CREATE TRIGGER ente_stats_truncate AFTER TRUNCATE ON ente
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+
+DROP TRIGGER IF EXISTS persona_stats_insert ON persona;
+CREATE TRIGGER persona_stats_insert AFTER INSERT ON persona REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger('persona_stats_apply');
+DROP TRIGGER IF EXISTS persona_stats_update ON persona;
+CREATE TRIGGER persona_stats_update AFTER UPDATE ON persona REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger('persona_stats_apply');
+DROP TRIGGER IF EXISTS persona_stats_delete ON persona;
+CREATE TRIGGER persona_stats_delete AFTER DELETE ON persona REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger('persona_stats_apply');
+DROP TRIGGER IF EXISTS persona_stats_truncate ON persona;
+CREATE TRIGGER persona_stats_truncate AFTER TRUNCATE ON persona
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+
+DROP TRIGGER IF EXISTS consorcista_stats_insert ON consorcista;
+CREATE TRIGGER consorcista_stats_insert AFTER INSERT ON consorcista REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger('consorcista_stats_apply');
+DROP TRIGGER IF EXISTS consorcista_stats_update ON consorcista;
+CREATE TRIGGER consorcista_stats_update AFTER UPDATE ON consorcista REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger('consorcista_stats_apply');
+DROP TRIGGER IF EXISTS consorcista_stats_delete ON consorcista;
+CREATE TRIGGER consorcista_stats_delete AFTER DELETE ON consorcista REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger('consorcista_stats_apply');
+DROP TRIGGER IF EXISTS consorcista_stats_truncate ON consorcista;
+CREATE TRIGGER consorcista_stats_truncate AFTER TRUNCATE ON consorcista
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+
+DROP TRIGGER IF EXISTS parcela_stats_insert ON parcela;
+CREATE TRIGGER parcela_stats_insert AFTER INSERT ON parcela REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger('parcela_stats_apply');
+DROP TRIGGER IF EXISTS parcela_stats_update ON parcela;
+CREATE TRIGGER parcela_stats_update AFTER UPDATE ON parcela REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger('parcela_stats_apply');
+DROP TRIGGER IF EXISTS parcela_stats_delete ON parcela;
+CREATE TRIGGER parcela_stats_delete AFTER DELETE ON parcela REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger('parcela_stats_apply');
+DROP TRIGGER IF EXISTS parcela_stats_truncate ON parcela;
+CREATE TRIGGER parcela_stats_truncate AFTER TRUNCATE ON parcela
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+
+-- Tables that only need their row count
+DROP TRIGGER IF EXISTS relacion_ente_persona_stats_insert ON relacion_ente_persona;
+CREATE TRIGGER relacion_ente_persona_stats_insert AFTER INSERT ON relacion_ente_persona REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+DROP TRIGGER IF EXISTS relacion_ente_persona_stats_delete ON relacion_ente_persona;
+CREATE TRIGGER relacion_ente_persona_stats_delete AFTER DELETE ON relacion_ente_persona REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+DROP TRIGGER IF EXISTS relacion_ente_persona_stats_truncate ON relacion_ente_persona;
+CREATE TRIGGER relacion_ente_persona_stats_truncate AFTER TRUNCATE ON relacion_ente_persona
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+
+DROP TRIGGER IF EXISTS sector_stats_insert ON sector;
+CREATE TRIGGER sector_stats_insert AFTER INSERT ON sector REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+DROP TRIGGER IF EXISTS sector_stats_delete ON sector;
+CREATE TRIGGER sector_stats_delete AFTER DELETE ON sector REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+DROP TRIGGER IF EXISTS sector_stats_truncate ON sector;
+CREATE TRIGGER sector_stats_truncate AFTER TRUNCATE ON sector
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+
+DROP TRIGGER IF EXISTS rubro_stats_insert ON rubro;
+CREATE TRIGGER rubro_stats_insert AFTER INSERT ON rubro REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+DROP TRIGGER IF EXISTS rubro_stats_delete ON rubro;
+CREATE TRIGGER rubro_stats_delete AFTER DELETE ON rubro REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+DROP TRIGGER IF EXISTS rubro_stats_truncate ON rubro;
+CREATE TRIGGER rubro_stats_truncate AFTER TRUNCATE ON rubro
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+
+DROP TRIGGER IF EXISTS subrubro_stats_insert ON subrubro;
+CREATE TRIGGER subrubro_stats_insert AFTER INSERT ON subrubro REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+DROP TRIGGER IF EXISTS subrubro_stats_delete ON subrubro;
+CREATE TRIGGER subrubro_stats_delete AFTER DELETE ON subrubro REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+DROP TRIGGER IF EXISTS subrubro_stats_truncate ON subrubro;
+CREATE TRIGGER subrubro_stats_truncate AFTER TRUNCATE ON subrubro
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_summary_trigger();
+
+-- Backfill from the current data through the same delta functions
+TRUNCATE stats_summary;
+SELECT ente_stats_apply('{}', ARRAY(SELECT e FROM ente e));
+SELECT persona_stats_apply('{}', ARRAY(SELECT p FROM persona p));
+SELECT consorcista_stats_apply('{}', ARRAY(SELECT c FROM consorcista c));
+SELECT parcela_stats_apply('{}', ARRAY(SELECT p FROM parcela p));
+INSERT INTO stats_summary (metric, bucket, value)
+SELECT metric, 0, total
+FROM (
+    SELECT 'relacion_ente_persona' AS metric, COUNT(*) AS total FROM relacion_ente_persona
+    UNION ALL SELECT 'sector', COUNT(*) FROM sector
+    UNION ALL SELECT 'rubro', COUNT(*) FROM rubro
+    UNION ALL SELECT 'subrubro', COUNT(*) FROM subrubro
+) counts
+WHERE total <> 0;
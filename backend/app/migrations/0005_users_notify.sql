@@ -0,0 +1,38 @@
+-- Notify API workers when a user's access changes (activation, admin flag,
+-- email...) so their cached user lookups are dropped; last_login updates
+-- from every login are deliberately not announced
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    google_id VARCHAR(255) UNIQUE,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    name VARCHAR(255),
+    picture TEXT,
+    is_active BOOLEAN DEFAULT true,
+    is_admin BOOLEAN DEFAULT false,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION users_notify_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('cepip_users', OLD.email);
+    IF TG_OP = 'UPDATE' AND NEW.email IS DISTINCT FROM OLD.email THEN
+        PERFORM pg_notify('cepip_users', NEW.email);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_notify_update ON users;
+CREATE TRIGGER users_notify_update
+    AFTER UPDATE ON users
+    FOR EACH ROW WHEN (
+        (OLD.email, OLD.google_id, OLD.name, OLD.picture, OLD.is_active, OLD.is_admin)
+        IS DISTINCT FROM (NEW.email, NEW.google_id, NEW.name, NEW.picture, NEW.is_active, NEW.is_admin)
+    )
+    EXECUTE FUNCTION users_notify_change();
+
+DROP TRIGGER IF EXISTS users_notify_delete ON users;
+CREATE TRIGGER users_notify_delete
+    AFTER DELETE ON users
+    FOR EACH ROW EXECUTE FUNCTION users_notify_change();
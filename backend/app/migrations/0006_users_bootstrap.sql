@@ -0,0 +1,13 @@
+-- Single-row claim that makes "the first user becomes admin" atomic: the
+-- login upsert inserts id 1 and only the insert that wins gets is_admin.
+-- Installations that already have users start with the slot claimed.
+LOCK TABLE users IN SHARE ROW EXCLUSIVE MODE;
+
+CREATE TABLE IF NOT EXISTS users_bootstrap (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    claimed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO users_bootstrap (id)
+SELECT 1 WHERE EXISTS (SELECT 1 FROM users)
+ON CONFLICT DO NOTHING;
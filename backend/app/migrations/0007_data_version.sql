@@ -0,0 +1,58 @@
+-- Database-wide data version, so caches of derived artifacts (report files)
+-- can key on it across workers. The version is a counter row updated by
+-- every transaction that writes a CEPIP table: it becomes visible together
+-- with the data. Readers take the version before the data, so a file is
+-- never stored under a version newer than the data it was rendered from.
+--
+-- The row triggers are deferred to COMMIT and bump once per transaction
+-- (guarded by a transaction-local setting), so writers lock the counter
+-- only while committing and never while holding it wait on another lock.
+-- Constraint triggers cannot fire on TRUNCATE; that bump is immediate.
+CREATE TABLE IF NOT EXISTS data_version_counter (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version BIGINT NOT NULL
+);
+
+INSERT INTO data_version_counter (id, version) VALUES (1, 1)
+ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+BEGIN
+    IF current_setting('cepip.data_version_xact', true) IS DISTINCT FROM txid_current()::text THEN
+        UPDATE data_version_counter SET version = version + 1 WHERE id = 1;
+        PERFORM set_config('cepip.data_version_xact', txid_current()::text, true);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION data_version() RETURNS BIGINT AS $$
+    SELECT version FROM data_version_counter WHERE id = 1
+$$ LANGUAGE sql STABLE;
+
+DO $$
+DECLARE
+    table_name TEXT;
+BEGIN
+    FOREACH table_name IN ARRAY ARRAY[
+        'area', 'camara', 'cargo', 'consorcista', 'ente', 'anotaciones', 'parcela', 'parcela_alquilada',
+        'persona', 'relacion_ente_camara', 'relacion_ente_persona', 'relacion_ente_sindicato', 'rubro',
+        'sector', 'sindicato', 'subrubro', 'tipo_consorcista', 'calle', 'accesos_ente', 'condomino'
+    ] LOOP
+        IF to_regclass(table_name) IS NULL THEN
+            CONTINUE;
+        END IF;
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', table_name || '_data_version', table_name);
+        EXECUTE format(
+            'CREATE CONSTRAINT TRIGGER %I AFTER INSERT OR UPDATE OR DELETE ON %I '
+            'DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION bump_data_version()',
+            table_name || '_data_version', table_name
+        );
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', table_name || '_data_version_truncate', table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER TRUNCATE ON %I FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version()',
+            table_name || '_data_version_truncate', table_name
+        );
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,9 @@
+-- Date-bucketed activity reports group the rows loaded in a range by
+-- date_trunc(fecha_de_carga); with these indexes each table is read by one
+-- (index-only) range scan. parcela carries consorcistaid so assigned
+-- parcelas are counted from the index too.
+CREATE INDEX IF NOT EXISTS idx_ente_fecha_de_carga ON ente (fecha_de_carga);
+CREATE INDEX IF NOT EXISTS idx_persona_fecha_de_carga ON persona (fecha_de_carga);
+CREATE INDEX IF NOT EXISTS idx_relacion_ente_persona_fecha_de_carga ON relacion_ente_persona (fecha_de_carga);
+CREATE INDEX IF NOT EXISTS idx_parcela_fecha_de_carga ON parcela (fecha_de_carga) INCLUDE (consorcistaid);
+CREATE INDEX IF NOT EXISTS idx_consorcista_fecha_de_carga ON consorcista (fecha_de_carga);
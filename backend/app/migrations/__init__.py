@@ -0,0 +1,73 @@
+"""
+Managed SQL migrations
+
+Each ``NNNN_name.sql`` file in this package is applied once, in order, and
+recorded in the ``schema_migrations`` table.
+"""
+
+import os
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Advisory lock key so concurrent workers don't apply the same migration twice
+MIGRATIONS_LOCK_KEY = 7420010
+
+
+def get_migration_files():
+    """
+    List migration files in the order they must be applied
+    """
+    return sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith(".sql"))
+
+
+def run_migrations(engine: Engine):
+    """
+    Apply pending migrations and return the versions applied
+    """
+    applied_now = []
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATIONS_LOCK_KEY})
+        conn.commit()
+        try:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version VARCHAR(255) PRIMARY KEY,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+            conn.commit()
+
+            applied = {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+            for filename in get_migration_files():
+                version = filename[:-len(".sql")]
+                if version in applied:
+                    continue
+
+                with open(os.path.join(MIGRATIONS_DIR, filename), encoding="utf-8") as f:
+                    sql = f.read()
+                # Plain DBAPI cursor: multi-statement scripts, no param interpolation
+                cursor = conn.connection.cursor()
+                try:
+                    cursor.execute(sql)
+                finally:
+                    cursor.close()
+                conn.execute(
+                    text("INSERT INTO schema_migrations (version) VALUES (:version)"),
+                    {"version": version}
+                )
+                conn.commit()
+                applied_now.append(version)
+                print(f"✅ Applied migration: {version}")
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATIONS_LOCK_KEY})
+            conn.commit()
+
+    return applied_now
@@ -0,0 +1,36 @@
+"""
+Cursor (keyset) pagination helpers
+"""
+
+import base64
+import json
+
+from fastapi import HTTPException
+
+from .search import MAX_INTEGER
+
+
+def encode_cursor(table_name: str, last_id: int) -> str:
+    """
+    Build an opaque cursor pointing just after the given primary key
+    """
+    payload = json.dumps([table_name, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, table_name: str) -> int:
+    """
+    Decode a cursor produced by encode_cursor for the same table
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_table, last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # bool is an int subclass; ids are bound as INTEGER, so stay within int4
+    if (cursor_table != table_name or isinstance(last_id, bool) or not isinstance(last_id, int)
+            or not 0 <= last_id <= MAX_INTEGER):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return last_id
@@ -0,0 +1,176 @@
+"""
+Connection pool settings and metrics
+
+Both engines (sync psycopg2 and async asyncpg) read their pool settings from
+the environment and use a metered ``QueuePool`` that counts checkouts, waits
+for a free connection, overflow checkouts and timeouts. ``pool_stats()``
+reports them together with the live pool gauges; size the pool so that
+``DB_POOL_SIZE + DB_MAX_OVERFLOW`` per worker, times the uvicorn workers,
+stays under the server's ``max_connections``.
+"""
+
+import os
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+def _flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+def pool_settings() -> dict:
+    """
+    create_engine() pool arguments from DB_POOL_* environment variables.
+
+    Pre-ping and a 30 minute recycle are on by default so connections
+    dropped by a database restart or an idle timeout are replaced instead
+    of failing the request that picks them up.
+    """
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": _flag("DB_POOL_PRE_PING", "true"),
+    }
+
+
+class PoolMetrics:
+    """
+    Counters for one engine's pool
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, overflow: bool, waited: bool, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            if overflow:
+                self.overflow_checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_seconds += seconds
+                self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def record_timeout(self, seconds: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.waits += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "waits": self.waits,
+                "wait_seconds": round(self.wait_seconds, 6),
+                "max_wait_seconds": round(self.max_wait_seconds, 6),
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+
+
+class _MeteredPoolMixin:
+    """
+    Records every checkout in ``self.metrics``.
+
+    A checkout waits when every connection, overflow included, is already
+    checked out; it counts as overflow when the base pool is exhausted.
+    """
+
+    metrics = None
+
+    def _do_get(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super()._do_get()
+
+        checked_out = self.checkedout()
+        max_overflow = self._max_overflow
+        overflow = checked_out >= self.size()
+        waited = max_overflow > -1 and checked_out >= self.size() + max_overflow
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            metrics.record_timeout(time.perf_counter() - start)
+            raise
+        metrics.record_checkout(overflow, waited, time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Metrics of every instrumented engine, by name
+POOL_METRICS = {}
+
+_ENGINES = {}
+
+
+def instrument_pool(name: str, engine) -> PoolMetrics:
+    """
+    Start collecting metrics for a (sync) engine created with a metered pool
+    """
+    metrics = PoolMetrics()
+    engine.pool.metrics = metrics
+    event.listen(engine, "connect", lambda dbapi_connection, record: metrics.record_connect())
+    event.listen(engine, "invalidate", lambda dbapi_connection, record, exception: metrics.record_invalidation())
+    POOL_METRICS[name] = metrics
+    _ENGINES[name] = engine
+    return metrics
+
+
+def pool_stats() -> dict:
+    """
+    Settings, live gauges and counters of every instrumented pool
+    """
+    stats = {}
+    for name, engine in _ENGINES.items():
+        pool = engine.pool
+        stats[name] = {
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "recycle": pool._recycle,
+            "pre_ping": pool._pre_ping,
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+            **POOL_METRICS[name].snapshot(),
+        }
+    return stats
@@ -0,0 +1,123 @@
+"""
+Per-request SQL accounting
+
+``instrument_engine`` hooks SQLAlchemy's cursor events on an engine (for the
+async engine, its ``sync_engine``) to time every statement. Statements run
+while ``QueryStatsMiddleware`` is serving a request are added to that
+request's ``QueryStats`` (a ContextVar, so it follows the request into
+SQLAlchemy's greenlets and into threadpool routes). The middleware then:
+
+- adds ``Server-Timing: db;dur=<ms>;desc="<n> queries"`` to every response,
+  plus ``X-Query-Count`` in development
+- adds the request's totals to the per-route DB metrics of ``/metrics``
+
+Statements slower than ``SLOW_QUERY_MS`` are logged to the
+``cepip.slow_query`` logger with their normalized SQL and route.
+"""
+
+import logging
+import os
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from .metrics import RequestMetrics, request_metrics, route_template
+
+# Statements at least this slow go to the slow-query log (0 logs every statement)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+
+# X-Query-Count is only sent in development
+DEBUG_HEADERS = os.getenv("ENVIRONMENT") == "development"
+
+slow_query_log = logging.getLogger("cepip.slow_query")
+
+
+class QueryStats:
+    """
+    Statements issued while serving one request
+    """
+
+    __slots__ = ("scope", "count", "seconds")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Statement shape for the log: literals replaced by ?, whitespace collapsed
+    """
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._cepip_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - context._cepip_query_start
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += seconds
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        route = route_template(stats.scope) if stats is not None and stats.scope is not None else "-"
+        slow_query_log.warning("slow query %.1f ms route=%s sql=%s", seconds * 1000, route, normalize_sql(statement))
+
+
+def instrument_engine(engine) -> None:
+    """
+    Count and time the statements of a (sync) engine
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware collecting the SQL statements of each request
+    """
+
+    def __init__(self, app, metrics: Optional[RequestMetrics] = None):
+        self.app = app
+        self.metrics = metrics if metrics is not None else request_metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = current_query_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries"'.encode(),
+                ))
+                if DEBUG_HEADERS:
+                    headers.append((b"x-query-count", str(stats.count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            self.metrics.observe_db(scope["method"], route_template(scope), stats.count, stats.seconds)
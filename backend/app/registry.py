@@ -0,0 +1,387 @@
+"""
+Registry of the CEPIP entities served by the API
+
+Each entity is described once: table, primary key, joins, searchable
+fields, boolean filters and column metadata. Every SQL variant the records
+listing can need is compiled into a reusable ``text()`` construct when this
+module is imported, so a request only picks a statement and binds params.
+"""
+
+from itertools import product
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from .search import numeric_term, search_condition
+
+# Raw filter values accepted by the listing (anything else means "no filter")
+FILTER_VALUES = {"true": True, "false": False}
+
+FILTER_STATES = (None, True, False)
+
+DEFAULT_PAGE_TEMPLATE = """
+    SELECT {select}
+    FROM {source}
+    {{where}}
+    ORDER BY {pk_column}
+    LIMIT :limit OFFSET :offset
+"""
+
+
+class ListingStatements:
+    """
+    Precompiled statements for one listing variant
+    """
+
+    __slots__ = ("page", "count", "estimate")
+
+    def __init__(self, page, count, estimate):
+        self.page = page
+        self.count = count
+        self.estimate = estimate
+
+
+class Entity:
+    """
+    Declarative description of a table exposed by the records API
+    """
+
+    def __init__(
+        self,
+        name: str,
+        primary_key: str,
+        alias: Optional[str] = None,
+        select: str = "*",
+        joins: str = "",
+        page_template: Optional[str] = None,
+        search_text=(),
+        search_numeric=(),
+        filters: Optional[Dict[str, tuple]] = None,
+        columns=None,
+        label: Optional[str] = None,
+        description: Optional[str] = None,
+        schema_columns=None,
+        stats_label: Optional[str] = None,
+        deletable: bool = False,
+    ):
+        self.name = name
+        self.primary_key = primary_key
+        self.alias = alias
+        self.pk_column = f"{alias}.{primary_key}" if alias else primary_key
+        self.base = f"{name} {alias}" if alias else name
+        self.search_text = tuple(search_text)
+        self.search_numeric = tuple(search_numeric)
+        # filter name -> (condition when 'true', condition when 'false')
+        self.filters = filters or {}
+        self.columns = columns or []
+        self.label = label
+        self.description = description
+        self.schema_columns = schema_columns
+        self.stats_label = stats_label
+        self.deletable = deletable
+
+        if page_template is None:
+            page_template = DEFAULT_PAGE_TEMPLATE.format(
+                select=select,
+                source=f"{self.base} {joins}".strip(),
+                pk_column=self.pk_column,
+            )
+        self.page_template = page_template
+
+        self.exists = text(f"SELECT 1 FROM {name} WHERE {primary_key} = :record_id")
+        self.delete = text(f"DELETE FROM {name} WHERE {primary_key} = :record_id")
+        self.statements = self._compile_listing()
+
+    def _search_modes(self):
+        if not self.search_text:
+            return (None,)
+        if self.search_numeric:
+            return (None, "text", "numeric")
+        return (None, "text")
+
+    def _compile_listing(self):
+        """
+        Compile every (search mode, filter states, keyset) listing variant
+        """
+        statements = {}
+
+        for search_mode in self._search_modes():
+            for states in product(FILTER_STATES, repeat=len(self.filters)):
+                conditions = []
+                if search_mode:
+                    numeric_columns = self.search_numeric if search_mode == "numeric" else ()
+                    conditions.append(search_condition(self.search_text, numeric_columns))
+                for (when_true, when_false), state in zip(self.filters.values(), states):
+                    if state is not None:
+                        conditions.append(when_true if state else when_false)
+
+                # Filters only reference the base table, so counts skip the joins
+                where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                count = text(f"SELECT COUNT(*) FROM {self.base} {where_sql}")
+                estimate = text(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {self.base} {where_sql}")
+
+                for keyset in (False, True):
+                    page_conditions = conditions + [f"{self.pk_column} > :after_id"] if keyset else conditions
+                    page_where_sql = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+                    page = text(self.page_template.format(where=page_where_sql))
+                    statements[(search_mode, states, keyset)] = ListingStatements(page, count, estimate)
+
+        return statements
+
+    def listing(self, search: Optional[str], filter_values: Dict[str, Optional[str]], after_id: Optional[int],
+                limit: int, offset: int):
+        """
+        Pick the precompiled listing statements for a request and bind its params
+        """
+        params: Dict[str, Any] = {"limit": limit, "offset": offset}
+
+        search_mode = None
+        if search and self.search_text:
+            search_mode = "text"
+            params["search"] = f"%{search}%"
+            if self.search_numeric:
+                number = numeric_term(search)
+                if number is not None:
+                    search_mode = "numeric"
+                    params["search_number"] = number
+
+        states = tuple(FILTER_VALUES.get(filter_values.get(name)) for name in self.filters)
+
+        if after_id is not None:
+            params["after_id"] = after_id
+
+        return self.statements[(search_mode, states, after_id is not None)], params
+
+
+ENTITIES = {
+    entity.name: entity
+    for entity in (
+        Entity(
+            "ente",
+            primary_key="enteid",
+            alias="e",
+            select="e.*, s.sector as sector_nombre, r.rubro as rubro_nombre, sr.subrubro as subrubro_nombre",
+            joins="""
+                LEFT JOIN subrubro sr ON e.actividadprincipalid = sr.subrubroid
+                LEFT JOIN rubro r ON sr.rubroid = r.rubroid
+                LEFT JOIN sector s ON r.sectorid = s.sectorid
+            """,
+            search_text=["e.razonsocial"],
+            search_numeric=["e.cuit", "e.nro_socio_cepip"],
+            filters={
+                "es_socio": ("e.es_socio = true", "e.es_socio = false"),
+                "esconsorcista": ("e.esconsorcista = true", "e.esconsorcista = false"),
+            },
+            columns=[
+                {"name": "enteid", "label": "ID", "type": "number"},
+                {"name": "razonsocial", "label": "Razón Social", "type": "text"},
+                {"name": "cuit", "label": "CUIT", "type": "number"},
+                {"name": "nro_socio_cepip", "label": "N° Socio CEPIP", "type": "number"},
+                {"name": "sector_nombre", "label": "Sector", "type": "text"},
+                {"name": "rubro_nombre", "label": "Rubro", "type": "text"},
+                {"name": "es_socio", "label": "Es Socio", "type": "boolean"},
+                {"name": "esconsorcista", "label": "Es Consorcista", "type": "boolean"},
+                {"name": "web", "label": "Web", "type": "text"}
+            ],
+            label="Entes (Empresas)",
+            description="Empresas y entidades del parque industrial",
+            schema_columns=[
+                {"name": "enteid", "label": "ID", "type": "number", "primary_key": True},
+                {"name": "razonsocial", "label": "Razón Social", "type": "text"},
+                {"name": "cuit", "label": "CUIT", "type": "number"},
+                {"name": "nro_socio_cepip", "label": "N° Socio CEPIP", "type": "number"},
+                {"name": "web", "label": "Sitio Web", "type": "text"},
+                {"name": "es_socio", "label": "Es Socio", "type": "boolean"},
+                {"name": "esconsorcista", "label": "Es Consorcista", "type": "boolean"}
+            ],
+            stats_label="entes",
+            deletable=True,
+        ),
+        Entity(
+            "persona",
+            primary_key="personaid",
+            alias="p",
+            # Filter and paginate on persona alone, then aggregate empresas and
+            # cargos only for the personas in the page
+            page_template="""
+                SELECT p.*, rel.empresas, rel.cargos
+                FROM (
+                    SELECT p.* FROM persona p
+                    {where}
+                    ORDER BY p.personaid
+                    LIMIT :limit OFFSET :offset
+                ) p
+                LEFT JOIN LATERAL (
+                    SELECT STRING_AGG(DISTINCT e.razonsocial, ', ' ORDER BY e.razonsocial) as empresas,
+                           STRING_AGG(DISTINCT c.cargo, ', ' ORDER BY c.cargo) as cargos
+                    FROM relacion_ente_persona rep
+                    LEFT JOIN ente e ON rep.enteid = e.enteid
+                    LEFT JOIN cargo c ON rep.cargoid = c.cargoid
+                    WHERE rep.personaid = p.personaid
+                ) rel ON true
+                ORDER BY p.personaid
+            """,
+            search_text=["p.nombre_apellido", "p.correo_electronico", "p.telefono"],
+            filters={
+                "con_email": (
+                    "(p.correo_electronico IS NOT NULL AND p.correo_electronico != '')",
+                    "(p.correo_electronico IS NULL OR p.correo_electronico = '')",
+                ),
+            },
+            columns=[
+                {"name": "personaid", "label": "ID", "type": "number"},
+                {"name": "nombre_apellido", "label": "Nombre y Apellido", "type": "text"},
+                {"name": "correo_electronico", "label": "Email", "type": "email"},
+                {"name": "telefono", "label": "Teléfono", "type": "text"},
+                {"name": "celular", "label": "Celular", "type": "text"},
+                {"name": "empresas", "label": "Empresas", "type": "text"},
+                {"name": "cargos", "label": "Cargos", "type": "text"}
+            ],
+            label="Personas",
+            description="Personas asociadas a las empresas",
+            schema_columns=[
+                {"name": "personaid", "label": "ID", "type": "number", "primary_key": True},
+                {"name": "nombre_apellido", "label": "Nombre y Apellido", "type": "text"},
+                {"name": "telefono", "label": "Teléfono", "type": "text"},
+                {"name": "celular", "label": "Celular", "type": "text"},
+                {"name": "correo_electronico", "label": "Email", "type": "email"}
+            ],
+            stats_label="personas",
+            deletable=True,
+        ),
+        Entity(
+            "consorcista",
+            primary_key="consorcistaid",
+            alias="c",
+            # parcelas/empresas counts are maintained by triggers (migration 0003)
+            select="""c.*,
+                      tc.tipo as tipo_nombre,
+                      COALESCE(cc.parcelas_count, 0) as parcelas_count,
+                      COALESCE(cc.empresas_count, 0) as empresas_count""",
+            joins="""
+                LEFT JOIN tipo_consorcista tc ON c.tipoid = tc.tipoconsorcistaid
+                LEFT JOIN consorcista_counters cc ON c.consorcistaid = cc.consorcistaid
+            """,
+            search_text=["c.nombre"],
+            search_numeric=["c.nro_consorcista"],
+            columns=[
+                {"name": "consorcistaid", "label": "ID", "type": "number"},
+                {"name": "nombre", "label": "Nombre", "type": "text"},
+                {"name": "nro_consorcista", "label": "N° Consorcista", "type": "number"},
+                {"name": "tipo_nombre", "label": "Tipo", "type": "text"},
+                {"name": "parcelas_count", "label": "Parcelas", "type": "number"},
+                {"name": "empresas_count", "label": "Empresas", "type": "number"},
+                {"name": "fecha_de_carga", "label": "Fecha Carga", "type": "date"}
+            ],
+            label="Consorcistas",
+            description="Consorcistas del parque industrial",
+            schema_columns=[
+                {"name": "consorcistaid", "label": "ID", "type": "number", "primary_key": True},
+                {"name": "nombre", "label": "Nombre", "type": "text"},
+                {"name": "nro_consorcista", "label": "N° Consorcista", "type": "number"},
+                {"name": "fecha_de_carga", "label": "Fecha de Carga", "type": "date"}
+            ],
+            stats_label="consorciatas",
+            deletable=True,
+        ),
+        Entity(
+            "parcela",
+            primary_key="parcelaid",
+            alias="p",
+            select="p.*, c.nombre as consorcista_nombre",
+            joins="LEFT JOIN consorcista c ON p.consorcistaid = c.consorcistaid",
+            search_text=["p.parcela", "p.calle"],
+            filters={
+                "tieneplanta": ("p.tieneplanta = true", "p.tieneplanta = false"),
+                "alquilada": ("p.alquilada = true", "p.alquilada = false"),
+            },
+            columns=[
+                {"name": "parcelaid", "label": "ID", "type": "number"},
+                {"name": "parcela", "label": "Parcela", "type": "text"},
+                {"name": "calle", "label": "Calle", "type": "text"},
+                {"name": "numero", "label": "Número", "type": "number"},
+                {"name": "superficie_has", "label": "Superficie (ha)", "type": "number"},
+                {"name": "tieneplanta", "label": "Tiene Planta", "type": "boolean"},
+                {"name": "alquilada", "label": "Alquilada", "type": "boolean"},
+                {"name": "consorcista_nombre", "label": "Consorcista", "type": "text"}
+            ],
+            label="Parcelas",
+            description="Parcelas del parque industrial",
+            schema_columns=[
+                {"name": "parcelaid", "label": "ID", "type": "number", "primary_key": True},
+                {"name": "parcela", "label": "Parcela", "type": "text"},
+                {"name": "calle", "label": "Calle", "type": "text"},
+                {"name": "numero", "label": "Número", "type": "number"},
+                {"name": "superficie_has", "label": "Superficie (ha)", "type": "number"},
+                {"name": "tieneplanta", "label": "Tiene Planta", "type": "boolean"},
+                {"name": "alquilada", "label": "Alquilada", "type": "boolean"}
+            ],
+            stats_label="parcelas",
+            deletable=True,
+        ),
+        Entity(
+            "sector",
+            primary_key="sectorid",
+            label="Sectores",
+            description="Sectores económicos",
+            schema_columns=[
+                {"name": "sectorid", "label": "ID", "type": "number", "primary_key": True},
+                {"name": "sector", "label": "Sector", "type": "text"}
+            ],
+            stats_label="sectores",
+            deletable=True,
+        ),
+        Entity("rubro", primary_key="rubroid", stats_label="rubros"),
+        Entity("subrubro", primary_key="subrubroid", stats_label="subrubros"),
+        Entity("area", primary_key="areaid"),
+        Entity("cargo", primary_key="cargoid"),
+        Entity("camara", primary_key="camaraid"),
+        Entity("sindicato", primary_key="sindicatoid"),
+    )
+}
+
+# Entities described by GET /api/tables
+SCHEMA_ENTITIES = [entity for entity in ENTITIES.values() if entity.schema_columns]
+
+# Entities counted by GET /api/stats
+STATS_ENTITIES = [entity for entity in ENTITIES.values() if entity.stats_label]
+
+
+class Lookup:
+    """
+    Dropdown list served by GET /api/records/lookup
+
+    ``fields`` maps each key of a response item to its column. The list is
+    compiled into a single JSON aggregate expression, so any number of
+    lookups can be fetched together in one SELECT.
+    """
+
+    def __init__(self, name: str, key: str, table: str, fields: Dict[str, str], order_by: str):
+        self.name = name
+        self.key = key
+        pairs = ", ".join(f"'{field}', {column}" for field, column in fields.items())
+        self.expression = (
+            f"COALESCE((SELECT json_agg(json_build_object({pairs}) ORDER BY {order_by}) "
+            f"FROM {table}), '[]'::json)"
+        )
+
+
+LOOKUPS = {
+    lookup.name: lookup
+    for lookup in (
+        Lookup("empresas", "empresas", "ente", {"id": "enteid", "name": "razonsocial"}, "razonsocial"),
+        Lookup("cargos", "cargos", "cargo", {"id": "cargoid", "name": "cargo"}, "cargo"),
+        Lookup("areas", "areas", "area", {"id": "areaid", "name": "area"}, "area"),
+        Lookup("consorcistas", "consorcistas", "consorcista", {"id": "consorcistaid", "name": "nombre"}, "nombre"),
+        Lookup("tipos-consorcista", "tipos", "tipo_consorcista", {"id": "tipoconsorcistaid", "name": "tipo"}, "tipo"),
+        Lookup("camaras", "camaras", "camara", {"id": "camaraid", "name": "camara"}, "camara"),
+        Lookup(
+            "sindicatos",
+            "sindicatos",
+            "sindicato",
+            {"id": "sindicatoid", "siglas": "siglas", "name": "sindicato"},
+            "sindicato",
+        ),
+        Lookup("calles", "calles", "calle", {"id": "calleid", "name": "calle"}, "calle"),
+    )
+}
@@ -0,0 +1,261 @@
+"""
+Report files (CSV, XLSX, PDF) and their on-disk cache
+
+A report is the JSON document built by routes/reports.py. ``report_sections``
+flattens it into titled tables: the scalar fields of an object become a
+Campo/Valor table and every list of objects becomes a table of its own, so
+new report types export without changes here.
+
+Rendered files are kept in ``REPORTS_CACHE_DIR``, named after a hash of the
+report type, parameters, format, day and the database data version
+(migration 0007_data_version). Every committed write to a CEPIP table
+moves the version, so a file is served again only the same day and while
+the data it was rendered from is unchanged; the least recently served
+files beyond ``REPORTS_CACHE_MAX_FILES`` are deleted.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import xlsxwriter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+# (file extension, media type) per export format of GET /api/reports/{type}/export/{format}
+EXPORT_FORMATS = {
+    "csv": ("csv", "text/csv; charset=utf-8"),
+    "excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "pdf": ("pdf", "application/pdf"),
+}
+
+Section = Tuple[str, List[str], List[list]]
+
+# Starts every CSV export: the BOM lets Excel detect UTF-8 (accents in names
+# and razones sociales)
+CSV_BOM = "\ufeff"
+
+
+def _label(key: str) -> str:
+    text = str(key).replace("_", " ")
+    return text[:1].upper() + text[1:]
+
+
+def report_sections(report: Dict[str, Any]) -> List[Section]:
+    """
+    (title, column labels, rows) tables of a report document
+    """
+    sections: List[Section] = []
+
+    def add(name: str, value: Any):
+        if isinstance(value, dict):
+            scalars = [[_label(key), item] for key, item in value.items() if not isinstance(item, (dict, list))]
+            if scalars:
+                sections.append((name, ["Campo", "Valor"], scalars))
+            for key, item in value.items():
+                if isinstance(item, (dict, list)):
+                    add(_label(key), item)
+        elif value and all(isinstance(item, dict) for item in value):
+            columns = list(dict.fromkeys(key for item in value for key in item))
+            sections.append((name, [_label(column) for column in columns],
+                             [[item.get(column) for column in columns] for item in value]))
+        else:
+            sections.append((name, ["Valor"], [[item] for item in value]))
+
+    add("Reporte", {key: value for key, value in report.items() if key != "title"})
+    return sections
+
+
+def csv_cells(row) -> list:
+    """
+    CSV cells of a row, shared by every CSV export: booleans as true/false
+    (the listing's filter values); csv writes None as an empty field
+    """
+    return ["true" if value is True else "false" if value is False else value for value in row]
+
+
+def render_csv(report: Dict[str, Any], path: str) -> None:
+    """
+    Sections one after another, each with its title row and header
+    """
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(CSV_BOM)
+        writer = csv.writer(f)
+        writer.writerow([report.get("title", "Reporte")])
+        for title, columns, rows in report_sections(report):
+            writer.writerow([])
+            writer.writerow([title])
+            writer.writerow(columns)
+            writer.writerows(csv_cells(row) for row in rows)
+
+
+def render_xlsx(report: Dict[str, Any], path: str) -> None:
+    """
+    One worksheet per section, written row by row in constant-memory mode
+    """
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    try:
+        bold = workbook.add_format({"bold": True})
+        used = set()
+        for title, columns, rows in report_sections(report):
+            # Sheet names: at most 31 characters, unique, without []:*?/\
+            name = "".join(c for c in title if c not in "[]:*?/\\")[:31] or "Hoja"
+            base, n = name, 2
+            while name.lower() in used:
+                suffix = f" ({n})"
+                name, n = base[:31 - len(suffix)] + suffix, n + 1
+            used.add(name.lower())
+
+            sheet = workbook.add_worksheet(name)
+            sheet.set_column(0, max(len(columns) - 1, 0), 18)
+            sheet.write_row(0, 0, columns, bold)
+            for row_number, row in enumerate(rows, 1):
+                sheet.write_row(row_number, 0, row)
+    finally:
+        workbook.close()
+
+
+def _pdf_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "Sí" if value else "No"
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    return str(value)
+
+
+def render_pdf(report: Dict[str, Any], path: str) -> None:
+    """
+    Title plus one table per section; wide sections switch to landscape
+    """
+    sections = report_sections(report)
+    widest = max((len(columns) for _, columns, _ in sections), default=1)
+    pagesize = landscape(A4) if widest > 5 else A4
+    styles = getSampleStyleSheet()
+    table_style = TableStyle([
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#e9ecef")),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ])
+
+    story = [Paragraph(report.get("title", "Reporte"), styles["Title"])]
+    for title, columns, rows in sections:
+        story.append(Paragraph(title, styles["Heading2"]))
+        data = [columns] + [[_pdf_value(value) for value in row] for row in rows]
+        story.append(Table(data, repeatRows=1, style=table_style, hAlign="LEFT"))
+        story.append(Spacer(1, 0.5 * cm))
+
+    SimpleDocTemplate(path, pagesize=pagesize, title=report.get("title", "Reporte"),
+                      leftMargin=1.5 * cm, rightMargin=1.5 * cm).build(story)
+
+
+RENDERERS: Dict[str, Callable[[Dict[str, Any], str], None]] = {
+    "csv": render_csv,
+    "excel": render_xlsx,
+    "pdf": render_pdf,
+}
+
+
+class ReportFileCache:
+    """
+    Rendered report files on local disk, keyed by report, parameters,
+    format, day and data version
+    """
+
+    def __init__(self, directory: str, max_files: int = 200):
+        self.directory = directory
+        self.max_files = max_files
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def path(self, report_type: str, parameters: Dict[str, Any], export_format: str, version: int,
+             day: date) -> str:
+        # The day the file is rendered for: reports default their periods to
+        # the current day or month and stamp generated_at
+        key = json.dumps([report_type, parameters, export_format, version, day], sort_keys=True, default=str)
+        digest = hashlib.sha256(key.encode()).hexdigest()[:24]
+        return os.path.join(self.directory, f"{report_type}-{digest}.{EXPORT_FORMATS[export_format][0]}")
+
+    def get(self, path: str) -> Optional[str]:
+        """
+        The cached file, or None; a hit marks it as recently served
+        """
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def store(self, path: str, render: Callable[[str], None]) -> str:
+        """
+        Render into a temporary file and move it into place atomically, so
+        concurrent exports never serve a partial file
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            render(temporary)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self.prune(keep=path)
+        return path
+
+    def _files(self) -> List[os.DirEntry]:
+        try:
+            return [entry for entry in os.scandir(self.directory)
+                    if entry.is_file() and not entry.name.endswith(".tmp")]
+        except FileNotFoundError:
+            return []
+
+    def prune(self, keep: Optional[str] = None) -> None:
+        """
+        Delete the least recently served files beyond ``max_files``
+        """
+        files = sorted(self._files(), key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:max(len(files) - self.max_files, 0)]:
+            if entry.path == keep:
+                continue
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        """
+        File count, disk usage and hit/miss counters
+        """
+        files = self._files()
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "size": len(files),
+                "maxsize": self.max_files,
+                "bytes": sum(entry.stat().st_size for entry in files),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+report_files = ReportFileCache(
+    os.getenv("REPORTS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "cepip-reports")),
+    max_files=int(os.getenv("REPORTS_CACHE_MAX_FILES", "200")),
+)
@@ -3,8 +3,9 @@ Authentication routes
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from datetime import timedelta
 
@@ -22,16 +23,16 @@ class LoginResponse(BaseModel):
     user: dict
 
 @router.post("/google", response_model=LoginResponse)
-async def google_auth(token_request: GoogleTokenRequest, db: Session = Depends(get_db)):
+async def google_auth(token_request: GoogleTokenRequest, db: AsyncSession = Depends(get_db)):
     """
     Authenticate with Google OAuth token
     """
     try:
-        # Verify Google token
-        user_info = AuthService.verify_google_token(token_request.token)
+        # Verify Google token (may fetch certificates, so keep it off the event loop)
+        user_info = await run_in_threadpool(AuthService.verify_google_token, token_request.token)
         
         # Get or create user in database
-        user = AuthService.get_or_create_user(db, user_info)
+        user = await AuthService.get_or_create_user(db, user_info)
         
         # Create access token
         access_token_expires = timedelta(minutes=60*24)  # 24 hours
@@ -99,7 +100,7 @@ async def auth_config():
     }
 
 @router.post("/dev-login")
-async def dev_login(db: Session = Depends(get_db)):
+async def dev_login(db: AsyncSession = Depends(get_db)):
     """
     Development-only login endpoint for local testing
     """
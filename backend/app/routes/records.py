@@ -2,18 +2,68 @@
 Records API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
+import csv
+import hashlib
+import io
 import json
 import os
 
-from ..database import get_db
+from ..database import AsyncSessionLocal, get_db
 from ..auth import get_current_user
+from ..pagination import encode_cursor, decode_cursor
+from ..cache import lookup_cache, invalidate_data_caches
+from ..registry import ENTITIES, LOOKUPS
+from ..report_files import CSV_BOM, csv_cells
 
 router = APIRouter()
 
+# Rows fetched per round trip of the export's server-side cursor
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# ente and persona ids are assigned as MAX(id) + 1 (the imported rows bypassed
+# their sequences); concurrent creates hold this transaction lock so they
+# cannot pick the same id
+NEXT_ID_LOCK = text("SELECT pg_advisory_xact_lock(:key)")
+NEXT_ID_LOCK_KEYS = {"ente": 7420011, "persona": 7420012}
+
+@router.get("/lookup")
+async def get_lookups(
+    request: Request,
+    names: str = Query(..., description="Comma-separated lookup names, e.g. empresas,cargos,areas"),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get several dropdown lookups in one request, keyed by name
+    """
+    try:
+        requested = list(dict.fromkeys(name.strip() for name in names.split(",") if name.strip()))
+        if not requested:
+            raise HTTPException(status_code=400, detail="No lookups requested")
+        unknown = [name for name in requested if name not in LOOKUPS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown lookups: {', '.join(unknown)}")
+        
+        entries = await _load_lookups(requested, db)
+        body = _json_body({name: entries[name][0] for name in requested})
+        etag = '"' + hashlib.sha1("".join(entries[name][2] for name in requested).encode()).hexdigest() + '"'
+        return _conditional_response(body, etag, request)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{table_name}")
 async def get_records(
     table_name: str,
@@ -25,217 +75,75 @@ async def get_records(
     con_email: Optional[str] = Query(None, description="Filter by has email (true/false)"),
     tieneplanta: Optional[str] = Query(None, description="Filter by tiene planta (true/false)"),
     alquilada: Optional[str] = Query(None, description="Filter by alquilada (true/false)"),
-    db: Session = Depends(get_db),
+    after: Optional[str] = Query(None, description="Cursor from pagination.next_cursor (keyset mode, ignores page)"),
+    count: str = Query("exact", pattern="^(exact|estimate|none)$", description="Total count mode: exact, estimate or none"),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Get paginated records from a table
+    Get paginated records from a table.
+
+    Pages by LIMIT/OFFSET by default; passing ``after`` switches to keyset
+    mode, which seeks on the primary key so every page costs the same.
+    ``count`` controls the total: ``exact`` runs COUNT(*), ``estimate`` uses
+    the planner's row estimate and ``none`` skips it (rely on ``has_more``).
     """
     try:
-        # Validate table name to prevent SQL injection
-        valid_tables = ['ente', 'persona', 'consorcista', 'parcela', 'sector', 'rubro', 'subrubro', 'area', 'cargo', 'camara', 'sindicato']
-        if table_name not in valid_tables:
+        # Only registered entities can be listed (prevents SQL injection)
+        entity = ENTITIES.get(table_name)
+        if entity is None:
             raise HTTPException(status_code=404, detail="Table not found")
         
-        # Calculate offset
-        offset = (page - 1) * limit
+        # Calculate offset (keyset mode seeks instead of skipping rows)
+        offset = 0 if after else (page - 1) * limit
+        after_id = decode_cursor(after, table_name) if after else None
         
-        # Build WHERE conditions based on filters
-        where_conditions = []
-        params = {"limit": limit, "offset": offset}
+        # Pick the precompiled statements for this combination of filters;
+        # one extra row is fetched to know whether there is a next page
+        filter_values = {
+            "es_socio": es_socio,
+            "esconsorcista": esconsorcista,
+            "con_email": con_email,
+            "tieneplanta": tieneplanta,
+            "alquilada": alquilada
+        }
+        statements, params = entity.listing(search, filter_values, after_id, limit + 1, offset)
         
-        def build_filters(table_name, search, es_socio, esconsorcista, con_email, tieneplanta, alquilada):
-            conditions = []
-            
-            if table_name == 'ente':
-                if search:
-                    conditions.append("(e.razonsocial ILIKE :search OR CAST(e.cuit AS TEXT) ILIKE :search)")
-                    params["search"] = f"%{search}%"
-                if es_socio in ['true', 'false']:
-                    conditions.append("e.es_socio = :es_socio")
-                    params["es_socio"] = es_socio == 'true'
-                if esconsorcista in ['true', 'false']:
-                    conditions.append("e.esconsorcista = :esconsorcista")
-                    params["esconsorcista"] = esconsorcista == 'true'
-                    
-            elif table_name == 'persona':
-                if search:
-                    conditions.append("(p.nombre_apellido ILIKE :search OR p.correo_electronico ILIKE :search OR p.telefono ILIKE :search)")
-                    params["search"] = f"%{search}%"
-                if con_email in ['true', 'false']:
-                    if con_email == 'true':
-                        conditions.append("(p.correo_electronico IS NOT NULL AND p.correo_electronico != '')")
-                    else:
-                        conditions.append("(p.correo_electronico IS NULL OR p.correo_electronico = '')")
-                        
-            elif table_name == 'consorcista':
-                if search:
-                    conditions.append("(c.nombre ILIKE :search OR CAST(c.nro_consorcista AS TEXT) ILIKE :search)")
-                    params["search"] = f"%{search}%"
-                    
-            elif table_name == 'parcela':
-                if search:
-                    conditions.append("(p.parcela ILIKE :search OR p.calle ILIKE :search)")
-                    params["search"] = f"%{search}%"
-                if tieneplanta in ['true', 'false']:
-                    conditions.append("p.tieneplanta = :tieneplanta")
-                    params["tieneplanta"] = tieneplanta == 'true'
-                if alquilada in ['true', 'false']:
-                    conditions.append("p.alquilada = :alquilada")
-                    params["alquilada"] = alquilada == 'true'
-                    
-            return " AND ".join(conditions)
-        
-        where_clause = build_filters(table_name, search, es_socio, esconsorcista, con_email, tieneplanta, alquilada)
-        where_sql = f" WHERE {where_clause}" if where_clause else ""
+        result = await db.execute(statements.page, params)
         
-        # Get total count with filters
-        if table_name == 'ente':
-            count_query = f"""
-                SELECT COUNT(*) FROM ente e 
-                LEFT JOIN subrubro sr ON e.actividadprincipalid = sr.subrubroid 
-                LEFT JOIN rubro r ON sr.rubroid = r.rubroid 
-                LEFT JOIN sector s ON r.sectorid = s.sectorid 
-                {where_sql}
-            """
-        elif table_name == 'persona':
-            count_query = f"SELECT COUNT(*) FROM persona p {where_sql}"
-        elif table_name == 'consorcista':
-            count_query = f"SELECT COUNT(*) FROM consorcista c {where_sql}"
-        elif table_name == 'parcela':
-            count_query = f"SELECT COUNT(*) FROM parcela p {where_sql}"
-        else:
-            count_query = f"SELECT COUNT(*) FROM {table_name} {where_sql}"
-            
-        count_result = db.execute(text(count_query), params)
-        total = count_result.scalar()
-        
-        # Get paginated data with JOINs for better display
-        if table_name == 'parcela':
-            # Join with consorcista to get the name
-            query = f"""
-                SELECT p.*, c.nombre as consorcista_nombre 
-                FROM parcela p 
-                LEFT JOIN consorcista c ON p.consorcistaid = c.consorcistaid 
-                {where_sql}
-                ORDER BY p.parcelaid 
-                LIMIT :limit OFFSET :offset
-            """
-        elif table_name == 'ente':
-            # Join with sector and rubro for empresas (through subrubro)
-            query = f"""
-                SELECT e.*, s.sector as sector_nombre, r.rubro as rubro_nombre, sr.subrubro as subrubro_nombre
-                FROM ente e 
-                LEFT JOIN subrubro sr ON e.actividadprincipalid = sr.subrubroid 
-                LEFT JOIN rubro r ON sr.rubroid = r.rubroid 
-                LEFT JOIN sector s ON r.sectorid = s.sectorid 
-                {where_sql}
-                ORDER BY e.enteid 
-                LIMIT :limit OFFSET :offset
-            """
-        elif table_name == 'persona':
-            # Join with relaciones to get empresas and cargos
-            having_clause = ""
-            if where_clause:
-                # For persona, we need to use HAVING instead of WHERE because of GROUP BY
-                having_clause = f" HAVING {where_clause.replace('WHERE ', '')}"
-                where_sql = ""  # Clear WHERE since we use HAVING
-            
-            query = f"""
-                SELECT p.*, 
-                       STRING_AGG(DISTINCT e.razonsocial, ', ' ORDER BY e.razonsocial) as empresas,
-                       STRING_AGG(DISTINCT c.cargo, ', ' ORDER BY c.cargo) as cargos
-                FROM persona p 
-                LEFT JOIN relacion_ente_persona rep ON p.personaid = rep.personaid 
-                LEFT JOIN ente e ON rep.enteid = e.enteid 
-                LEFT JOIN cargo c ON rep.cargoid = c.cargoid 
-                GROUP BY p.personaid, p.fecha_de_carga, p.nombre_apellido, p.telefono, p.celular, p.correo_electronico, p.consorcistaid
-                {having_clause}
-                ORDER BY p.personaid 
-                LIMIT :limit OFFSET :offset
-            """
-        elif table_name == 'consorcista':
-            # Join with tipo and count parcelas/empresas
-            having_clause = ""
-            if where_clause:
-                # For consorcista, we need to use HAVING instead of WHERE because of GROUP BY
-                having_clause = f" HAVING {where_clause.replace('WHERE ', '')}"
-                where_sql = ""  # Clear WHERE since we use HAVING
-                
-            query = f"""
-                SELECT c.*, 
-                       tc.tipo as tipo_nombre,
-                       COUNT(DISTINCT p.parcelaid) as parcelas_count,
-                       COUNT(DISTINCT e.enteid) as empresas_count
-                FROM consorcista c 
-                LEFT JOIN tipo_consorcista tc ON c.tipoid = tc.tipoconsorcistaid 
-                LEFT JOIN parcela p ON c.consorcistaid = p.consorcistaid 
-                LEFT JOIN ente e ON c.consorcistaid = e.consorcistaid 
-                GROUP BY c.consorcistaid, c.nombre, c.nro_consorcista, c.tipoid, c.fecha_de_carga, tc.tipo
-                {having_clause}
-                ORDER BY c.consorcistaid 
-                LIMIT :limit OFFSET :offset
-            """
-        else:
-            query = f"SELECT * FROM {table_name} {where_sql} ORDER BY 1 LIMIT :limit OFFSET :offset"
+        # Convert to list of dictionaries
+        data = _rows_to_dicts(result.keys(), result.fetchall())
         
-        result = db.execute(text(query), params)
+        has_more = len(data) > limit
+        data = data[:limit]
+        next_cursor = encode_cursor(table_name, data[-1][entity.primary_key]) if has_more else None
         
-        # Convert to list of dictionaries
-        columns = result.keys()
-        data = [dict(zip(columns, row)) for row in result.fetchall()]
-        
-        # Define column metadata for each table
-        table_columns = {
-            'ente': [
-                {"name": "enteid", "label": "ID", "type": "number"},
-                {"name": "razonsocial", "label": "Razón Social", "type": "text"},
-                {"name": "cuit", "label": "CUIT", "type": "number"},
-                {"name": "nro_socio_cepip", "label": "N° Socio CEPIP", "type": "number"},
-                {"name": "sector_nombre", "label": "Sector", "type": "text"},
-                {"name": "rubro_nombre", "label": "Rubro", "type": "text"},
-                {"name": "es_socio", "label": "Es Socio", "type": "boolean"},
-                {"name": "esconsorcista", "label": "Es Consorcista", "type": "boolean"},
-                {"name": "web", "label": "Web", "type": "text"}
-            ],
-            'persona': [
-                {"name": "personaid", "label": "ID", "type": "number"},
-                {"name": "nombre_apellido", "label": "Nombre y Apellido", "type": "text"},
-                {"name": "correo_electronico", "label": "Email", "type": "email"},
-                {"name": "telefono", "label": "Teléfono", "type": "text"},
-                {"name": "celular", "label": "Celular", "type": "text"},
-                {"name": "empresas", "label": "Empresas", "type": "text"},
-                {"name": "cargos", "label": "Cargos", "type": "text"}
-            ],
-            'consorcista': [
-                {"name": "consorcistaid", "label": "ID", "type": "number"},
-                {"name": "nombre", "label": "Nombre", "type": "text"},
-                {"name": "nro_consorcista", "label": "N° Consorcista", "type": "number"},
-                {"name": "tipo_nombre", "label": "Tipo", "type": "text"},
-                {"name": "parcelas_count", "label": "Parcelas", "type": "number"},
-                {"name": "empresas_count", "label": "Empresas", "type": "number"},
-                {"name": "fecha_de_carga", "label": "Fecha Carga", "type": "date"}
-            ],
-            'parcela': [
-                {"name": "parcelaid", "label": "ID", "type": "number"},
-                {"name": "parcela", "label": "Parcela", "type": "text"},
-                {"name": "calle", "label": "Calle", "type": "text"},
-                {"name": "numero", "label": "Número", "type": "number"},
-                {"name": "superficie_has", "label": "Superficie (ha)", "type": "number"},
-                {"name": "tieneplanta", "label": "Tiene Planta", "type": "boolean"},
-                {"name": "alquilada", "label": "Alquilada", "type": "boolean"},
-                {"name": "consorcista_nombre", "label": "Consorcista", "type": "text"}
-            ]
-        }
+        # Get total count with filters
+        if count == 'exact':
+            total = (await db.execute(statements.count, params)).scalar()
+        elif count == 'estimate':
+            if not has_more and not after:
+                # Last page reached by offset: the total is known for free
+                total = offset + len(data)
+            else:
+                plan = (await db.execute(statements.estimate, params)).scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                total = max(int(plan[0]["Plan"]["Plan Rows"]), offset + len(data))
+        else:
+            total = None
         
         return {
             "data": data,
-            "columns": table_columns.get(table_name, []),
+            "columns": entity.columns,
             "pagination": {
                 "page": page,
                 "limit": limit,
                 "total": total,
-                "pages": (total + limit - 1) // limit
+                "pages": (total + limit - 1) // limit if total is not None else None,
+                "count": count,
+                "has_more": has_more,
+                "next_cursor": next_cursor
             }
         }
         
@@ -244,72 +152,237 @@ async def get_records(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{table_name}/export")
+async def export_records(
+    table_name: str,
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="Export format: csv or ndjson"),
+    search: Optional[str] = Query(None, description="Search term"),
+    es_socio: Optional[str] = Query(None, description="Filter by es_socio (true/false)"),
+    esconsorcista: Optional[str] = Query(None, description="Filter by esconsorcista (true/false)"),
+    con_email: Optional[str] = Query(None, description="Filter by has email (true/false)"),
+    tieneplanta: Optional[str] = Query(None, description="Filter by tiene planta (true/false)"),
+    alquilada: Optional[str] = Query(None, description="Filter by alquilada (true/false)"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream every record of a table matching the listing's search and filters.
+
+    Rows are read through a server-side cursor in batches of
+    ``EXPORT_BATCH_SIZE`` and written out batch by batch, so memory stays
+    flat however many rows match.
+    """
+    entity = ENTITIES.get(table_name)
+    if entity is None:
+        raise HTTPException(status_code=404, detail="Table not found")
+
+    filter_values = {
+        "es_socio": es_socio,
+        "esconsorcista": esconsorcista,
+        "con_email": con_email,
+        "tieneplanta": tieneplanta,
+        "alquilada": alquilada
+    }
+    # Same statement as the listing; LIMIT NULL returns every row
+    statements, params = entity.listing(search, filter_values, None, None, 0)
+
+    return StreamingResponse(
+        _export_rows(statements.page, params, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table_name}.{format}"'},
+    )
+
+async def _export_rows(statement, params: Dict[str, Any], export_format: str) -> AsyncIterator[bytes]:
+    """
+    Encoded export chunks, one per cursor batch.
+
+    The body is streamed after the endpoint has returned, so the export
+    opens its own session instead of using the request's.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(statement, params, execution_options={"yield_per": EXPORT_BATCH_SIZE})
+        columns = list(result.keys())
+        if export_format == "csv":
+            yield (CSV_BOM + _csv_chunk([columns])).encode("utf-8")
+        async for rows in result.partitions(EXPORT_BATCH_SIZE):
+            if export_format == "csv":
+                yield _csv_chunk(rows).encode("utf-8")
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(columns, row)), ensure_ascii=False, separators=(",", ":"),
+                               default=_json_default) + "\n"
+                    for row in rows
+                ).encode("utf-8")
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(csv_cells(row) for row in rows)
+    return buffer.getvalue()
+
+def _json_default(value: Any) -> Any:
+    """
+    Dates and timestamps as ISO 8601, like the JSON listing; anything else as text
+    """
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+def _rows_to_dicts(columns, rows) -> List[Dict[str, Any]]:
+    return [dict(zip(columns, row)) for row in rows]
+
+def _json_body(content: Any) -> bytes:
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _integer(value: Any) -> Optional[int]:
+    """
+    Bind value for an INTEGER column. Form fields arrive as strings and
+    asyncpg, unlike psycopg2, does not let the server cast them.
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    return int(value)
+
+def _boolean(value: Any, default: bool = False) -> bool:
+    """
+    Bind value for a BOOLEAN column, accepting the literals PostgreSQL casts
+    from text ('true', 'f', 'yes', '0', ...)
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return default
+    if isinstance(value, str):
+        literal = value.strip().lower()
+        if literal in ("t", "true", "y", "yes", "on", "1"):
+            return True
+        if literal in ("f", "false", "n", "no", "off", "0"):
+            return False
+        raise ValueError(f"invalid boolean: {value}")
+    return bool(value)
+
+def _text(value: Any) -> Optional[str]:
+    """
+    Bind value for a VARCHAR/TEXT column (numbers sent as JSON numbers included)
+    """
+    return None if value is None else str(value)
+
+async def _load_lookups(names: List[str], db: AsyncSession) -> Dict[str, tuple]:
+    """
+    Return the (items, body, etag) cache entry of each lookup.
+
+    Cache misses are filled together with a single SELECT.
+    """
+    entries = {name: lookup_cache.get(name) for name in names}
+    missing = [name for name, entry in entries.items() if entry is None]
+    if missing:
+        version = lookup_cache.version
+        query = "SELECT " + ", ".join(LOOKUPS[name].expression for name in missing)
+        row = (await db.execute(text(query))).fetchone()
+        for name, items in zip(missing, row):
+            body = _json_body({LOOKUPS[name].key: items})
+            entry = (items, body, f'"{hashlib.sha1(body).hexdigest()}"')
+            lookup_cache.set(name, entry, version)
+            entries[name] = entry
+    return entries
+
+def _conditional_response(body: bytes, etag: str, request: Request) -> Response:
+    """
+    JSON response revalidated by ETag (304 when If-None-Match matches)
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def _lookup_response(name: str, request: Request, db: AsyncSession) -> Response:
+    """
+    Serve a lookup from the in-process cache
+    """
+    _, body, etag = (await _load_lookups([name], db))[name]
+    return _conditional_response(body, etag, request)
+
 @router.get("/lookup/empresas")
-async def get_empresas_lookup(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+async def get_empresas_lookup(request: Request, db: AsyncSession = Depends(get_db), current_user: dict = Depends(get_current_user)):
     """
     Get list of empresas for dropdowns
     """
     try:
-        query = "SELECT enteid, razonsocial FROM ente ORDER BY razonsocial"
-        result = db.execute(text(query))
-        empresas = [{"id": row[0], "name": row[1]} for row in result.fetchall()]
-        return {"empresas": empresas}
+        return await _lookup_response("empresas", request, db)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/lookup/cargos")
-async def get_cargos_lookup(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+async def get_cargos_lookup(request: Request, db: AsyncSession = Depends(get_db), current_user: dict = Depends(get_current_user)):
     """
     Get list of cargos for dropdowns
     """
     try:
-        query = "SELECT cargoid, cargo FROM cargo ORDER BY cargo"
-        result = db.execute(text(query))
-        cargos = [{"id": row[0], "name": row[1]} for row in result.fetchall()]
-        return {"cargos": cargos}
+        return await _lookup_response("cargos", request, db)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/lookup/areas")
-async def get_areas_lookup(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+async def get_areas_lookup(request: Request, db: AsyncSession = Depends(get_db), current_user: dict = Depends(get_current_user)):
     """
     Get list of areas for dropdowns
     """
     try:
-        query = "SELECT areaid, area FROM area ORDER BY area"
-        result = db.execute(text(query))
-        areas = [{"id": row[0], "name": row[1]} for row in result.fetchall()]
-        return {"areas": areas}
+        return await _lookup_response("areas", request, db)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/lookup/consorcistas")
-async def get_consorcistas_lookup(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+async def get_consorcistas_lookup(request: Request, db: AsyncSession = Depends(get_db), current_user: dict = Depends(get_current_user)):
     """
     Get list of consorcistas for dropdowns
     """
     try:
-        query = "SELECT consorcistaid, nombre FROM consorcista ORDER BY nombre"
-        result = db.execute(text(query))
-        consorcistas = [{"id": row[0], "name": row[1]} for row in result.fetchall()]
-        return {"consorcistas": consorcistas}
+        return await _lookup_response("consorcistas", request, db)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/lookup/tipos-consorcista")
-async def get_tipos_consorcista_lookup(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+async def get_tipos_consorcista_lookup(request: Request, db: AsyncSession = Depends(get_db), current_user: dict = Depends(get_current_user)):
     """
     Get list of tipos de consorcista for dropdowns
     """
     try:
-        query = "SELECT tipoconsorcistaid, tipo FROM tipo_consorcista ORDER BY tipo"
-        result = db.execute(text(query))
-        tipos = [{"id": row[0], "name": row[1]} for row in result.fetchall()]
-        return {"tipos": tipos}
+        return await _lookup_response("tipos-consorcista", request, db)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/lookup/camaras")
+async def get_camaras_lookup(request: Request, db: AsyncSession = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    """
+    Get list of camaras for dropdowns
+    """
+    try:
+        return await _lookup_response("camaras", request, db)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/lookup/sindicatos")
+async def get_sindicatos_lookup(request: Request, db: AsyncSession = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    """
+    Get list of sindicatos for dropdowns
+    """
+    try:
+        return await _lookup_response("sindicatos", request, db)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/lookup/calles")
+async def get_calles_lookup(request: Request, db: AsyncSession = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    """
+    Get list of calles for dropdowns
+    """
+    try:
+        return await _lookup_response("calles", request, db)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -318,7 +391,7 @@ async def get_tipos_consorcista_lookup(db: Session = Depends(get_db), current_us
 async def create_persona_relation(
     persona_id: int,
     relation_data: Dict[str, Any],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -330,24 +403,25 @@ async def create_persona_relation(
             VALUES (:enteid, :personaid, :cargoid, :areaid, CURRENT_DATE)
         """
         
-        result = db.execute(text(query), {
-            "enteid": relation_data.get("enteid"),
+        result = await db.execute(text(query), {
+            "enteid": _integer(relation_data.get("enteid")),
             "personaid": persona_id,
-            "cargoid": relation_data.get("cargoid"),
-            "areaid": relation_data.get("areaid")
+            "cargoid": _integer(relation_data.get("cargoid")),
+            "areaid": _integer(relation_data.get("areaid"))
         })
-        db.commit()
+        await db.commit()
+        invalidate_data_caches()
         
         return {"message": "Relación creada exitosamente"}
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/persona/{persona_id}/relaciones")
 async def get_persona_relations(
     persona_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -364,7 +438,7 @@ async def get_persona_relations(
             WHERE rep.personaid = :persona_id
         """
         
-        result = db.execute(text(query), {"persona_id": persona_id})
+        result = await db.execute(text(query), {"persona_id": persona_id})
         relaciones = []
         
         for row in result.fetchall():
@@ -387,7 +461,7 @@ async def get_persona_relations(
 async def delete_persona_relation(
     persona_id: int,
     relacion_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -395,8 +469,9 @@ async def delete_persona_relation(
     """
     try:
         query = "DELETE FROM relacion_ente_persona WHERE ente_persona_id = :relacion_id AND personaid = :persona_id"
-        result = db.execute(text(query), {"relacion_id": relacion_id, "persona_id": persona_id})
-        db.commit()
+        result = await db.execute(text(query), {"relacion_id": relacion_id, "persona_id": persona_id})
+        await db.commit()
+        invalidate_data_caches()
         
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Relación no encontrada")
@@ -406,13 +481,13 @@ async def delete_persona_relation(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/consorcista")
 async def create_consorcista_with_parcela(
     consorcista_data: Dict[str, Any],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new consorcista and optionally assign parcelas
@@ -425,10 +500,10 @@ async def create_consorcista_with_parcela(
             RETURNING consorcistaid
         """
         
-        result = db.execute(text(query), {
-            "nombre": consorcista_data.get("nombre"),
-            "nro_consorcista": consorcista_data.get("nro_consorcista"),
-            "tipoid": consorcista_data.get("tipoid")
+        result = await db.execute(text(query), {
+            "nombre": _text(consorcista_data.get("nombre")),
+            "nro_consorcista": _integer(consorcista_data.get("nro_consorcista")),
+            "tipoid": _integer(consorcista_data.get("tipoid"))
         })
         
         consorcista_id = result.fetchone()[0]
@@ -438,9 +513,10 @@ async def create_consorcista_with_parcela(
         if parcela_ids:
             for parcela_id in parcela_ids:
                 assign_query = "UPDATE parcela SET consorcistaid = :consorcista_id WHERE parcelaid = :parcela_id"
-                db.execute(text(assign_query), {"consorcista_id": consorcista_id, "parcela_id": parcela_id})
+                await db.execute(text(assign_query), {"consorcista_id": consorcista_id, "parcela_id": _integer(parcela_id)})
         
-        db.commit()
+        await db.commit()
+        invalidate_data_caches()
         
         return {
             "message": "Consorcista creado exitosamente",
@@ -448,13 +524,13 @@ async def create_consorcista_with_parcela(
         }
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/parcela")
 async def create_parcela_with_consorcista(
     parcela_data: Dict[str, Any],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new parcela and optionally assign to consorcista
@@ -468,18 +544,19 @@ async def create_parcela_with_consorcista(
             RETURNING parcelaid
         """
         
-        result = db.execute(text(query), {
-            "parcela": parcela_data.get("parcela"),
-            "calle": parcela_data.get("calle"),
-            "numero": parcela_data.get("numero"),
-            "superficie_has": parcela_data.get("superficie_has"),
-            "consorcistaid": parcela_data.get("consorcistaid"),
-            "tieneplanta": parcela_data.get("tieneplanta", False),
-            "alquilada": parcela_data.get("alquilada", False)
+        result = await db.execute(text(query), {
+            "parcela": _text(parcela_data.get("parcela")),
+            "calle": _text(parcela_data.get("calle")),
+            "numero": _integer(parcela_data.get("numero")),
+            "superficie_has": _text(parcela_data.get("superficie_has")),
+            "consorcistaid": _integer(parcela_data.get("consorcistaid")),
+            "tieneplanta": _boolean(parcela_data.get("tieneplanta")),
+            "alquilada": _boolean(parcela_data.get("alquilada"))
         })
         
         parcela_id = result.fetchone()[0]
-        db.commit()
+        await db.commit()
+        invalidate_data_caches()
         
         return {
             "message": "Parcela creada exitosamente",
@@ -487,14 +564,14 @@ async def create_parcela_with_consorcista(
         }
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{table_name}/{record_id}")
 async def get_record(
     table_name: str,
     record_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -518,7 +595,7 @@ async def get_record(
 async def create_record(
     table_name: str,
     record_data: Dict[str, Any],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -532,7 +609,8 @@ async def create_record(
         
         if table_name == 'ente':
             # Get next available ID
-            next_id_result = db.execute(text("SELECT COALESCE(MAX(enteid), 0) + 1 FROM ente"))
+            await db.execute(NEXT_ID_LOCK, {"key": NEXT_ID_LOCK_KEYS["ente"]})
+            next_id_result = await db.execute(text("SELECT COALESCE(MAX(enteid), 0) + 1 FROM ente"))
             next_id = next_id_result.scalar()
             
             # Create empresa/ente
@@ -545,22 +623,23 @@ async def create_record(
                         :consorcistaid, CURRENT_DATE)
             """
             
-            db.execute(text(query), {
+            await db.execute(text(query), {
                 "enteid": next_id,
-                "razonsocial": record_data.get("razonsocial"),
-                "cuit": record_data.get("cuit"),
-                "nro_socio_cepip": record_data.get("nro_socio_cepip"),
-                "web": record_data.get("web"),
-                "observaciones": record_data.get("observaciones"),
-                "es_socio": record_data.get("es_socio", False),
-                "esconsorcista": record_data.get("esconsorcista", False),
-                "actividadprincipalid": record_data.get("actividadprincipalid"),
-                "actividadsecundariaid": record_data.get("actividadsecundariaid"),
-                "consorcistaid": record_data.get("consorcistaid")
+                "razonsocial": _text(record_data.get("razonsocial")),
+                "cuit": _integer(record_data.get("cuit")),
+                "nro_socio_cepip": _integer(record_data.get("nro_socio_cepip")),
+                "web": _text(record_data.get("web")),
+                "observaciones": _text(record_data.get("observaciones")),
+                "es_socio": _boolean(record_data.get("es_socio")),
+                "esconsorcista": _boolean(record_data.get("esconsorcista")),
+                "actividadprincipalid": _integer(record_data.get("actividadprincipalid")),
+                "actividadsecundariaid": _integer(record_data.get("actividadsecundariaid")),
+                "consorcistaid": _integer(record_data.get("consorcistaid"))
             })
             
             new_id = next_id
-            db.commit()
+            await db.commit()
+            invalidate_data_caches()
             
             return {
                 "message": "Empresa creada exitosamente",
@@ -571,7 +650,8 @@ async def create_record(
             print(f"🔍 Backend: Creating persona with data: {record_data}")
             
             # Get next available ID for persona
-            next_id_result = db.execute(text("SELECT COALESCE(MAX(personaid), 0) + 1 FROM persona"))
+            await db.execute(NEXT_ID_LOCK, {"key": NEXT_ID_LOCK_KEYS["persona"]})
+            next_id_result = await db.execute(text("SELECT COALESCE(MAX(personaid), 0) + 1 FROM persona"))
             next_id = next_id_result.scalar()
             print(f"🔍 Backend: Next persona ID will be: {next_id}")
             
@@ -584,16 +664,17 @@ async def create_record(
             """
             
             print(f"🔍 Backend: Executing INSERT for persona with ID: {next_id}")
-            db.execute(text(query), {
+            await db.execute(text(query), {
                 "personaid": next_id,
-                "nombre_apellido": record_data.get("nombre_apellido"),
-                "telefono": record_data.get("telefono"),
-                "celular": record_data.get("celular"),
-                "correo_electronico": record_data.get("correo_electronico"),
-                "consorcistaid": record_data.get("consorcistaid")
+                "nombre_apellido": _text(record_data.get("nombre_apellido")),
+                "telefono": _text(record_data.get("telefono")),
+                "celular": _text(record_data.get("celular")),
+                "correo_electronico": _text(record_data.get("correo_electronico")),
+                "consorcistaid": _integer(record_data.get("consorcistaid"))
             })
             
-            db.commit()
+            await db.commit()
+            invalidate_data_caches()
             print(f"🔍 Backend: Persona {next_id} created successfully")
             
             return {
@@ -611,21 +692,22 @@ async def create_record(
                 RETURNING parcelaid
             """
             
-            result = db.execute(text(query), {
-                "parcela": record_data.get("parcela"),
-                "calle": record_data.get("calle"),
-                "numero": record_data.get("numero"),
-                "superficie_has": record_data.get("superficie_has"),
-                "porcentaje_reglamento": record_data.get("porcentaje_reglamento"),
-                "consorcistaid": record_data.get("consorcistaid"),
-                "fraccion": record_data.get("fraccion"),
-                "tieneplanta": record_data.get("tieneplanta", False),
-                "alquilada": record_data.get("alquilada", False),
-                "enteid": record_data.get("enteid")
+            result = await db.execute(text(query), {
+                "parcela": _text(record_data.get("parcela")),
+                "calle": _text(record_data.get("calle")),
+                "numero": _integer(record_data.get("numero")),
+                "superficie_has": _text(record_data.get("superficie_has")),
+                "porcentaje_reglamento": _integer(record_data.get("porcentaje_reglamento")),
+                "consorcistaid": _integer(record_data.get("consorcistaid")),
+                "fraccion": _text(record_data.get("fraccion")),
+                "tieneplanta": _boolean(record_data.get("tieneplanta")),
+                "alquilada": _boolean(record_data.get("alquilada")),
+                "enteid": _integer(record_data.get("enteid"))
             })
             
             new_id = result.fetchone()[0]
-            db.commit()
+            await db.commit()
+            invalidate_data_caches()
             
             return {
                 "message": "Parcela creada exitosamente",
@@ -640,14 +722,15 @@ async def create_record(
                 RETURNING consorcistaid
             """
             
-            result = db.execute(text(query), {
-                "nombre": record_data.get("nombre"),
-                "nro_consorcista": record_data.get("nro_consorcista"),
-                "tipoid": record_data.get("tipoid")
+            result = await db.execute(text(query), {
+                "nombre": _text(record_data.get("nombre")),
+                "nro_consorcista": _integer(record_data.get("nro_consorcista")),
+                "tipoid": _integer(record_data.get("tipoid"))
             })
             
             new_id = result.fetchone()[0]
-            db.commit()
+            await db.commit()
+            invalidate_data_caches()
             
             return {
                 "message": "Consorcista creado exitosamente",
@@ -665,7 +748,7 @@ async def create_record(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/{table_name}/{record_id}")
@@ -673,7 +756,7 @@ async def update_record(
     table_name: str,
     record_id: int,
     record_data: Dict[str, Any],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -683,6 +766,7 @@ async def update_record(
         # For now, just return success
         # In real implementation, this would update the database record
         updated_record = {"id": record_id, **record_data}
+        invalidate_data_caches()
         
         return {
             "message": "Record updated successfully",
@@ -696,38 +780,29 @@ async def update_record(
 async def delete_record(
     table_name: str,
     record_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Delete a record
     """
     try:
-        # Map table names to actual table names and their ID columns
-        table_mapping = {
-            "ente": ("ente", "enteid"),
-            "persona": ("persona", "personaid"),
-            "consorcista": ("consorcista", "consorcistaid"),
-            "parcela": ("parcela", "parcelaid"),
-            "sector": ("sector", "sectorid")
-        }
-        
-        if table_name not in table_mapping:
+        entity = ENTITIES.get(table_name)
+        if entity is None or not entity.deletable:
             raise HTTPException(status_code=400, detail=f"Table '{table_name}' not supported")
         
-        actual_table, id_column = table_mapping[table_name]
+        actual_table = entity.name
         
         # First check if record exists
-        check_query = f"SELECT 1 FROM {actual_table} WHERE {id_column} = :record_id"
-        result = db.execute(text(check_query), {"record_id": record_id})
+        result = await db.execute(entity.exists, {"record_id": record_id})
         
         if not result.fetchone():
             raise HTTPException(status_code=404, detail=f"Record with ID {record_id} not found")
         
         # Delete the record
-        delete_query = f"DELETE FROM {actual_table} WHERE {id_column} = :record_id"
-        result = db.execute(text(delete_query), {"record_id": record_id})
-        db.commit()
+        result = await db.execute(entity.delete, {"record_id": record_id})
+        await db.commit()
+        invalidate_data_caches()
         
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail=f"Record with ID {record_id} not found")
@@ -741,41 +816,42 @@ async def delete_record(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/parcela/{parcela_id}/consorcista")
 async def assign_parcela_to_consorcista(
     parcela_id: int,
     assignment_data: Dict[str, Any],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Assign or unassign a parcela to/from a consorcista
     """
     try:
-        consorcista_id = assignment_data.get("consorcistaid")
+        consorcista_id = _integer(assignment_data.get("consorcistaid"))
         
         if consorcista_id:
             query = "UPDATE parcela SET consorcistaid = :consorcista_id WHERE parcelaid = :parcela_id"
-            db.execute(text(query), {"consorcista_id": consorcista_id, "parcela_id": parcela_id})
+            await db.execute(text(query), {"consorcista_id": consorcista_id, "parcela_id": parcela_id})
             message = "Parcela asignada al consorcista exitosamente"
         else:
             query = "UPDATE parcela SET consorcistaid = NULL WHERE parcelaid = :parcela_id"
-            db.execute(text(query), {"parcela_id": parcela_id})
+            await db.execute(text(query), {"parcela_id": parcela_id})
             message = "Parcela desasignada del consorcista exitosamente"
             
-        db.commit()
+        await db.commit()
+        invalidate_data_caches()
         return {"message": message}
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/consorcista/{consorcista_id}/parcelas")
 async def get_consorcista_parcelas(
     consorcista_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all parcelas assigned to a consorcista
@@ -789,7 +865,7 @@ async def get_consorcista_parcelas(
             ORDER BY parcela
         """
         
-        result = db.execute(text(query), {"consorcista_id": consorcista_id})
+        result = await db.execute(text(query), {"consorcista_id": consorcista_id})
         parcelas = []
         
         for row in result.fetchall():
@@ -814,7 +890,7 @@ async def get_consorcista_parcelas(
 @router.get("/ente/{ente_id}/direcciones")
 async def get_ente_direcciones(
     ente_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -829,7 +905,7 @@ async def get_ente_direcciones(
             ORDER BY c.calle, ae.altura
         """
         
-        result = db.execute(text(query), {"ente_id": ente_id})
+        result = await db.execute(text(query), {"ente_id": ente_id})
         direcciones = []
         
         for row in result.fetchall():
@@ -848,7 +924,7 @@ async def get_ente_direcciones(
 @router.get("/ente/{ente_id}/camaras")
 async def get_ente_camaras(
     ente_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -863,7 +939,7 @@ async def get_ente_camaras(
             ORDER BY c.camara
         """
         
-        result = db.execute(text(query), {"ente_id": ente_id})
+        result = await db.execute(text(query), {"ente_id": ente_id})
         camaras = []
         
         for row in result.fetchall():
@@ -881,7 +957,7 @@ async def get_ente_camaras(
 @router.get("/ente/{ente_id}/sindicatos")
 async def get_ente_sindicatos(
     ente_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -896,7 +972,7 @@ async def get_ente_sindicatos(
             ORDER BY s.sindicato
         """
         
-        result = db.execute(text(query), {"ente_id": ente_id})
+        result = await db.execute(text(query), {"ente_id": ente_id})
         sindicatos = []
         
         for row in result.fetchall():
@@ -912,41 +988,65 @@ async def get_ente_sindicatos(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/lookup/camaras")
-async def get_camaras_lookup(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    """
-    Get all camaras for dropdown
-    """
-    try:
-        query = "SELECT camaraid, camara FROM camara ORDER BY camara"
-        result = db.execute(text(query))
-        camaras = [{"id": row[0], "name": row[1]} for row in result.fetchall()]
-        return {"camaras": camaras}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@router.get("/lookup/sindicatos")
-async def get_sindicatos_lookup(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+@router.get("/ente/{ente_id}/detail")
+async def get_ente_detail(
+    ente_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
     """
-    Get all sindicatos for dropdown
+    Get an ente with its sector/rubro/subrubro names and its direcciones,
+    camaras and sindicatos, built by a single JSON-aggregating query
     """
     try:
-        query = "SELECT sindicatoid, siglas, sindicato FROM sindicato ORDER BY sindicato"
-        result = db.execute(text(query))
-        sindicatos = [{"id": row[0], "siglas": row[1], "name": row[2]} for row in result.fetchall()]
-        return {"sindicatos": sindicatos}
+        query = """
+            SELECT json_build_object(
+                'ente', to_json(ente),
+                'direcciones', COALESCE((
+                    SELECT json_agg(json_build_object(
+                        'id', ae.accesoid, 'calle', c.calle, 'altura', ae.altura, 'fecha_de_carga', ae.fecha_de_carga
+                    ) ORDER BY c.calle, ae.altura)
+                    FROM accesos_ente ae
+                    JOIN calle c ON ae.calleid = c.calleid
+                    WHERE ae.enteid = ente.enteid
+                ), '[]'::json),
+                'camaras', COALESCE((
+                    SELECT json_agg(json_build_object(
+                        'id', rec.ente_camara_id, 'camara', c.camara, 'fecha_de_carga', rec.fecha_de_carga
+                    ) ORDER BY c.camara)
+                    FROM relacion_ente_camara rec
+                    JOIN camara c ON rec.camaraid = c.camaraid
+                    WHERE rec.enteid = ente.enteid
+                ), '[]'::json),
+                'sindicatos', COALESCE((
+                    SELECT json_agg(json_build_object(
+                        'id', res.ente_sindicato_id, 'siglas', s.siglas, 'sindicato', s.sindicato,
+                        'fecha_de_carga', res.fecha_de_carga
+                    ) ORDER BY s.sindicato)
+                    FROM relacion_ente_sindicato res
+                    JOIN sindicato s ON res.sindicatoid = s.sindicatoid
+                    WHERE res.enteid = ente.enteid
+                ), '[]'::json)
+            )
+            FROM (
+                SELECT e.*, s.sector as sector_nombre, r.rubro as rubro_nombre, sr.subrubro as subrubro_nombre
+                FROM ente e
+                LEFT JOIN subrubro sr ON e.actividadprincipalid = sr.subrubroid
+                LEFT JOIN rubro r ON sr.rubroid = r.rubroid
+                LEFT JOIN sector s ON r.sectorid = s.sectorid
+                WHERE e.enteid = :ente_id
+            ) ente
+        """
+        
+        detail = (await db.execute(text(query), {"ente_id": ente_id})).scalar()
+        if detail is None:
+            raise HTTPException(status_code=404, detail=f"Ente with ID {ente_id} not found")
+        
+        body = _json_body(detail)
+        return _conditional_response(body, f'"{hashlib.sha1(body).hexdigest()}"', request)
+        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
-@router.get("/lookup/calles")
-async def get_calles_lookup(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    """
-    Get all calles for dropdown
-    """
-    try:
-        query = "SELECT calleid, calle FROM calle ORDER BY calle"
-        result = db.execute(text(query))
-        calles = [{"id": row[0], "name": row[1]} for row in result.fetchall()]
-        return {"calles": calles}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
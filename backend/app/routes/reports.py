@@ -2,15 +2,80 @@
 Reports API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from typing import Dict, Any
-from datetime import datetime, timedelta
+from sqlalchemy import text
+from typing import Dict, Any, List
+from datetime import date, datetime, timedelta
 
-from ..database import get_db
+from ..database import get_sync_db
+from ..report_files import EXPORT_FORMATS, RENDERERS, report_files
 
 router = APIRouter()
 
+# Moved by every committed write to a CEPIP table (migration 0007); read
+# before the report data, so a file is never cached under a newer version
+DATA_VERSION = text("SELECT data_version()")
+
+# Activity series: (column, table, aggregate) of the rows loaded per bucket
+# of fecha_de_carga. Assigned parcelas are those loaded with a consorcista.
+ACTIVITY_SOURCES = [
+    ("empresas", "ente", "COUNT(*)"),
+    ("personas", "persona", "COUNT(*)"),
+    ("relaciones", "relacion_ente_persona", "COUNT(*)"),
+    ("consorcistas", "consorcista", "COUNT(*)"),
+    ("parcelas", "parcela", "COUNT(*)"),
+    ("parcelas_asignadas", "parcela", "COUNT(consorcistaid)"),
+]
+
+ACTIVITY_COLUMNS = [column for column, _, _ in ACTIVITY_SOURCES]
+
+
+def _activity_statement(unit: str):
+    """
+    One statement for every activity column: a grouped range scan per table
+    (served by the fecha_de_carga indexes of migration 0008), pivoted into
+    one row per bucket. Buckets are dates, whatever the column's type.
+    """
+    branches = []
+    for table in dict.fromkeys(table for _, table, _ in ACTIVITY_SOURCES):
+        values = ", ".join(
+            f"{aggregate if source == table else '0'} AS {column}"
+            for column, source, aggregate in ACTIVITY_SOURCES
+        )
+        branches.append(f"""
+            SELECT date_trunc('{unit}', fecha_de_carga::timestamp)::date AS bucket, {values}
+            FROM {table}
+            WHERE fecha_de_carga >= :start AND fecha_de_carga < :end
+            GROUP BY 1
+        """)
+    sums = ", ".join(f"SUM({column})::BIGINT AS {column}" for column in ACTIVITY_COLUMNS)
+    return text(f"""
+        SELECT bucket, {sums}
+        FROM ({' UNION ALL '.join(branches)}) activity
+        GROUP BY bucket
+        ORDER BY bucket
+    """)
+
+
+ACTIVITY = {unit: _activity_statement(unit) for unit in ("day", "month")}
+
+# Current totals, read from the stats_summary read model (migration 0004)
+SUMMARY_TOTALS = text("""
+    SELECT stats_count('ente') AS empresas,
+           stats_count('ente.es_socio') AS empresas_socias,
+           stats_count('ente.esconsorcista') AS empresas_consorcistas,
+           stats_count('persona') AS personas,
+           stats_count('persona.con_email') AS personas_con_email,
+           stats_count('relacion_ente_persona') AS relaciones,
+           stats_count('consorcista') AS consorcistas,
+           stats_count('parcela') AS parcelas,
+           stats_count('parcela.consorcista') AS parcelas_asignadas,
+           stats_count('parcela.tieneplanta') AS parcelas_con_planta,
+           stats_count('parcela.alquilada') AS parcelas_alquiladas
+""")
+
 @router.get("/")
 async def get_available_reports():
     """
@@ -20,168 +85,244 @@ async def get_available_reports():
         {
             "id": "summary",
             "name": "Resumen General",
-            "description": "Resumen estadístico de todos los datos",
+            "description": "Totales actuales y altas de los últimos 12 meses",
             "parameters": []
         },
         {
             "id": "detailed",
             "name": "Reporte Detallado",
-            "description": "Reporte detallado con filtros personalizables",
+            "description": "Altas por día entre dos fechas (empresas, personas, relaciones, consorcistas, parcelas)",
             "parameters": [
-                {"name": "fecha_inicio", "type": "date", "required": True},
-                {"name": "fecha_fin", "type": "date", "required": True},
-                {"name": "tabla", "type": "select", "options": ["clientes", "productos", "ordenes"]}
+                {"name": "fecha_inicio", "type": "date", "description": "Default: 29 días antes de fecha_fin"},
+                {"name": "fecha_fin", "type": "date", "description": "Default: hoy"},
+                {"name": "tabla", "type": "select", "options": ACTIVITY_COLUMNS}
             ]
         },
         {
             "id": "monthly",
             "name": "Reporte Mensual",
-            "description": "Estadísticas mensuales",
+            "description": "Altas del mes por día y serie mensual desde el año indicado",
             "parameters": [
                 {"name": "mes", "type": "select", "options": ["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"]},
-                {"name": "año", "type": "number", "default": datetime.now().year}
+                {"name": "año", "type": "number", "default": datetime.now().year},
+                {"name": "desde", "type": "number", "description": "Año inicial de la serie mensual (default: el año del reporte)"}
             ]
         }
     ]
-    
+
     return {"reports": reports}
 
+# Report handlers are sync so FastAPI runs their queries in the threadpool
 @router.post("/{report_type}")
-async def generate_report(
+def generate_report(
     report_type: str,
     parameters: Dict[str, Any] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_sync_db)
 ):
     """
     Generate a specific report
     """
     try:
-        if report_type == "summary":
-            return generate_summary_report(db)
-        elif report_type == "detailed":
-            return generate_detailed_report(parameters, db)
-        elif report_type == "monthly":
-            return generate_monthly_report(parameters, db)
-        else:
-            raise HTTPException(status_code=404, detail="Report type not found")
-            
+        return build_report(report_type, resolve_parameters(report_type, parameters), db)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-def generate_summary_report(db: Session):
+def resolve_parameters(report_type: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    A report's parameters validated and with their defaults filled in, so
+    the periods derived from today's date are explicit (and part of the
+    export cache key)
+    """
+    if not parameters:
+        parameters = {}
+    today = date.today()
+
+    if report_type == "summary":
+        # The last 12 months, the current one included
+        return {"fecha_inicio": _first_of_month(today, -11), "fecha_fin": _first_of_month(today, 1) - timedelta(days=1)}
+
+    elif report_type == "detailed":
+        fecha_fin = _date_parameter(parameters, "fecha_fin", today)
+        fecha_inicio = _date_parameter(parameters, "fecha_inicio", fecha_fin - timedelta(days=29))
+        if fecha_fin < fecha_inicio:
+            raise HTTPException(status_code=400, detail="fecha_fin must not be before fecha_inicio")
+        tabla = parameters.get("tabla") or None
+        if tabla is not None and tabla not in ACTIVITY_COLUMNS:
+            raise HTTPException(status_code=400, detail=f"Invalid tabla: {tabla}")
+        return {"fecha_inicio": fecha_inicio, "fecha_fin": fecha_fin, "tabla": tabla}
+
+    elif report_type == "monthly":
+        mes = _int_parameter(parameters, "mes", today.month)
+        año = _int_parameter(parameters, "año", today.year)
+        desde = _int_parameter(parameters, "desde", año)
+        if not 1 <= mes <= 12:
+            raise HTTPException(status_code=400, detail=f"Invalid mes: {mes}")
+        if not 1900 <= desde <= año <= 9999:
+            raise HTTPException(status_code=400, detail="desde must be a year not after año")
+        return {"mes": mes, "año": año, "desde": desde}
+
+    else:
+        raise HTTPException(status_code=404, detail="Report type not found")
+
+def build_report(report_type: str, parameters: Dict[str, Any], db: Session) -> Dict[str, Any]:
+    """
+    The report document for parameters returned by ``resolve_parameters``
+    """
+    if report_type == "summary":
+        return generate_summary_report(parameters, db)
+    elif report_type == "detailed":
+        return generate_detailed_report(parameters, db)
+    elif report_type == "monthly":
+        return generate_monthly_report(parameters, db)
+    else:
+        raise HTTPException(status_code=404, detail="Report type not found")
+
+def _first_of_month(day: date, months: int = 0) -> date:
+    """
+    First day of the month ``months`` away from ``day``'s month
+    """
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def activity_series(db: Session, unit: str, start: date, end: date) -> List[Dict[str, Any]]:
+    """
+    Activity per day or month in [start, end), every bucket present (zeros
+    included) so series can be charted as is
+    """
+    rows = {row.bucket: row._mapping for row in db.execute(ACTIVITY[unit], {"start": start, "end": end})}
+
+    series = []
+    bucket = start if unit == "day" else _first_of_month(start)
+    while bucket < end:
+        row = rows.get(bucket)
+        entry = {"fecha": bucket.isoformat()} if unit == "day" else {"mes": bucket.strftime("%Y-%m")}
+        entry.update({column: row[column] if row is not None else 0 for column in ACTIVITY_COLUMNS})
+        series.append(entry)
+        bucket = bucket + timedelta(days=1) if unit == "day" else _first_of_month(bucket, 1)
+    return series
+
+def _totals(series: List[Dict[str, Any]], columns: List[str]) -> Dict[str, int]:
+    return {column: sum(entry[column] for entry in series) for column in columns}
+
+def _date_parameter(parameters: Dict[str, Any], name: str, default: date) -> date:
+    value = parameters.get(name)
+    if not value:
+        return default
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date for {name}: {value}")
+
+def _int_parameter(parameters: Dict[str, Any], name: str, default: int) -> int:
+    value = parameters.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Invalid number for {name}: {value}")
+
+def generate_summary_report(parameters: Dict[str, Any], db: Session):
     """
-    Generate summary report
+    Generate summary report: current totals and the last 12 months of activity
     """
-    # Mock summary report data
+    totals = dict(db.execute(SUMMARY_TOTALS).fetchone()._mapping)
+
     report_data = {
         "title": "Resumen General",
         "generated_at": datetime.now().isoformat(),
-        "summary": {
-            "total_clientes": 450,
-            "total_productos": 320,
-            "total_ordenes": 280,
-            "ventas_mes_actual": 45000.50,
-            "ordenes_pendientes": 12,
-            "productos_sin_stock": 5
-        },
-        "charts": {
-            "ventas_por_mes": [
-                {"mes": "Enero", "ventas": 35000},
-                {"mes": "Febrero", "ventas": 42000},
-                {"mes": "Marzo", "ventas": 38000},
-                {"mes": "Abril", "ventas": 45000}
-            ],
-            "productos_mas_vendidos": [
-                {"producto": "Producto A", "cantidad": 150},
-                {"producto": "Producto B", "cantidad": 120},
-                {"producto": "Producto C", "cantidad": 95}
-            ]
-        }
+        "summary": totals,
+        "altas_por_mes": activity_series(
+            db, "month", parameters["fecha_inicio"], parameters["fecha_fin"] + timedelta(days=1)
+        )
     }
-    
+
     return report_data
 
 def generate_detailed_report(parameters: Dict[str, Any], db: Session):
     """
-    Generate detailed report with parameters
+    Generate detailed report: activity per day between two dates (inclusive,
+    the last 30 days by default)
     """
-    if not parameters:
-        parameters = {}
-    
-    # Mock detailed report
+    fecha_inicio = parameters["fecha_inicio"]
+    fecha_fin = parameters["fecha_fin"]
+    tabla = parameters["tabla"]
+    columns = [tabla] if tabla else ACTIVITY_COLUMNS
+
+    series = activity_series(db, "day", fecha_inicio, fecha_fin + timedelta(days=1))
+    if tabla:
+        series = [{"fecha": entry["fecha"], tabla: entry[tabla]} for entry in series]
+
     report_data = {
         "title": "Reporte Detallado",
         "generated_at": datetime.now().isoformat(),
-        "parameters": parameters,
-        "data": [
-            {"id": 1, "descripcion": "Item 1", "valor": 100.50, "fecha": "2024-01-15"},
-            {"id": 2, "descripcion": "Item 2", "valor": 250.75, "fecha": "2024-01-16"},
-            {"id": 3, "descripcion": "Item 3", "valor": 175.25, "fecha": "2024-01-17"}
-        ],
-        "totals": {
-            "total_items": 3,
-            "suma_valores": 526.50,
-            "promedio": 175.50
-        }
+        "parameters": {
+            "fecha_inicio": fecha_inicio.isoformat(),
+            "fecha_fin": fecha_fin.isoformat(),
+            "tabla": tabla or "todas"
+        },
+        "data": series,
+        "totals": _totals(series, columns)
     }
-    
+
     return report_data
 
 def generate_monthly_report(parameters: Dict[str, Any], db: Session):
     """
-    Generate monthly report
+    Generate monthly report: the month's activity per day, plus the monthly
+    series from January of ``desde`` (default: the report's year) through
+    that month, each computed by one grouped query
     """
-    if not parameters:
-        parameters = {"mes": datetime.now().month, "año": datetime.now().year}
-    
-    mes = parameters.get("mes", datetime.now().month)
-    año = parameters.get("año", datetime.now().year)
-    
-    # Mock monthly report
+    mes, año, desde = parameters["mes"], parameters["año"], parameters["desde"]
+
+    start = date(año, mes, 1)
+    end = _first_of_month(start, 1)
+    daily = activity_series(db, "day", start, end)
+
     report_data = {
         "title": f"Reporte Mensual - {mes}/{año}",
         "generated_at": datetime.now().isoformat(),
         "period": {"mes": mes, "año": año},
-        "metrics": {
-            "nuevos_clientes": 25,
-            "ordenes_completadas": 180,
-            "ventas_totales": 48500.75,
-            "productos_vendidos": 1250,
-            "ticket_promedio": 269.45
-        },
-        "daily_sales": [
-            {"dia": 1, "ventas": 1200.50},
-            {"dia": 2, "ventas": 1450.75},
-            {"dia": 3, "ventas": 980.25},
-            {"dia": 4, "ventas": 1750.00}
-        ]
+        "metrics": _totals(daily, ACTIVITY_COLUMNS),
+        "por_dia": daily,
+        "por_mes": activity_series(db, "month", date(desde, 1, 1), end)
     }
-    
+
     return report_data
 
 @router.get("/{report_type}/export/{format}")
-async def export_report(
+def export_report(
     report_type: str,
     format: str,
-    parameters: Dict[str, Any] = None,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_sync_db)
 ):
     """
-    Export report in different formats (PDF, Excel, CSV)
+    Export report in different formats (PDF, Excel, CSV).
+
+    The report parameters come from the query string. Rendered files are
+    cached on disk per resolved parameters (defaults filled in), day and
+    data version: exporting the same
+    report again the same day while the data is unchanged serves the stored
+    file.
     """
-    if format not in ["pdf", "excel", "csv"]:
+    if format not in EXPORT_FORMATS:
         raise HTTPException(status_code=400, detail="Format not supported")
-    
-    # Generate the report data
-    report_data = await generate_report(report_type, parameters, db)
-    
-    # For now, just return the data with format info
-    # In real implementation, this would generate actual files
-    return {
-        "message": f"Report export not yet implemented for {format}",
-        "report_type": report_type,
-        "format": format,
-        "data": report_data
-    }
\ No newline at end of file
+    parameters = resolve_parameters(
+        report_type, {key: value for key, value in request.query_params.items() if value != ""}
+    )
+    try:
+        version = db.execute(DATA_VERSION).scalar()
+        path = report_files.path(report_type, parameters, format, version, date.today())
+        if report_files.get(path) is None:
+            report_data = build_report(report_type, parameters, db)
+            report_files.store(path, lambda target: RENDERERS[format](report_data, target))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    extension, media_type = EXPORT_FORMATS[format]
+    return FileResponse(path, media_type=media_type, filename=f"reporte_{report_type}.{extension}")
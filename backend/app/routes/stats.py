@@ -3,29 +3,33 @@ Statistics API endpoints
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from datetime import datetime
 
 from ..database import get_db
+from ..registry import STATS_ENTITIES
 
 router = APIRouter()
 
+# Every number below is read from the stats_summary read model (migration
+# 0004), which triggers keep current; no route scans the base tables.
+
+# Row counts of every stats table, gathered by a single statement
+TABLE_COUNTS = text(
+    "SELECT " + ", ".join(f"stats_count('{entity.name}')" for entity in STATS_ENTITIES)
+)
+
 @router.get("/")
 @router.get("")
-async def get_stats(db: Session = Depends(get_db)):
+async def get_stats(db: AsyncSession = Depends(get_db)):
     """
     Get application statistics
     """
     try:
         # Get real statistics from the database
-        table_counts = {}
-        main_tables = ['ente', 'persona', 'consorcista', 'parcela', 'sector', 'rubro', 'subrubro']
-        
-        for table in main_tables:
-            result = db.execute(text(f"SELECT COUNT(*) FROM {table}"))
-            count = result.scalar()
-            table_counts[table] = count
+        counts = (await db.execute(TABLE_COUNTS)).fetchone()
+        table_counts = {entity.name: count for entity, count in zip(STATS_ENTITIES, counts)}
         
         total_records = sum(table_counts.values())
         
@@ -41,13 +45,8 @@ async def get_stats(db: Session = Depends(get_db)):
                 "todayDeleted": 0   # Would need soft delete tracking
             },
             "tableStats": [
-                {"table": "entes", "count": table_counts.get('ente', 0)},
-                {"table": "personas", "count": table_counts.get('persona', 0)},
-                {"table": "consorciatas", "count": table_counts.get('consorcista', 0)},
-                {"table": "parcelas", "count": table_counts.get('parcela', 0)},
-                {"table": "sectores", "count": table_counts.get('sector', 0)},
-                {"table": "rubros", "count": table_counts.get('rubro', 0)},
-                {"table": "subrubros", "count": table_counts.get('subrubro', 0)}
+                {"table": entity.stats_label, "count": table_counts.get(entity.name, 0)}
+                for entity in STATS_ENTITIES
             ]
         }
         
@@ -58,15 +57,15 @@ async def get_stats(db: Session = Depends(get_db)):
 
 @router.get("/dashboard/")
 @router.get("/dashboard")
-async def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
     """
     Get dashboard-specific statistics
     """
     try:
         # Get real dashboard stats from database
-        total_entes = db.execute(text("SELECT COUNT(*) FROM ente")).scalar()
-        total_personas = db.execute(text("SELECT COUNT(*) FROM persona")).scalar()
-        total_parcelas = db.execute(text("SELECT COUNT(*) FROM parcela")).scalar()
+        total_entes, total_personas, total_parcelas = (await db.execute(text("""
+            SELECT stats_count('ente'), stats_count('persona'), stats_count('parcela')
+        """))).fetchone()
         
         dashboard_stats = {
             "totalRecords": total_entes + total_personas + total_parcelas,
@@ -83,27 +82,23 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
 
 @router.get("/empresas/")
 @router.get("/empresas")
-async def get_empresas_stats(db: Session = Depends(get_db)):
+async def get_empresas_stats(db: AsyncSession = Depends(get_db)):
     """
     Get empresas statistics
     """
     try:
-        # Get total empresas
-        total_empresas = db.execute(text("SELECT COUNT(*) FROM ente")).scalar()
-        
-        # Get socios CEPIP
-        socios_cepip = db.execute(text("SELECT COUNT(*) FROM ente WHERE es_socio = true")).scalar()
-        
-        # Get consorcistas
-        consorcistas = db.execute(text("SELECT COUNT(*) FROM ente WHERE esconsorcista = true")).scalar()
-        
-        # Get unique sectors through rubro relationship
-        total_sectores = db.execute(text("""
-            SELECT COUNT(DISTINCT s.sectorid) 
-            FROM ente e 
-            JOIN rubro r ON e.actividadprincipalid = r.rubroid 
-            JOIN sector s ON r.sectorid = s.sectorid
-        """)).scalar()
+        # Distinct sectors come from the per-rubro ente counts, so the join
+        # is bounded by the number of rubros rather than entes
+        total_empresas, socios_cepip, consorcistas, total_sectores = (await db.execute(text("""
+            SELECT stats_count('ente'),
+                   stats_count('ente.es_socio'),
+                   stats_count('ente.esconsorcista'),
+                   (SELECT COUNT(DISTINCT s.sectorid)
+                    FROM stats_summary ss
+                    JOIN rubro r ON ss.bucket = r.rubroid
+                    JOIN sector s ON r.sectorid = s.sectorid
+                    WHERE ss.metric = 'ente.rubro' AND ss.value > 0)
+        """))).fetchone()
         
         stats = {
             "total_empresas": total_empresas,
@@ -119,22 +114,17 @@ async def get_empresas_stats(db: Session = Depends(get_db)):
 
 @router.get("/personas/")
 @router.get("/personas")
-async def get_personas_stats(db: Session = Depends(get_db)):
+async def get_personas_stats(db: AsyncSession = Depends(get_db)):
     """
     Get personas statistics
     """
     try:
-        # Get total personas
-        total_personas = db.execute(text("SELECT COUNT(*) FROM persona")).scalar()
-        
-        # Get personas with email
-        personas_con_email = db.execute(text("SELECT COUNT(*) FROM persona WHERE correo_electronico IS NOT NULL AND correo_electronico != ''")).scalar()
-        
-        # Get personas with phone
-        personas_con_telefono = db.execute(text("SELECT COUNT(*) FROM persona WHERE telefono IS NOT NULL AND telefono != ''")).scalar()
-        
-        # Get total relations (assuming there's a relation table)
-        total_relaciones = db.execute(text("SELECT COUNT(*) FROM persona_ente")).scalar() if _table_exists(db, 'persona_ente') else 0
+        total_personas, personas_con_email, personas_con_telefono, total_relaciones = (await db.execute(text("""
+            SELECT stats_count('persona'),
+                   stats_count('persona.con_email'),
+                   stats_count('persona.con_telefono'),
+                   stats_count('relacion_ente_persona')
+        """))).fetchone()
         
         stats = {
             "total_personas": total_personas,
@@ -150,22 +140,18 @@ async def get_personas_stats(db: Session = Depends(get_db)):
 
 @router.get("/consorcistas/")
 @router.get("/consorcistas")
-async def get_consorcistas_stats(db: Session = Depends(get_db)):
+async def get_consorcistas_stats(db: AsyncSession = Depends(get_db)):
     """
     Get consorcistas statistics
     """
     try:
-        # Get total consorcistas
-        total_consorcistas = db.execute(text("SELECT COUNT(*) FROM consorcista")).scalar()
-        
-        # Get parcelas associated with consorcistas
-        parcelas_consorcistas = db.execute(text("SELECT COUNT(*) FROM parcela WHERE consorcistaid IS NOT NULL")).scalar()
-        
-        # Get empresas that are consorcistas
-        empresas_consorcistas = db.execute(text("SELECT COUNT(*) FROM ente WHERE esconsorcista = true")).scalar()
-        
-        # Get unique types
-        tipos_consorcistas = db.execute(text("SELECT COUNT(DISTINCT tipoid) FROM consorcista WHERE tipoid IS NOT NULL")).scalar()
+        # Types are the consorcista.tipo buckets that still have rows
+        total_consorcistas, tipos_consorcistas, parcelas_consorcistas, empresas_consorcistas = (await db.execute(text("""
+            SELECT stats_count('consorcista'),
+                   (SELECT COUNT(*) FROM stats_summary WHERE metric = 'consorcista.tipo' AND value > 0),
+                   stats_count('parcela.consorcista'),
+                   stats_count('ente.esconsorcista')
+        """))).fetchone()
         
         stats = {
             "total_consorcistas": total_consorcistas,
@@ -181,28 +167,18 @@ async def get_consorcistas_stats(db: Session = Depends(get_db)):
 
 @router.get("/parcelas/")
 @router.get("/parcelas")
-async def get_parcelas_stats(db: Session = Depends(get_db)):
+async def get_parcelas_stats(db: AsyncSession = Depends(get_db)):
     """
     Get parcelas statistics
     """
     try:
-        # Get total parcelas
-        total_parcelas = db.execute(text("SELECT COUNT(*) FROM parcela")).scalar()
-        
-        # Get parcelas with planta
-        parcelas_con_planta = db.execute(text("SELECT COUNT(*) FROM parcela WHERE tieneplanta = true")).scalar()
-        
-        # Get parcelas alquiladas
-        parcelas_alquiladas = db.execute(text("SELECT COUNT(*) FROM parcela WHERE alquilada = true")).scalar()
-        
-        # Get total superficie (superficie_has_ is text, so need to convert)
-        superficie_total = db.execute(text("""
-            SELECT COALESCE(SUM(CAST(superficie_has_ AS FLOAT)), 0) 
-            FROM parcela 
-            WHERE superficie_has_ IS NOT NULL 
-            AND superficie_has_ != ''
-            AND superficie_has_ ~ '^[0-9]+(\\.[0-9]+)?$'
-        """)).scalar()
+        # superficie is summed by the triggers from the numeric superficie_has_ values
+        total_parcelas, parcelas_con_planta, parcelas_alquiladas, superficie_total = (await db.execute(text("""
+            SELECT stats_count('parcela'),
+                   stats_count('parcela.tieneplanta'),
+                   stats_count('parcela.alquilada'),
+                   (SELECT COALESCE(SUM(value), 0) FROM stats_summary WHERE metric = 'parcela.superficie')
+        """))).fetchone()
         
         stats = {
             "total_parcelas": total_parcelas,
@@ -215,13 +191,3 @@ async def get_parcelas_stats(db: Session = Depends(get_db)):
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
-def _table_exists(db: Session, table_name: str) -> bool:
-    """
-    Check if a table exists in the database
-    """
-    try:
-        result = db.execute(text(f"SELECT to_regclass('{table_name}')")).scalar()
-        return result is not None
-    except:
-        return False
\ No newline at end of file
@@ -2,97 +2,71 @@
 Tables API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import List, Dict, Any
 
 from ..database import get_db
+from ..cache import tables_cache
+from ..registry import SCHEMA_ENTITIES
 
 router = APIRouter()
 
+# (table, record count) rows for each counts mode, one statement each:
+# exact counts every table, fast reads the trigger-maintained stats_summary
+TABLE_COUNTS = {
+    "exact": text(" UNION ALL ".join(
+        f"SELECT '{entity.name}', COUNT(*) FROM {entity.name}" for entity in SCHEMA_ENTITIES
+    )),
+    "fast": text(" UNION ALL ".join(
+        f"SELECT '{entity.name}', stats_count('{entity.name}')" for entity in SCHEMA_ENTITIES
+    )),
+}
+
 @router.get("/")
-async def get_tables(db: Session = Depends(get_db)):
+async def get_tables(
+    counts: str = Query("exact", pattern="^(exact|fast)$", description="Record count mode: exact or fast"),
+    db: AsyncSession = Depends(get_db)
+):
     """
-    Get list of available tables and their schemas
+    Get list of available tables and their schemas.
+
+    The whole response is cached per counts mode; API writes invalidate it.
     """
     try:
-        # Get real table information from CEPIP database
-        cepip_tables = [
-            {
-                "name": "ente",
-                "label": "Entes (Empresas)",
-                "description": "Empresas y entidades del parque industrial",
-                "columns": [
-                    {"name": "enteid", "label": "ID", "type": "number", "primary_key": True},
-                    {"name": "razonsocial", "label": "Razón Social", "type": "text"},
-                    {"name": "cuit", "label": "CUIT", "type": "number"},
-                    {"name": "nro_socio_cepip", "label": "N° Socio CEPIP", "type": "number"},
-                    {"name": "web", "label": "Sitio Web", "type": "text"},
-                    {"name": "es_socio", "label": "Es Socio", "type": "boolean"},
-                    {"name": "esconsorcista", "label": "Es Consorcista", "type": "boolean"}
-                ],
-                "record_count": db.execute(text("SELECT COUNT(*) FROM ente")).scalar()
-            },
-            {
-                "name": "persona", 
-                "label": "Personas",
-                "description": "Personas asociadas a las empresas",
-                "columns": [
-                    {"name": "personaid", "label": "ID", "type": "number", "primary_key": True},
-                    {"name": "nombre_apellido", "label": "Nombre y Apellido", "type": "text"},
-                    {"name": "telefono", "label": "Teléfono", "type": "text"},
-                    {"name": "celular", "label": "Celular", "type": "text"},
-                    {"name": "correo_electronico", "label": "Email", "type": "email"}
-                ],
-                "record_count": db.execute(text("SELECT COUNT(*) FROM persona")).scalar()
-            },
-            {
-                "name": "consorcista",
-                "label": "Consorcistas", 
-                "description": "Consorcistas del parque industrial",
-                "columns": [
-                    {"name": "consorcistaid", "label": "ID", "type": "number", "primary_key": True},
-                    {"name": "nombre", "label": "Nombre", "type": "text"},
-                    {"name": "nro_consorcista", "label": "N° Consorcista", "type": "number"},
-                    {"name": "fecha_de_carga", "label": "Fecha de Carga", "type": "date"}
-                ],
-                "record_count": db.execute(text("SELECT COUNT(*) FROM consorcista")).scalar()
-            },
-            {
-                "name": "parcela",
-                "label": "Parcelas",
-                "description": "Parcelas del parque industrial", 
-                "columns": [
-                    {"name": "parcelaid", "label": "ID", "type": "number", "primary_key": True},
-                    {"name": "parcela", "label": "Parcela", "type": "text"},
-                    {"name": "calle", "label": "Calle", "type": "text"},
-                    {"name": "numero", "label": "Número", "type": "number"},
-                    {"name": "superficie_has", "label": "Superficie (ha)", "type": "number"},
-                    {"name": "tieneplanta", "label": "Tiene Planta", "type": "boolean"},
-                    {"name": "alquilada", "label": "Alquilada", "type": "boolean"}
-                ],
-                "record_count": db.execute(text("SELECT COUNT(*) FROM parcela")).scalar()
-            },
-            {
-                "name": "sector",
-                "label": "Sectores",
-                "description": "Sectores económicos",
-                "columns": [
-                    {"name": "sectorid", "label": "ID", "type": "number", "primary_key": True},
-                    {"name": "sector", "label": "Sector", "type": "text"}
-                ],
-                "record_count": db.execute(text("SELECT COUNT(*) FROM sector")).scalar()
-            }
-        ]
+        tables = tables_cache.get(counts)
+        if tables is None:
+            version = tables_cache.version
+            record_counts = dict((await db.execute(TABLE_COUNTS[counts])).fetchall())
+            
+            tables = _tables_payload(record_counts)
+            tables_cache.set(counts, tables, version)
         
-        return {"tables": cepip_tables}
+        return tables
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _tables_payload(record_counts: Dict[str, int]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Table list with the registry's column metadata and the given record counts
+    """
+    return {
+        "tables": [
+            {
+                "name": entity.name,
+                "label": entity.label,
+                "description": entity.description,
+                "columns": entity.schema_columns,
+                "record_count": record_counts[entity.name]
+            }
+            for entity in SCHEMA_ENTITIES
+        ]
+    }
+
 @router.get("/{table_name}/schema")
-async def get_table_schema(table_name: str, db: Session = Depends(get_db)):
+async def get_table_schema(table_name: str, db: AsyncSession = Depends(get_db)):
     """
     Get detailed schema for a specific table
     """
@@ -0,0 +1,34 @@
+"""
+Search conditions for the records listing
+
+Text columns are matched with ILIKE '%term%', which the pg_trgm GIN indexes
+from migration 0001 can serve. Purely numeric terms additionally take an
+exact-match fast path on the entity's numeric identifiers (btree indexed).
+"""
+
+from typing import Optional, Sequence
+
+# Largest value that fits the INTEGER columns searched exactly
+MAX_INTEGER = 2147483647
+
+
+def numeric_term(search: str) -> Optional[int]:
+    """
+    Return the search term as an integer when it can match an INTEGER column
+    """
+    term = search.strip()
+    if term.isascii() and term.isdigit() and int(term) <= MAX_INTEGER:
+        return int(term)
+    return None
+
+
+def search_condition(text_columns: Sequence[str], numeric_columns: Sequence[str] = ()) -> str:
+    """
+    Build the search condition over the given columns.
+
+    Binds ``:search`` (the ILIKE pattern) and, when numeric columns are
+    given, ``:search_number``.
+    """
+    conditions = [f"{column} ILIKE :search" for column in text_columns]
+    conditions.extend(f"{column} = :search_number" for column in numeric_columns)
+    return f"({' OR '.join(conditions)})"
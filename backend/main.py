@@ -5,12 +5,21 @@ CEPIP Web Application - FastAPI Backend
 
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 import os
 from dotenv import load_dotenv
+from sqlalchemy import text
 
-from app.database import engine, SessionLocal, Base
+from app.database import engine, async_engine, Base
+from app.migrations import run_migrations
+from app.auth import start_user_cache_listener
+from app.cache import lookup_cache, tables_cache, user_cache
+from app.pool import pool_stats
+from app.report_files import report_files
+from app.metrics import MetricsMiddleware, render_gauges, request_metrics
+from app.querystats import QueryStatsMiddleware
 from app.routes import api_router
 
 # Load environment variables
@@ -19,6 +28,12 @@ load_dotenv()
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+# Apply pending SQL migrations (indexes, extensions, ...)
+run_migrations(engine)
+
+# Keep the authenticated-user cache in sync with changes to the users table
+start_user_cache_listener(engine)
+
 # Initialize FastAPI
 app = FastAPI(
     title="CEPIP API",
@@ -37,19 +52,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# SQL statement count and time per request (Server-Timing header, slow-query log)
+app.add_middleware(QueryStatsMiddleware, metrics=request_metrics)
+
+# Per-route request metrics, served at /metrics (outermost, so it times everything)
+app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+
+@app.on_event("shutdown")
+async def close_database():
+    await async_engine.dispose()
+
 # Health check endpoint (must be before static files mount)
 @app.get("/health")
 async def health_check():
     try:
-        # Test database connection
-        from app.database import get_db
-        db = next(get_db())
-        db.execute("SELECT 1")
-        db.close()
-        return {"status": "healthy", "service": "CEPIP API", "database": "connected"}
+        # Test database connection (through the async engine the routes use)
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return {
+            "status": "healthy",
+            "service": "CEPIP API",
+            "database": "connected",
+            "caches": {
+                "users": user_cache.stats(),
+                "lookups": lookup_cache.stats(),
+                "tables": tables_cache.stats(),
+                "reports": report_files.stats(),
+            },
+            "pools": pool_stats(),
+        }
     except Exception as e:
         return {"status": "unhealthy", "service": "CEPIP API", "error": str(e)}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Request, connection pool and cache metrics in Prometheus text format
+    """
+    lines = request_metrics.render()
+    lines += render_gauges("cepip_db_pool", "Connection pool", pool_stats(), "pool")
+    lines += render_gauges("cepip_cache", "In-process cache", {
+        "users": user_cache.stats(),
+        "lookups": lookup_cache.stats(),
+        "tables": tables_cache.stats(),
+        "reports": report_files.stats(),
+    }, "cache")
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
 # Include API routes
 app.include_router(api_router, prefix="/api")
 
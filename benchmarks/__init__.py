@@ -0,0 +1,6 @@
+"""
+CEPIP performance benchmarks
+
+Every benchmark runs against the scratch database in BENCH_DATABASE_URL and
+rewrites its data, so never point it at a real database.
+"""
@@ -0,0 +1,253 @@
+"""
+End-to-end API benchmark suite
+
+For each scale factor, seeds the bench database at that multiple of the
+production row counts (333 ente, 989 persona, 991 relacion_ente_persona,
+319 parcela, ...), starts the API under uvicorn and drives every route under
+/api/records, /api/stats and /api/tables with concurrent clients for a fixed
+time each. Reports p50/p95/p99 latency, throughput and error counts per
+route as JSON, so runs can be compared (--compare a previous --output).
+
+Read routes run first; the write routes (which invalidate the caches and
+grow the tables) run last, unless --no-writes is given. With --generated the
+database is filled by generate_data (realistic values in every table)
+instead of seed_scaled.
+
+Usage: BENCH_DATABASE_URL=... python -m benchmarks.api_suite [--scales 1,10,100,1000] [--output run.json]
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from .common import (
+    ROOT_DIR, connect, prepare_schema, seed_scaled, api_env, start_server, stop_server, run_load, summarize,
+)
+from .generate_data import load as load_generated
+
+# Listing variants requested for every registered table
+LISTING_QUERIES = ["", "?page=3", "?count=estimate", "?count=none&limit=100"]
+
+# Extra listing variants exercising search and filters
+FILTERED_LISTINGS = [
+    "/api/records/ente?search=empresa&es_socio=true",
+    "/api/records/ente?search=30000123",
+    "/api/records/persona?search=persona1&con_email=true",
+    "/api/records/parcela?tieneplanta=true&alquilada=false",
+]
+
+
+class Scenario:
+    """
+    One route. ``path`` and string ``body`` values may contain {ente},
+    {persona}, {parcela}, {consorcista} and {relacion} placeholders, filled
+    with random existing ids ({relacion_persona} is the persona of
+    {relacion}), and {n}, the request number. ``setup`` runs untimed before
+    the request and may return extra placeholder values.
+    """
+
+    def __init__(self, method, route, path=None, body=None, setup=None, write=False):
+        self.method = method
+        self.route = route
+        self.path = path or route
+        self.body = body
+        self.setup = setup
+        self.write = write
+
+    def prepare(self, base_url, rows, seed):
+        rng = random.Random(seed)
+
+        def prepare(session, n):
+            values = {
+                "ente": rng.randint(1, rows["ente"]),
+                "persona": rng.randint(1, rows["persona"]),
+                "parcela": rng.randint(1, rows["parcela"]),
+                "consorcista": rng.randint(1, rows["consorcista"]),
+                "relacion": rng.randint(1, rows["relacion_ente_persona"]),
+                "n": n,
+            }
+            # Both seeders link relation g to persona 1 + g % personas
+            values["relacion_persona"] = 1 + values["relacion"] % rows["persona"]
+            if self.setup is not None:
+                values.update(self.setup(session, base_url, values))
+            url = base_url + self.path.format(**values)
+            body = None
+            if self.body is not None:
+                body = {key: value.format(**values) if isinstance(value, str) else value
+                        for key, value in self.body.items()}
+            return lambda: session.request(self.method, url, json=body, timeout=120)
+
+        return prepare
+
+
+def create_persona(session, base_url, values):
+    response = session.post(f"{base_url}/api/records/persona",
+                            json={"nombre_apellido": f"Bench {values['n']}", "telefono": "3410000000"}, timeout=120)
+    return {"created": response.json().get("data", {}).get("personaid", 0) if response.ok else 0}
+
+
+def scenarios():
+    from app.registry import ENTITIES, LOOKUPS
+
+    read = []
+    for name in ENTITIES:
+        for query in LISTING_QUERIES:
+            read.append(Scenario("GET", f"/api/records/{name}{query}"))
+    read += [Scenario("GET", path) for path in FILTERED_LISTINGS]
+    read += [Scenario("GET", f"/api/records/lookup/{name}") for name in LOOKUPS]
+    read += [
+        Scenario("GET", "/api/records/lookup?names=" + ",".join(LOOKUPS)),
+        Scenario("GET", "/api/records/persona/{persona_id}/relaciones", "/api/records/persona/{persona}/relaciones"),
+        Scenario("GET", "/api/records/consorcista/{consorcista_id}/parcelas",
+                 "/api/records/consorcista/{consorcista}/parcelas"),
+        Scenario("GET", "/api/records/ente/{ente_id}/direcciones", "/api/records/ente/{ente}/direcciones"),
+        Scenario("GET", "/api/records/ente/{ente_id}/camaras", "/api/records/ente/{ente}/camaras"),
+        Scenario("GET", "/api/records/ente/{ente_id}/sindicatos", "/api/records/ente/{ente}/sindicatos"),
+        Scenario("GET", "/api/records/ente/{ente_id}/detail", "/api/records/ente/{ente}/detail"),
+        Scenario("GET", "/api/records/{table_name}/{record_id}", "/api/records/ente/{ente}"),
+        Scenario("GET", "/api/stats"),
+        Scenario("GET", "/api/stats/dashboard"),
+        Scenario("GET", "/api/stats/empresas"),
+        Scenario("GET", "/api/stats/personas"),
+        Scenario("GET", "/api/stats/consorcistas"),
+        Scenario("GET", "/api/stats/parcelas"),
+        Scenario("GET", "/api/tables/?counts=exact"),
+        Scenario("GET", "/api/tables/?counts=fast"),
+        Scenario("GET", "/api/tables/{table_name}/schema", "/api/tables/clientes/schema"),
+    ]
+
+    write = [
+        Scenario("POST", "/api/records/{table_name}", "/api/records/ente",
+                 body={"razonsocial": "Bench {n} SA", "cuit": "30999999", "es_socio": True}, write=True),
+        Scenario("POST", "/api/records/consorcista",
+                 body={"nombre": "Bench {n}", "nro_consorcista": "{n}", "tipoid": 1}, write=True),
+        Scenario("POST", "/api/records/parcela",
+                 body={"parcela": "B-{n}", "calle": "Calle 1", "numero": "{n}", "superficie_has": "1.5"}, write=True),
+        Scenario("PUT", "/api/records/parcela/{parcela_id}/consorcista", "/api/records/parcela/{parcela}/consorcista",
+                 body={"consorcistaid": 1}, write=True),
+        Scenario("POST", "/api/records/persona/{persona_id}/relaciones", "/api/records/persona/{persona}/relaciones",
+                 body={"enteid": 1, "cargoid": 1}, write=True),
+        Scenario("DELETE", "/api/records/persona/{persona_id}/relaciones/{relacion_id}",
+                 "/api/records/persona/{relacion_persona}/relaciones/{relacion}", write=True),
+        Scenario("PUT", "/api/records/{table_name}/{record_id}", "/api/records/ente/{ente}",
+                 body={"razonsocial": "Bench"}, write=True),
+        Scenario("DELETE", "/api/records/{table_name}/{record_id}", "/api/records/persona/{created}",
+                 setup=create_persona, write=True),
+    ]
+    return read, write
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current):
+    """
+    Print the p50/p95 and throughput change of every route present in both runs
+    """
+    previous = {(scale["scale"], r["method"], r["route"]): r for scale in baseline["results"] for r in scale["routes"]}
+    print(f"\nvs {baseline['meta'].get('revision')} ({baseline['meta'].get('started_at')})")
+    for scale in current["results"]:
+        for result in scale["routes"]:
+            before = previous.get((scale["scale"], result["method"], result["route"]))
+            if before is None:
+                continue
+
+            def change(now, then):
+                return f"{(now - then) / then * 100:+6.1f}%" if then else "   n/a"
+
+            print(f"x{scale['scale']:<5} {result['method']:<6} {result['route']:<60} "
+                  f"p50 {change(result['latency_ms']['p50'], before['latency_ms']['p50'])}  "
+                  f"p95 {change(result['latency_ms']['p95'], before['latency_ms']['p95'])}  "
+                  f"rps {change(result['rps'], before['rps'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1,10,100,1000", help="Multiples of the production row counts")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent clients per route")
+    parser.add_argument("--duration", type=float, default=3, help="Seconds per route")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--routes", default="", help="Only routes containing this text")
+    parser.add_argument("--no-writes", action="store_true", help="Skip the POST/PUT/DELETE routes")
+    parser.add_argument("--generated", action="store_true", help="Seed with generate_data instead of seed_scaled")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    env, token = api_env()
+    read, write = scenarios()
+    selected = [s for s in read + ([] if args.no_writes else write) if args.routes in s.route]
+
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "clients": args.clients,
+            "duration_s": args.duration,
+            "workers": args.workers,
+            "data": "generated" if args.generated else "seed_scaled",
+        },
+        "results": [],
+    }
+
+    for scale in [int(s) for s in args.scales.split(",")]:
+        conn = connect()
+        prepare_schema(conn)
+        start = time.perf_counter()
+        rows = load_generated(conn, scale) if args.generated else seed_scaled(conn, scale)
+        conn.close()
+        print(f"Seeded x{scale} in {time.perf_counter() - start:.1f} s: {rows}")
+
+        server = start_server(args.port, env, workers=args.workers)
+        base_url = f"http://127.0.0.1:{args.port}"
+        routes = []
+        try:
+            for number, scenario in enumerate(selected):
+                prepare = scenario.prepare(base_url, rows, seed=number)
+                run_load(1, 0.2, token, prepare)  # warm up
+                samples, errors = run_load(args.clients, args.duration, token, prepare)
+                result = {
+                    "method": scenario.method,
+                    "route": scenario.route,
+                    "path": scenario.path,
+                    "write": scenario.write,
+                    "requests": len(samples),
+                    "rps": round(len(samples) / args.duration, 1),
+                    "errors": len(errors),
+                    "error_statuses": sorted(set(errors), key=str),
+                    "latency_ms": summarize(samples),
+                }
+                routes.append(result)
+                print(f"x{scale:<5} {scenario.method:<6} {scenario.path:<60} {result['rps']:>8.1f} req/s  "
+                      f"p50={result['latency_ms']['p50']:>8.2f}  p95={result['latency_ms']['p95']:>8.2f}  "
+                      f"p99={result['latency_ms']['p99']:>8.2f} ms  errors={result['errors']}")
+        finally:
+            stop_server(server)
+
+        report["results"].append({"scale": scale, "rows": rows, "routes": routes})
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import statistics
+
+import psycopg2
+from dotenv import load_dotenv
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT_DIR, "backend")
+SCHEMA_FILE = os.path.join(ROOT_DIR, "database", "postgresql_schema.sql")
+
+load_dotenv()
+
+
+def get_bench_url():
+    """
+    Scratch database URL; deliberately never falls back to DATABASE_URL
+    """
+    url = os.getenv("BENCH_DATABASE_URL")
+    if not url:
+        print("❌ ERROR: BENCH_DATABASE_URL no está configurada (usar una base de pruebas)")
+        sys.exit(1)
+    return url
+
+
+def import_backend():
+    """
+    Make the backend ``app`` package importable, bound to the bench database
+    """
+    os.environ["DATABASE_URL"] = get_bench_url()
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+
+
+def api_env():
+    """
+    Environment for an API server on the bench database, and a bearer token
+    for it. The dev user skips the users table, so it works on a fresh base.
+    """
+    env = dict(os.environ, DATABASE_URL=get_bench_url(), ENVIRONMENT="development",
+               SECRET_KEY=os.getenv("SECRET_KEY", "bench-secret"))
+    os.environ.update(env)
+    import_backend()
+    from app.auth import AuthService
+    return env, AuthService.create_access_token({"sub": "dev@cepip.local"})
+
+
+def start_server(port, env, workers=1):
+    """
+    Start uvicorn on the backend and wait until /health reports healthy
+    """
+    import requests
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).json()["status"] == "healthy":
+                return server
+        except (requests.RequestException, ValueError):
+            pass
+        time.sleep(0.5)
+    server.terminate()
+    print("❌ ERROR: el servidor no respondió a /health")
+    sys.exit(1)
+
+
+def stop_server(server):
+    server.terminate()
+    server.wait()
+
+
+def run_load(clients, duration, token, prepare):
+    """
+    ``clients`` threads issue requests back to back for ``duration`` seconds.
+
+    ``prepare(session, n)`` does any untimed setup for the n-th request of a
+    client and returns a zero-argument callable that sends it. Returns the
+    latencies in milliseconds and the errors: unexpected status codes, or
+    the exception name of requests that got no response (timeouts).
+    """
+    import requests
+
+    samples = []
+    errors = []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(offset):
+        session = requests.Session()
+        session.headers["Authorization"] = f"Bearer {token}"
+        local = []
+        local_errors = []
+        n = offset
+        while time.monotonic() < stop_at:
+            send = prepare(session, n)
+            start = time.perf_counter()
+            try:
+                response = send()
+            except requests.RequestException as e:
+                local_errors.append(type(e).__name__)
+                n += clients
+                continue
+            local.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                local_errors.append(response.status_code)
+            n += clients
+        with lock:
+            samples.extend(local)
+            errors.extend(local_errors)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, errors
+
+
+def connect():
+    conn = psycopg2.connect(get_bench_url())
+    conn.autocommit = True
+    return conn
+
+
+def prepare_schema(conn):
+    """
+    Create the CEPIP tables and apply the app's migrations
+    """
+    with open(SCHEMA_FILE, encoding="utf-8") as f:
+        schema_sql = f.read()
+
+    with conn.cursor() as cursor:
+        cursor.execute(schema_sql)
+        # The production table carries the Access-derived column name
+        cursor.execute("ALTER TABLE parcela ADD COLUMN IF NOT EXISTS superficie_has_ VARCHAR(255)")
+
+    import_backend()
+    from sqlalchemy import create_engine
+    from app.migrations import run_migrations
+
+    engine = create_engine(get_bench_url())
+    try:
+        run_migrations(engine)
+    finally:
+        engine.dispose()
+
+
+def measure(fn, repeat=20, warmup=3):
+    """
+    Run ``fn`` repeatedly and return latency stats in milliseconds
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return summarize(samples)
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50": round(percentile(ordered, 50), 3),
+        "p95": round(percentile(ordered, 95), 3),
+        "p99": round(percentile(ordered, 99), 3),
+        "mean": round(statistics.fmean(ordered), 3) if ordered else 0.0,
+    }
+
+
+def percentile(ordered, pct):
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def endpoint_kwargs(endpoint, **overrides):
+    """
+    Keyword arguments to call a FastAPI endpoint directly, with its Query defaults
+    """
+    import inspect
+
+    kwargs = {}
+    for name, param in inspect.signature(endpoint).parameters.items():
+        if param.default is inspect.Parameter.empty:
+            continue
+        kwargs[name] = getattr(param.default, "default", param.default)
+    kwargs.update(overrides)
+    return kwargs
+
+
+class capture_statements:
+    """
+    Context manager recording the (sql, params) pairs an engine sends to the
+    driver, in a form a psycopg2 cursor can replay
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if context.dialect.paramstyle == "numeric_dollar":
+            statement, parameters = to_pyformat(statement, parameters)
+        self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        from sqlalchemy import event
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self.statements
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        event.remove(self.engine, "before_cursor_execute", self._record)
+        return False
+
+
+def to_pyformat(statement, parameters):
+    """
+    Rewrite an asyncpg ($1, $2, ...) statement into psycopg2's pyformat
+    """
+    statement = re.sub(r"\$(\d+)", r"%(p\1)s", statement.replace("%", "%%"))
+    return statement, {f"p{i}": value for i, value in enumerate(parameters, 1)}
+
+
+# Row counts of the production Access export (database/postgresql_schema.sql)
+PRODUCTION_ROWS = {
+    "sector": 18,
+    "rubro": 89,
+    "subrubro": 169,
+    "ente": 333,
+    "persona": 989,
+    "relacion_ente_persona": 991,
+    "consorcista": 205,
+    "parcela": 319,
+}
+
+
+def seed_scaled(conn, scale):
+    """
+    Replace the core tables with synthetic rows at ``scale`` times production size
+    """
+    rows = {table: count * scale for table, count in PRODUCTION_ROWS.items()}
+
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            TRUNCATE sector, rubro, subrubro, ente, persona, relacion_ente_persona,
+                     consorcista, tipo_consorcista, parcela RESTART IDENTITY
+        """)
+        cursor.execute("INSERT INTO tipo_consorcista VALUES (1, 'Propietario'), (2, 'Inquilino')")
+        cursor.execute("INSERT INTO sector (sector) SELECT 'Sector ' || g FROM generate_series(1, %(n)s) g",
+                       {"n": rows["sector"]})
+        cursor.execute("""
+            INSERT INTO rubro (sectorid, rubro)
+            SELECT 1 + g %% %(sectors)s, 'Rubro ' || g FROM generate_series(1, %(n)s) g
+        """, {"n": rows["rubro"], "sectors": rows["sector"]})
+        cursor.execute("""
+            INSERT INTO subrubro (rubroid, sub_numero, subrubro)
+            SELECT 1 + g %% %(rubros)s, g, 'Subrubro ' || g FROM generate_series(1, %(n)s) g
+        """, {"n": rows["subrubro"], "rubros": rows["rubro"]})
+        cursor.execute("""
+            INSERT INTO consorcista (nombre, nro_consorcista, tipoid, fecha_de_carga)
+            SELECT 'Consorcista ' || g, g, 1 + g %% 2, DATE '2019-01-01' + g %% 2000
+            FROM generate_series(1, %(n)s) g
+        """, {"n": rows["consorcista"]})
+        cursor.execute("""
+            INSERT INTO ente (nro_socio_cepip, razonsocial, cuit, web, consorcistaid, actividadprincipalid,
+                              fecha_de_carga, esconsorcista, es_socio)
+            SELECT g, 'Empresa ' || g || ' SA', 30000000 + g, 'www.e' || g || '.com',
+                   CASE WHEN g %% 3 = 0 THEN 1 + g %% %(consorcistas)s END, 1 + g %% %(rubros)s,
+                   DATE '2019-01-01' + g %% 2000, g %% 3 = 0, g %% 2 = 0
+            FROM generate_series(1, %(n)s) g
+        """, {"n": rows["ente"], "consorcistas": rows["consorcista"], "rubros": rows["rubro"]})
+        cursor.execute("""
+            INSERT INTO persona (fecha_de_carga, nombre_apellido, telefono, correo_electronico)
+            SELECT TIMESTAMP '2019-01-01' + g * INTERVAL '1 hour', 'Persona ' || g,
+                   CASE WHEN g %% 2 = 0 THEN '341' || g END,
+                   CASE WHEN g %% 3 <> 0 THEN 'persona' || g || '@example.com' END
+            FROM generate_series(1, %(n)s) g
+        """, {"n": rows["persona"]})
+        cursor.execute("""
+            INSERT INTO relacion_ente_persona (ente_persona_id, enteid, personaid, fecha_de_carga)
+            SELECT g, 1 + g %% %(entes)s, 1 + g %% %(personas)s, CURRENT_DATE
+            FROM generate_series(1, %(n)s) g
+        """, {"n": rows["relacion_ente_persona"], "entes": rows["ente"], "personas": rows["persona"]})
+        cursor.execute("""
+            INSERT INTO parcela (parcela, calle, numero, superficie_has_, consorcistaid,
+                                 tieneplanta, alquilada, fecha_de_carga, enteid)
+            SELECT 'P-' || g, 'Calle ' || (1 + g %% 25), g,
+                   CASE WHEN g %% 4 = 0 THEN '' ELSE (1 + g %% 9) || '.5' END,
+                   CASE WHEN g %% 4 <> 0 THEN 1 + g %% %(consorcistas)s END,
+                   g %% 2 = 0, g %% 7 = 0, TIMESTAMP '2019-01-01' + g * INTERVAL '1 hour',
+                   1 + g %% %(entes)s
+            FROM generate_series(1, %(n)s) g
+        """, {"n": rows["parcela"], "consorcistas": rows["consorcista"], "entes": rows["ente"]})
+        # VACUUM too: until the new rows are marked all-visible, searches run
+        # several times slower and timings depend on when autovacuum gets to them
+        cursor.execute("VACUUM ANALYZE")
+
+    return rows
@@ -0,0 +1,135 @@
+"""
+Concurrent logins against AuthService.get_or_create_user
+
+Fires parallel first logins at an empty users table and checks that exactly
+one user became admin and that every account got exactly one row; then
+fires parallel logins of one account, and of the same Google account under
+a new email, and checks it is not duplicated. Also reports per-login
+latency. Exits non-zero when a check fails. tests/test_concurrent_logins.py
+runs the same rounds under pytest.
+
+Usage: BENCH_DATABASE_URL=... python -m benchmarks.concurrent_logins [--workers 32] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import sys
+
+from .common import connect, prepare_schema, import_backend, get_bench_url, measure
+
+
+def reset_users(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("TRUNCATE users RESTART IDENTITY")
+        cursor.execute("DELETE FROM users_bootstrap")
+
+
+async def run_parallel(workers, login):
+    """
+    Run ``login(i)`` for ``workers`` logins at once and return their errors
+    """
+    results = await asyncio.gather(*(login(i) for i in range(workers)), return_exceptions=True)
+    return [result for result in results if isinstance(result, Exception)]
+
+
+def login_engine(workers):
+    """
+    Async engine on the bench database with one connection per worker, so
+    the logins really overlap, and ``login(email, google_id)`` running
+    AuthService.get_or_create_user on a session of its own
+    """
+    import_backend()
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from app.auth import AuthService
+    from app.database import async_url
+
+    url, connect_args = async_url(get_bench_url())
+    engine = create_async_engine(url, connect_args=connect_args, pool_size=workers)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def login(email, google_id):
+        async with Session() as db:
+            return await AuthService.get_or_create_user(db, {
+                "google_id": google_id, "email": email, "name": email, "picture": None,
+            })
+
+    return engine, login
+
+
+async def login_round(workers, login):
+    """
+    ``workers`` first logins of distinct accounts at once, then ``workers``
+    logins of one shared account (ON CONFLICT (email)) and of that Google
+    account under a new email (the google_id fallback); returns the errors
+    """
+    errors = await run_parallel(workers, lambda i: login(f"user{i}@example.com", f"g{i}"))
+    errors += await run_parallel(workers, lambda i: login("shared@example.com", "g-shared"))
+    errors += await run_parallel(workers, lambda i: login("shared-renamed@example.com", "g-shared"))
+    return errors
+
+
+def count_users(conn):
+    """
+    (users, admins, distinct emails, rows of the shared Google account)
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT COUNT(*), COUNT(*) FILTER (WHERE is_admin), COUNT(DISTINCT email),
+                   COUNT(*) FILTER (WHERE google_id = 'g-shared')
+            FROM users
+        """)
+        return cursor.fetchone()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=32, help="Parallel logins per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds starting from an empty users table")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed sequential logins")
+    args = parser.parse_args()
+
+    conn = connect()
+    prepare_schema(conn)
+
+    engine, login = login_engine(args.workers)
+    loop = asyncio.new_event_loop()
+
+    failures = []
+    for round_number in range(1, args.rounds + 1):
+        reset_users(conn)
+        errors = loop.run_until_complete(login_round(args.workers, login))
+        users, admins, emails, shared = count_users(conn)
+
+        expected = args.workers + 1
+        ok = not errors and admins == 1 and users == expected and emails == expected and shared == 1
+        print(f"round {round_number}: users={users} (expected {expected}) admins={admins} shared={shared} "
+              f"errors={len(errors)} {'✅' if ok else '❌'}")
+        if not ok:
+            failures.append(round_number)
+            for error in errors[:3]:
+                print(f"   {type(error).__name__}: {error}")
+
+    reset_users(conn)
+    counter = iter(range(10 ** 9))
+
+    def new_user_login():
+        n = next(counter)
+        loop.run_until_complete(login(f"timed{n}@example.com", f"t{n}"))
+
+    def returning_login():
+        loop.run_until_complete(login("timed-returning@example.com", "t-returning"))
+
+    new_user_ms = measure(new_user_login, repeat=args.repeat)
+    returning_ms = measure(returning_login, repeat=args.repeat)
+    print(f"new user login p50={new_user_ms['p50']:.2f} ms  returning login p50={returning_ms['p50']:.2f} ms")
+
+    loop.run_until_complete(engine.dispose())
+    loop.close()
+    conn.close()
+    if failures:
+        print(f"❌ Failed rounds: {failures}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
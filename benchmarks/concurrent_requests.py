@@ -0,0 +1,76 @@
+"""
+Concurrent HTTP load against one uvicorn worker
+
+Seeds the bench database, starts the API as a single uvicorn worker and
+drives it with a growing number of concurrent clients, each looping over a
+mix of read endpoints for a fixed time. Reports requests/second and latency
+per concurrency level; with a non-blocking data path throughput keeps rising
+with concurrency instead of flattening at the single-client rate.
+
+Usage: BENCH_DATABASE_URL=... python -m benchmarks.concurrent_requests [--scale 100] [--concurrency 1,4,16,64]
+"""
+
+import argparse
+import json
+
+from .common import connect, prepare_schema, seed_scaled, api_env, start_server, stop_server, run_load, summarize
+
+# Endpoints each client cycles through (the listing searches miss the cache on purpose)
+PATHS = [
+    "/api/records/persona?search=persona1&count=exact",
+    "/api/records/ente?search=empresa&count=exact",
+    "/api/records/parcela?page=5",
+    "/api/stats",
+    "/api/stats/empresas",
+    "/api/tables/?counts=exact",
+]
+
+
+def cycle_paths(base_url):
+    def prepare(session, n):
+        url = base_url + PATHS[n % len(PATHS)]
+        return lambda: session.get(url, timeout=60)
+    return prepare
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100, help="Multiple of the production row counts")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="Concurrent clients per level")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per level")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    conn = connect()
+    prepare_schema(conn)
+    rows = seed_scaled(conn, args.scale)
+    conn.close()
+    print(f"Seeded x{args.scale}: {rows}")
+
+    env, token = api_env()
+    server = start_server(args.port, env)
+    results = []
+    try:
+        base_url = f"http://127.0.0.1:{args.port}"
+        run_load(1, 1, token, cycle_paths(base_url))  # warm up pools and caches
+        for clients in [int(c) for c in args.concurrency.split(",")]:
+            samples, errors = run_load(clients, args.duration, token, cycle_paths(base_url))
+            result = {
+                "clients": clients,
+                "requests": len(samples),
+                "rps": round(len(samples) / args.duration, 1),
+                "errors": len(errors),
+                "latency_ms": summarize(samples),
+            }
+            results.append(result)
+            print(f"clients={clients:>4}  {result['rps']:>8.1f} req/s  "
+                  f"p50={result['latency_ms']['p50']:>8.2f} ms  p95={result['latency_ms']['p95']:>8.2f} ms  "
+                  f"errors={result['errors']}")
+    finally:
+        stop_server(server)
+
+    print(json.dumps({"scale": args.scale, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
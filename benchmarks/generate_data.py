@@ -0,0 +1,593 @@
+"""
+Synthetic CEPIP dataset
+
+Fills every table of database/postgresql_schema.sql with referentially
+consistent data: empresas with valid CUITs and socio/consorcista flags at
+roughly the production rates, personas with Spanish names, phones and
+e-mails, their relations to entes, cámaras and sindicatos, parcelas owned by
+consorcistas, accesos over the park's streets, and the sector / rubro /
+subrubro hierarchy.
+
+The catalogs (area, cargo, camara, sindicato, sector, rubro, subrubro, calle,
+tipo_consorcista) keep their production size; every other table gets
+``--scale`` times its production row count. Rows are streamed to COPY FREEZE
+in a single transaction, so x1000 (about a million personas and relations)
+loads in seconds. The per-row consorcista counter and data version triggers
+are paused during the load (the TRUNCATE already moves the data version) and
+the counters rebuilt once at the end; the statement-level stats triggers run
+as usual.
+
+Usage: BENCH_DATABASE_URL=... python -m benchmarks.generate_data [--scale 100] [--seed 1]
+"""
+
+import argparse
+import json
+import random
+import time
+import unicodedata
+from datetime import date, timedelta
+from itertools import accumulate
+
+from .common import connect, prepare_schema
+
+# Production row counts of the tables that scale (condomino is empty in
+# production; it gets a few rows so the table is exercised)
+SCALED_ROWS = {
+    "consorcista": 205,
+    "ente": 333,
+    "persona": 989,
+    "relacion_ente_persona": 991,
+    "relacion_ente_camara": 46,
+    "relacion_ente_sindicato": 4,
+    "parcela": 319,
+    "parcela_alquilada": 4,
+    "accesos_ente": 241,
+    "anotaciones": 1,
+    "condomino": 10,
+}
+
+# Flag rates of the production data
+RATES = {
+    "ente.es_socio": 0.55,
+    "ente.esconsorcista": 0.30,
+    "ente.web": 0.45,
+    "ente.observaciones": 0.15,
+    "ente.actividadsecundaria": 0.25,
+    "persona.telefono": 0.70,
+    "persona.celular": 0.60,
+    "persona.email": 0.65,
+    "persona.consorcista": 0.10,
+    "relacion.area": 0.80,
+    "consorcista.inquilino": 0.15,
+    "consorcista.persona": 0.30,
+    "parcela.consorcista": 0.85,
+    "parcela.ente": 0.80,
+    "parcela.tieneplanta": 0.60,
+    "parcela.alquilada": 0.10,
+}
+
+NOMBRES = [
+    "Juan", "Carlos", "Jorge", "Luis", "Miguel", "José", "Roberto", "Daniel", "Alejandro", "Marcelo",
+    "Sergio", "Gustavo", "Pablo", "Diego", "Fernando", "Martín", "Ricardo", "Eduardo", "Héctor", "Raúl",
+    "Claudio", "Ariel", "Federico", "Gonzalo", "Matías", "Sebastián", "Nicolás", "Facundo", "Leandro", "Hernán",
+    "María", "Ana", "Laura", "Silvia", "Patricia", "Graciela", "Mónica", "Claudia", "Marcela", "Gabriela",
+    "Andrea", "Verónica", "Carolina", "Florencia", "Valeria", "Lorena", "Natalia", "Romina", "Cecilia", "Paula",
+    "Susana", "Liliana", "Beatriz", "Norma", "Alicia", "Sofía", "Lucía", "Julieta", "Agustina", "Mariana",
+]
+
+APELLIDOS = [
+    "González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez", "Pérez", "García", "Sánchez",
+    "Romero", "Sosa", "Álvarez", "Torres", "Ruiz", "Ramírez", "Flores", "Acosta", "Benítez", "Medina",
+    "Suárez", "Herrera", "Aguirre", "Pereyra", "Gutiérrez", "Giménez", "Molina", "Silva", "Castro", "Rojas",
+    "Ortiz", "Luna", "Juárez", "Cabrera", "Ríos", "Ferreyra", "Godoy", "Morales", "Domínguez", "Moreno",
+    "Peralta", "Vega", "Carrizo", "Quiroga", "Castillo", "Ledesma", "Muñoz", "Ojeda", "Ponce", "Vera",
+    "Rossi", "Russo", "Bianchi", "Ferrari", "Romano", "Colombo", "Bruno", "Marino", "Greco", "Costa",
+    "Blanco", "Navarro", "Iglesias", "Méndez", "Cardozo", "Villalba", "Figueroa", "Correa", "Paz", "Bustos",
+]
+
+EMPRESA_PALABRAS = [
+    "Metalúrgica", "Industrias", "Plásticos", "Química", "Alimentos", "Logística", "Transportes", "Envases",
+    "Maderera", "Textil", "Frigorífico", "Laboratorios", "Construcciones", "Fundición", "Papelera", "Tecnología",
+    "Autopartes", "Aceros", "Pinturas", "Distribuidora", "Agroindustrial", "Electromecánica", "Vidriería",
+    "Cerámica", "Molinos", "Curtiembre", "Gráfica", "Farmacéutica",
+]
+
+EMPRESA_NOMBRES = [
+    "del Sur", "del Norte", "Pilar", "Argentina", "Pampeana", "del Plata", "Río Luján", "Los Robles",
+    "San Martín", "La Rural", "Atlántica", "Andina", "del Parque", "Panamericana", "El Ceibo", "Las Acacias",
+    "Del Centro", "Austral", "Mercosur", "La Unión", "San Jorge", "Santa Rosa", "Del Litoral", "Patagónica",
+]
+
+SOCIEDADES = ["S.A.", "S.A.", "S.A.", "S.R.L.", "S.R.L.", "S.A.S.", "S.A.I.C.", "Hnos. S.A."]
+
+DOMINIOS_CORREO = ["gmail.com", "hotmail.com", "yahoo.com.ar", "outlook.com", "fibertel.com.ar"]
+
+AREAS = [
+    "Directorio", "Presidencia", "Gerencia General", "Administración", "Finanzas", "Recursos Humanos",
+    "Producción", "Planta", "Calidad", "Mantenimiento", "Ingeniería", "Logística", "Depósito", "Compras",
+    "Ventas", "Comercio Exterior", "Marketing", "Sistemas", "Legales", "Seguridad e Higiene", "Medio Ambiente",
+]
+
+CARGOS = [
+    "Gerente", "Jefe", "Responsable", "Encargado", "Supervisor", "Coordinador", "Director", "Analista",
+    "Asistente", "Técnico", "Subgerente", "Auxiliar", "Asesor", "Referente",
+]
+
+# 18 sectores with their rubros; subrubros are derived from the rubros
+SECTORES = {
+    "Alimentos y Bebidas": ["Frigoríficos", "Lácteos", "Panificados", "Bebidas sin alcohol", "Golosinas"],
+    "Metalmecánica": ["Fundición", "Matricería", "Estructuras metálicas", "Tornería", "Tratamientos térmicos"],
+    "Química": ["Pinturas", "Detergentes", "Adhesivos", "Gases industriales", "Agroquímicos"],
+    "Plásticos y Caucho": ["Envases plásticos", "Film", "Inyección", "Caucho", "Reciclado de plásticos"],
+    "Farmacéutica": ["Medicamentos", "Cosmética", "Productos veterinarios", "Droguerías", "Insumos médicos"],
+    "Automotriz": ["Autopartes", "Carrocerías", "Neumáticos", "Baterías", "Accesorios"],
+    "Textil y Confección": ["Hilandería", "Tejeduría", "Confección", "Tintorería", "Calzado"],
+    "Papel y Gráfica": ["Papel", "Cartón corrugado", "Imprenta", "Etiquetas", "Packaging"],
+    "Madera y Muebles": ["Aserraderos", "Muebles", "Aberturas", "Pallets", "Tableros"],
+    "Construcción": ["Materiales de construcción", "Hormigón", "Premoldeados", "Sanitarios", "Cerámicos"],
+    "Electrónica": ["Electrónica industrial", "Tableros eléctricos", "Iluminación", "Cables", "Electrodomésticos"],
+    "Logística": ["Transporte de cargas", "Depósitos", "Distribución", "Cadena de frío", "Courier"],
+    "Energía": ["Generación", "Combustibles", "Energía solar", "Gas", "Equipos eléctricos"],
+    "Maquinaria": ["Maquinaria agrícola", "Maquinaria industrial", "Hidráulica", "Neumática", "Herramientas"],
+    "Servicios Industriales": ["Mantenimiento", "Limpieza industrial", "Seguridad", "Consultoría", "Laboratorio de ensayos"],
+    "Vidrio y Minerales": ["Vidrio", "Cal y yeso", "Áridos", "Abrasivos", "Refractarios"],
+    "Reciclado y Ambiente": ["Tratamiento de residuos", "Reciclado de metales", "Efluentes", "Compostaje", "Chatarra"],
+    "Tecnología": ["Software", "Automatización", "Telecomunicaciones", "Robótica"],
+}
+
+SUBRUBRO_PREFIJOS = ["Fabricación de", "Distribución de", "Servicios de", "Reparación de"]
+
+CAMARAS = [
+    ("UIA", "Unión Industrial Argentina"),
+    ("CAME", "Confederación Argentina de la Mediana Empresa"),
+    ("CAC", "Cámara Argentina de Comercio y Servicios"),
+    ("ADIMRA", "Asociación de Industriales Metalúrgicos de la República Argentina"),
+    ("CIQyP", "Cámara de la Industria Química y Petroquímica"),
+    ("CAIP", "Cámara Argentina de la Industria Plástica"),
+    ("COPAL", "Coordinadora de las Industrias de Productos Alimenticios"),
+    ("CAMARCO", "Cámara Argentina de la Construcción"),
+    ("FAIMA", "Federación Argentina de la Industria Maderera y Afines"),
+    ("AFAC", "Asociación de Fábricas Argentinas de Componentes"),
+    ("CILFA", "Cámara Industrial de Laboratorios Farmacéuticos Argentinos"),
+    ("CADIEEL", "Cámara Argentina de Industrias Electrónicas y Electromecánicas"),
+    ("FADEEAC", "Federación Argentina de Entidades Empresarias del Autotransporte de Cargas"),
+    ("UIPBA", "Unión Industrial de la Provincia de Buenos Aires"),
+    ("CAFMA", "Cámara Argentina de Fabricantes de Maquinaria Agrícola"),
+]
+
+SINDICATOS = [
+    ("UOM", "Unión Obrera Metalúrgica"),
+    ("SMATA", "Sindicato de Mecánicos y Afines del Transporte Automotor"),
+    ("UOCRA", "Unión Obrera de la Construcción de la República Argentina"),
+    ("FEMCA", "Federación de Empleados de Comercio"),
+    ("STIA", "Sindicato de Trabajadores de la Industria de la Alimentación"),
+    ("UOYEP", "Unión Obreros y Empleados Plásticos"),
+    ("FATIQYP", "Federación Argentina de Trabajadores de Industrias Químicas y Petroquímicas"),
+    ("FATSA", "Federación de Asociaciones de Trabajadores de la Sanidad Argentina"),
+    ("Camioneros", "Sindicato de Choferes de Camiones"),
+    ("AOT", "Asociación Obrera Textil"),
+    ("FATIDA", "Federación Argentina de Trabajadores de la Industria del Papel"),
+    ("USIMRA", "Unión de Sindicatos de la Industria Maderera"),
+    ("Luz y Fuerza", "Sindicato de Luz y Fuerza"),
+    ("FOEIVA", "Federación Obrera de la Industria del Vidrio y Afines"),
+    ("UPCN", "Unión del Personal Civil de la Nación"),
+    ("ASIMRA", "Asociación de Supervisores de la Industria Metalmecánica"),
+]
+
+CALLES = [
+    "Av. de los Industriales", "Av. Panamericana Colectora Este", "Av. Caamaño", "Calle Uruguay",
+    "Calle Paraguay", "Calle Chile", "Calle Bolivia", "Calle Brasil", "Calle Perú", "Calle México",
+    "Calle Colombia", "Calle Venezuela", "Calle Ecuador", "Calle Honduras", "Calle Panamá",
+    "Calle Guatemala", "Calle Costa Rica", "Calle Cuba", "Calle Haití", "Calle Nicaragua",
+    "Calle El Salvador", "Calle Puerto Rico", "Calle Jamaica", "Ruta 8 Colectora", "Ruta 25",
+]
+
+FRACCIONES = ["A", "B", "C", "D", "E", "F", "G", "H"]
+
+ANOTACIONES = [
+    "Solicitar actualización de datos de contacto",
+    "Pendiente renovación de habilitación municipal",
+    "Reclamo por iluminación del acceso",
+    "Enviar invitación a la asamblea anual",
+    "Consultar por ampliación de planta",
+    "Deuda de expensas regularizada",
+]
+
+
+# COPY text format values; generated text never contains tabs, newlines or backslashes
+NULL = "\\N"
+TRUE = "t"
+FALSE = "f"
+
+
+def cuit(random, prefix):
+    """
+    A CUIT with the given type prefix (20/27 personas, 30/33 empresas) and a
+    valid mod-11 check digit
+    """
+    while True:
+        digits = f"{prefix}{10_000_000 + int(random() * 90_000_000)}"
+        total = sum(int(d) * w for d, w in zip(digits, (5, 4, 3, 2, 7, 6, 5, 4, 3, 2)))
+        check = 11 - total % 11
+        if check == 11:
+            check = 0
+        if check != 10:
+            return int(digits + str(check))
+
+
+def slug(text):
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+    return "".join(c for c in text if c.isalnum())
+
+
+class Generator:
+    """
+    Row sources for every table, sharing one seeded RNG. Rows are tuples of
+    COPY text values. The catalogs are built up front; the scaled tables are
+    generators, so no table is held in memory.
+
+    The hot loops draw from ``random()`` directly and pick dates and slugs
+    from precomputed lists: randint() and date arithmetic per value would
+    dominate a million-row load.
+    """
+
+    def __init__(self, scale, seed=1, full_cuit=False, superficie_text=True):
+        self.rng = random.Random(seed)
+        self.random = self.rng.random
+        self.full_cuit = full_cuit
+        self.superficie_text = superficie_text
+        self.rows = {table: count * scale for table, count in SCALED_ROWS.items()}
+
+        self.rubros = [(sectorid, rubro) for sectorid, rubros in enumerate(SECTORES.values(), 1)
+                       for rubro in rubros]
+        self.subrubros = [
+            (rubroid, rubroid * 100 + k, f"{SUBRUBRO_PREFIJOS[(rubroid + k) % len(SUBRUBRO_PREFIJOS)]} "
+                                         f"{rubro[0].lower() + rubro[1:]}")
+            for rubroid, (_, rubro) in enumerate(self.rubros, 1)
+            for k in range(1, 2 + (rubroid % 10 != 9))
+        ]
+        self.camaras = CAMARAS + [(f"CA{slug(rubro)[:4].upper()}", f"Cámara Argentina de {rubro}")
+                                  for _, rubro in self.rubros[:45 - len(CAMARAS)]]
+        self.sindicatos = SINDICATOS + [(f"ST{slug(rubro)[:4].upper()}", f"Sindicato de Trabajadores de {rubro}")
+                                        for _, rubro in self.rubros[:61 - len(SINDICATOS)]]
+        self.cargos = [f"{cargo} de {area}" for area in AREAS for cargo in CARGOS][:284]
+        # A few rubros concentrate most of the empresas, as in production
+        self.rubro_weights = list(accumulate(1 / (1 + i % 30) for i in range(len(self.rubros))))
+
+        self.days = [str(date(2005, 1, 1) + timedelta(days=d)) for d in range(7000)]
+        self.slugs = {word: slug(word) for word in NOMBRES + APELLIDOS + EMPRESA_PALABRAS + EMPRESA_NOMBRES}
+        self.rentals = []
+
+    def chance(self, key):
+        return self.random() < RATES[key]
+
+    def pick(self, values):
+        return values[int(self.random() * len(values))]
+
+    def ref(self, count):
+        """
+        A random id in 1..count, as text
+        """
+        return str(1 + int(self.random() * count))
+
+    def day(self):
+        return self.pick(self.days)
+
+    def moment(self):
+        random = self.random
+        return f"{self.pick(self.days)} {int(random() * 24):02d}:{int(random() * 60):02d}:00"
+
+    def persona_name(self):
+        """
+        (full name, first name, last name)
+        """
+        random, pick = self.random, self.pick
+        first = pick(NOMBRES)
+        name = first
+        if random() < 0.25:
+            name += " " + pick(NOMBRES)
+        last = pick(APELLIDOS)
+        name += " " + last
+        if random() < 0.15:
+            last = pick(APELLIDOS)
+            name += " " + last
+        return name, first, last
+
+    def company_name(self):
+        """
+        (razón social, slug for its web domain)
+        """
+        pick = self.pick
+        if self.random() < 0.3:
+            first, second = pick(APELLIDOS), pick(APELLIDOS)
+            base = f"{first} y {second}"
+        else:
+            first, second = pick(EMPRESA_PALABRAS), pick(EMPRESA_NOMBRES)
+            base = f"{first} {second}"
+        return f"{base} {pick(SOCIEDADES)}", self.slugs[first] + self.slugs[second]
+
+    def phone(self, mobile=False):
+        random = self.random
+        if mobile:
+            return f"11 {1500 + int(random() * 5500)}-{int(random() * 10000):04d}"
+        return f"0230 44{10 + int(random() * 90)}-{int(random() * 10000):04d}"
+
+    def tables(self):
+        """
+        (table, columns, rows) in load order
+        """
+        rows = self.rows
+        return [
+            ("tipo_consorcista", ["tipoconsorcistaid", "tipo"], [("1", "Propietario"), ("2", "Inquilino")]),
+            ("area", ["area"], [(area,) for area in AREAS]),
+            ("cargo", ["cargo"], [(cargo,) for cargo in self.cargos]),
+            ("camara", ["abreviatura", "camara"], self.camaras),
+            ("sindicato", ["siglas", "sindicato"], self.sindicatos),
+            ("calle", ["calle"], [(calle,) for calle in CALLES]),
+            ("sector", ["sector"], [(sector,) for sector in SECTORES]),
+            ("rubro", ["sectorid", "rubro"], [(str(sectorid), rubro) for sectorid, rubro in self.rubros]),
+            ("subrubro", ["rubroid", "sub_numero", "subrubro"],
+             [(str(rubroid), str(number), name) for rubroid, number, name in self.subrubros]),
+            ("consorcista", ["nombre", "nro_consorcista", "tipoid", "fecha_de_carga"],
+             self.consorcistas(rows["consorcista"])),
+            ("ente", ["nro_socio_cepip", "razonsocial", "cuit", "observaciones", "web", "consorcistaid",
+                      "actividadprincipalid", "actividadsecundariaid", "fecha_de_carga", "esconsorcista", "es_socio"],
+             self.entes(rows["ente"])),
+            ("persona", ["fecha_de_carga", "nombre_apellido", "telefono", "celular", "correo_electronico",
+                         "consorcistaid"],
+             self.personas(rows["persona"])),
+            ("relacion_ente_persona", ["ente_persona_id", "enteid", "personaid", "cargoid", "areaid",
+                                       "fecha_de_carga"],
+             self.relaciones_persona(rows["relacion_ente_persona"])),
+            ("relacion_ente_camara", ["ente_camara_id", "enteid", "camaraid", "fecha_de_carga"],
+             self.relaciones(rows["relacion_ente_camara"], len(self.camaras))),
+            ("relacion_ente_sindicato", ["ente_sindicato_id", "enteid", "sindicatoid", "fecha_de_carga"],
+             self.relaciones(rows["relacion_ente_sindicato"], len(self.sindicatos))),
+            ("parcela", ["parcela", "calle", "numero", "superficie_has", "porcentaje_reglamento", "consorcistaid",
+                         "fraccion", "tieneplanta", "alquilada", "fecha_de_carga", "enteid"]
+             + (["superficie_has_"] if self.superficie_text else []),
+             self.parcelas(rows["parcela"])),
+            ("parcela_alquilada", ["alquilerid", "enteid", "parcelaid", "fecha_de_carga"],
+             self.parcelas_alquiladas(rows["parcela_alquilada"])),
+            ("accesos_ente", ["accesoid", "enteid", "calleid", "altura", "fecha_de_carga"],
+             self.accesos(rows["accesos_ente"])),
+            ("anotaciones", ["anotacionid", "fecha_de_carga", "personaid", "enteid", "anotacion", "fecha_limite"],
+             self.anotaciones(rows["anotaciones"])),
+            ("condomino", ["personaunoid", "personadosid", "consorcistaid"], self.condominos(rows["condomino"])),
+        ]
+
+    def consorcistas(self, n):
+        for i in range(1, n + 1):
+            name = self.persona_name()[0] if self.chance("consorcista.persona") else self.company_name()[0]
+            yield name, str(i), "2" if self.chance("consorcista.inquilino") else "1", self.day()
+
+    def entes(self, n):
+        random, chance, ref = self.random, self.chance, self.ref
+        consorcistas, rubros = self.rows["consorcista"], len(self.rubros)
+        rubro_ids = [str(i) for i in range(1, rubros + 1)]
+        socio = 0
+        for _ in range(n):
+            name, web = self.company_name()
+            es_socio = chance("ente.es_socio")
+            esconsorcista = chance("ente.esconsorcista")
+            if es_socio:
+                socio += 1
+            number = cuit(random, 33 if random() < 0.25 else 30)
+            yield (
+                str(socio) if es_socio else NULL,
+                name,
+                str(number if self.full_cuit else number // 10 % 100_000_000),
+                self.pick(ANOTACIONES) if chance("ente.observaciones") else NULL,
+                f"www.{web[:20]}.com.ar" if chance("ente.web") else NULL,
+                ref(consorcistas) if esconsorcista else NULL,
+                self.rng.choices(rubro_ids, cum_weights=self.rubro_weights)[0],
+                ref(rubros) if chance("ente.actividadsecundaria") else NULL,
+                self.day(),
+                TRUE if esconsorcista else FALSE,
+                TRUE if es_socio else FALSE,
+            )
+
+    def personas(self, n):
+        random, chance, slugs = self.random, self.chance, self.slugs
+        consorcistas = self.rows["consorcista"]
+        for _ in range(n):
+            name, first, last = self.persona_name()
+            email = NULL
+            if chance("persona.email"):
+                email = f"{slugs[first]}.{slugs[last]}{1 + int(random() * 99)}@{self.pick(DOMINIOS_CORREO)}"
+            yield (
+                self.moment(),
+                name,
+                self.phone() if chance("persona.telefono") else NULL,
+                self.phone(mobile=True) if chance("persona.celular") else NULL,
+                email,
+                self.ref(consorcistas) if chance("persona.consorcista") else NULL,
+            )
+
+    def relaciones_persona(self, n):
+        # Relation i belongs to persona 1 + i % personas, as in seed_scaled,
+        # so every persona has at least one empresa once n >= personas
+        ref = self.ref
+        entes, personas, cargos = self.rows["ente"], self.rows["persona"], len(self.cargos)
+        for i in range(1, n + 1):
+            yield (
+                str(i),
+                ref(entes),
+                str(1 + i % personas),
+                ref(cargos),
+                ref(len(AREAS)) if self.chance("relacion.area") else NULL,
+                self.day(),
+            )
+
+    def relaciones(self, n, targets):
+        entes = self.rows["ente"]
+        for i in range(1, n + 1):
+            yield str(i), self.ref(entes), self.ref(targets), self.day()
+
+    def parcelas(self, n):
+        random, chance, ref = self.random, self.chance, self.ref
+        consorcistas, entes = self.rows["consorcista"], self.rows["ente"]
+        for i in range(1, n + 1):
+            fraccion = FRACCIONES[i % len(FRACCIONES)]
+            hectares = round(self.rng.lognormvariate(0.5, 0.8), 1)
+            alquilada = chance("parcela.alquilada")
+            if alquilada:
+                self.rentals.append(i)
+            row = (
+                f"{fraccion}-{i}",
+                self.pick(CALLES),
+                str(100 + int(random() * 3400)),
+                str(max(1, round(hectares))),
+                ref(40),
+                ref(consorcistas) if chance("parcela.consorcista") else NULL,
+                fraccion,
+                TRUE if chance("parcela.tieneplanta") else FALSE,
+                TRUE if alquilada else FALSE,
+                self.moment(),
+                ref(entes) if chance("parcela.ente") else NULL,
+            )
+            # The production table also carries the hectares as text
+            yield row + (str(hectares),) if self.superficie_text else row
+
+    def parcelas_alquiladas(self, n):
+        entes = self.rows["ente"]
+        parcelas = self.rentals or [1]
+        for i in range(1, n + 1):
+            yield str(i), self.ref(entes), str(self.pick(parcelas)), self.day()
+
+    def accesos(self, n):
+        entes = self.rows["ente"]
+        for i in range(1, n + 1):
+            yield str(i), self.ref(entes), self.ref(len(CALLES)), str(100 + int(self.random() * 3400)), self.day()
+
+    def anotaciones(self, n):
+        entes, personas = self.rows["ente"], self.rows["persona"]
+        for i in range(1, n + 1):
+            loaded = self.day()
+            limit = date.fromisoformat(loaded) + timedelta(days=7 + int(self.random() * 84))
+            yield (str(i), loaded, self.ref(personas), self.ref(entes), self.pick(ANOTACIONES), str(limit))
+
+    def condominos(self, n):
+        personas, consorcistas = self.rows["persona"], self.rows["consorcista"]
+        for _ in range(n):
+            yield self.ref(personas), self.ref(personas), self.ref(consorcistas)
+
+
+class CopyStream:
+    """
+    File-like object feeding rows to ``copy_expert`` in COPY text format,
+    encoded on demand
+    """
+
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.buffer = b""
+        self.count = 0
+
+    def read(self, size=-1):
+        chunk = []
+        length = len(self.buffer)
+        if self.buffer:
+            chunk.append(self.buffer)
+        while size < 0 or length < size:
+            row = next(self.rows, None)
+            if row is None:
+                break
+            line = ("\t".join(row) + "\n").encode()
+            chunk.append(line)
+            length += len(line)
+            self.count += 1
+        data = b"".join(chunk)
+        if size < 0:
+            self.buffer = b""
+            return data
+        self.buffer = data[size:]
+        return data[:size]
+
+
+def column_types(cursor, table):
+    cursor.execute("SELECT column_name, data_type FROM information_schema.columns WHERE table_name = %s", (table,))
+    return dict(cursor.fetchall())
+
+
+def load(conn, scale, seed=1):
+    """
+    Replace every CEPIP table with generated rows; returns the row counts
+    """
+    with conn.cursor() as cursor:
+        # ente.cuit is INTEGER in the exported schema, too small for 11 digits
+        full_cuit = column_types(cursor, "ente").get("cuit") in ("bigint", "numeric", "character varying", "text")
+        superficie_text = "superficie_has_" in column_types(cursor, "parcela")
+
+    generator = Generator(scale, seed, full_cuit=full_cuit, superficie_text=superficie_text)
+    tables = generator.tables()
+    counts = {}
+
+    autocommit = conn.autocommit
+    conn.autocommit = False
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {', '.join(table for table, _, _ in tables)} RESTART IDENTITY")
+            # Counters are rebuilt below instead of bumped once per row
+            cursor.execute("ALTER TABLE ente DISABLE TRIGGER ente_consorcista_counters_write")
+            cursor.execute("ALTER TABLE parcela DISABLE TRIGGER parcela_consorcista_counters_write")
+            # One data version bump per row would be queued until COMMIT
+            for table, _, _ in tables:
+                cursor.execute(f"ALTER TABLE {table} DISABLE TRIGGER {table}_data_version")
+
+            for table, columns, rows in tables:
+                stream = CopyStream(rows)
+                # The tables were truncated in this transaction, so FREEZE applies
+                cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FREEZE)", stream)
+                counts[table] = stream.count
+
+            cursor.execute("ALTER TABLE ente ENABLE TRIGGER ente_consorcista_counters_write")
+            cursor.execute("ALTER TABLE parcela ENABLE TRIGGER parcela_consorcista_counters_write")
+            for table, _, _ in tables:
+                cursor.execute(f"ALTER TABLE {table} ENABLE TRIGGER {table}_data_version")
+            cursor.execute("""
+                TRUNCATE consorcista_counters;
+                INSERT INTO consorcista_counters (consorcistaid, parcelas_count, empresas_count)
+                SELECT consorcistaid, SUM(parcelas), SUM(empresas)
+                FROM (
+                    SELECT consorcistaid, COUNT(*) AS parcelas, 0 AS empresas
+                    FROM parcela WHERE consorcistaid IS NOT NULL GROUP BY consorcistaid
+                    UNION ALL
+                    SELECT consorcistaid, 0, COUNT(*)
+                    FROM ente WHERE consorcistaid IS NOT NULL GROUP BY consorcistaid
+                ) assignments
+                GROUP BY consorcistaid
+            """)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.autocommit = autocommit
+
+    with conn.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100, help="Multiple of the production row counts")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (same seed, same data)")
+    parser.add_argument("--no-schema", action="store_true", help="Skip creating the schema and migrations")
+    args = parser.parse_args()
+
+    conn = connect()
+    if not args.no_schema:
+        prepare_schema(conn)
+    start = time.perf_counter()
+    counts = load(conn, args.scale, args.seed)
+    elapsed = time.perf_counter() - start
+    conn.close()
+
+    print(f"Generated x{args.scale} ({sum(counts.values())} rows) in {elapsed:.1f} s")
+    print(json.dumps(counts, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Google login verification: fresh transport per login vs cached certificates
+
+Runs AuthService.verify_google_token against a local certificate stub (no
+network, no database). The legacy case builds a new transport per call, as
+logins did before, so every call pays a connection plus a certificate fetch;
+the current case reuses the shared pooled, Cache-Control aware transport.
+
+Usage: python -m benchmarks.google_login [--latency 0.05] [--repeat 50]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from .common import BACKEND_DIR, measure
+from .google_stub import GoogleStub
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per certificate fetch")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed logins per case")
+    args = parser.parse_args()
+
+    with GoogleStub(latency=args.latency) as stub:
+        os.environ["GOOGLE_CERTS_URL"] = stub.certs_url
+        os.environ["GOOGLE_CLIENT_ID"] = stub.client_id
+        if BACKEND_DIR not in sys.path:
+            sys.path.insert(0, BACKEND_DIR)
+        from app import auth
+        from google.auth.transport import requests as google_requests
+        from google.oauth2 import id_token
+
+        token = stub.mint("bench@example.com")
+
+        def legacy():
+            id_token.verify_token(token, google_requests.Request(), stub.client_id, certs_url=stub.certs_url)
+
+        def current():
+            auth.AuthService.verify_google_token(token)
+
+        fetches_before = stub.requests
+        legacy_ms = measure(legacy, repeat=args.repeat, warmup=1)
+        legacy_fetches = stub.requests - fetches_before
+
+        fetches_before = stub.requests
+        current_ms = measure(current, repeat=args.repeat, warmup=1)
+        current_fetches = stub.requests - fetches_before
+
+    print(f"legacy  p50={legacy_ms['p50']:>8.2f} ms  cert fetches={legacy_fetches}")
+    print(f"current p50={current_ms['p50']:>8.2f} ms  cert fetches={current_fetches}")
+    print(json.dumps({
+        "latency_s": args.latency,
+        "legacy_ms": legacy_ms,
+        "legacy_cert_fetches": legacy_fetches,
+        "current_ms": current_ms,
+        "current_cert_fetches": current_fetches,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
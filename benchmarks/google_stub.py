@@ -0,0 +1,110 @@
+"""
+Local stand-in for Google's OAuth2 certificate endpoint
+
+Serves a self-signed signing certificate in the format of
+https://www.googleapis.com/oauth2/v1/certs and mints ID tokens signed with
+its key, so logins can be exercised offline. Point the backend at it with
+GOOGLE_CERTS_URL=<stub.certs_url> and GOOGLE_CLIENT_ID=<stub.client_id>.
+"""
+
+import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+KEY_ID = "stub-key-1"
+
+
+class GoogleStub:
+    """
+    Certificate server running in a background thread
+
+    ``latency`` adds a delay to every certificate response to mimic the
+    round-trip to Google; ``requests`` counts the certificate fetches served.
+    """
+
+    def __init__(self, max_age=3600, latency=0.0, client_id="cepip-stub.apps.googleusercontent.com"):
+        self.max_age = max_age
+        self.latency = latency
+        self.client_id = client_id
+        self.requests = 0
+        self._key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._certs_body = json.dumps({KEY_ID: self._certificate_pem()}).encode()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def certs_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/oauth2/v1/certs"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        return False
+
+    def mint(self, email, sub=None, name=None, expires_in=3600):
+        """
+        ID token for ``email`` as Google would issue it
+        """
+        now = int(time.time())
+        claims = {
+            "iss": "https://accounts.google.com",
+            "aud": self.client_id,
+            "sub": sub or f"google-{email}",
+            "email": email,
+            "email_verified": True,
+            "name": name or email.split("@")[0],
+            "iat": now,
+            "exp": now + expires_in,
+        }
+        return jwt.encode(claims, self._key, algorithm="RS256", headers={"kid": KEY_ID})
+
+    def _certificate_pem(self):
+        subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "cepip-google-stub")])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        certificate = (
+            x509.CertificateBuilder()
+            .subject_name(subject)
+            .issuer_name(subject)
+            .public_key(self._key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=30))
+            .sign(self._key, hashes.SHA256())
+        )
+        return certificate.public_bytes(serialization.Encoding.PEM).decode()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/oauth2/v1/certs":
+                    self.send_error(404)
+                    return
+                if stub.latency:
+                    time.sleep(stub.latency)
+                stub.requests += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Cache-Control", f"public, max-age={stub.max_age}, must-revalidate, no-transform")
+                self.send_header("Content-Length", str(len(stub._certs_body)))
+                self.end_headers()
+                self.wfile.write(stub._certs_body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,184 @@
+"""
+Micro-benchmarks of the per-request CPU work
+
+Times the pure-Python paths every records/tables request goes through,
+without a database or server:
+
+- listing: picking the precompiled listing statement and binding its params
+  (Entity.listing, with search and filters)
+- rows: dict(zip(columns, row)) for a 101-row ente page
+- json: encoding that page (dates and booleans included) the way FastAPI
+  does for a dict response, and the lookup bodies' plain json.dumps
+- token: AuthService.verify_token on a fresh JWT
+- tables: building the /api/tables payload from the registry metadata
+- cursor: next_cursor encoding and decoding
+
+Each case reports the best and median µs per call over alternating rounds.
+``--compare`` checks a previous ``--output`` and exits non-zero when a case
+got slower than ``--tolerance`` percent, so regressions show up in CI.
+
+Usage: python -m benchmarks.hot_paths [--rounds 7] [--output hot.json] [--compare hot.json]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from .common import BACKEND_DIR
+
+PAGE_ROWS = 101  # get_records fetches limit + 1 to know whether there is a next page
+
+ENTE_COLUMNS = [
+    "enteid", "nro_socio_cepip", "razonsocial", "cuit", "observaciones", "web", "consorcistaid",
+    "actividadprincipalid", "actividadsecundariaid", "fecha_de_carga", "esconsorcista", "es_socio", "rubro",
+]
+
+
+def ente_rows(count):
+    """
+    Rows shaped like the ente listing page
+    """
+    return [
+        (n, n if n % 2 else None, f"Metalúrgica del Sur {n} S.A.", 30_000_000 + n,
+         "Pendiente renovación de habilitación" if n % 7 == 0 else None, f"www.empresa{n}.com.ar",
+         n % 50 or None, 1 + n % 89, None, date(2015, 1, 1) + timedelta(days=n), n % 3 == 0, n % 2 == 0,
+         "Autopartes")
+        for n in range(1, count + 1)
+    ]
+
+
+def cases():
+    """
+    (name, zero-argument callable) for every hot path
+    """
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from app.auth import AuthService
+    from app.pagination import decode_cursor, encode_cursor
+    from app.registry import ENTITIES
+    from app.routes.records import _json_body, _rows_to_dicts
+    from app.routes.tables import _tables_payload
+
+    ente = ENTITIES["ente"]
+    no_filters = {"es_socio": None, "esconsorcista": None, "con_email": None, "tieneplanta": None, "alquilada": None}
+    filtered = dict(no_filters, es_socio="true", esconsorcista="false")
+
+    rows = ente_rows(PAGE_ROWS)
+    page = {
+        "data": _rows_to_dicts(ENTE_COLUMNS, rows)[:100],
+        "columns": ente.columns,
+        "pagination": {"page": 3, "limit": 100, "total": 33300, "pages": 333, "count": "exact",
+                       "has_more": True, "next_cursor": None},
+    }
+    lookup = [{"id": n, "nombre": f"Metalúrgica del Sur {n} S.A."} for n in range(1, 334)]
+
+    token = AuthService.create_access_token({"sub": "bench@cepip.local"})
+    counts = {entity.name: 1000 for entity in ENTITIES.values()}
+    cursor = encode_cursor("ente", 123456)
+
+    return [
+        ("listing.plain", lambda: ente.listing(None, no_filters, None, 21, 0)),
+        ("listing.search_filters", lambda: ente.listing("metal", filtered, None, 21, 40)),
+        ("listing.numeric_keyset", lambda: ente.listing("30000123", filtered, 5000, 101, 0)),
+        ("rows.dict_zip_101", lambda: _rows_to_dicts(ENTE_COLUMNS, rows)),
+        ("json.page_jsonable_encoder", lambda: jsonable_encoder(page)),
+        ("json.page_response", lambda: JSONResponse(jsonable_encoder(page)).body),
+        ("json.lookup_body", lambda: _json_body(lookup)),
+        ("token.verify", lambda: AuthService.verify_token(token)),
+        ("tables.payload", lambda: _tables_payload(counts)),
+        ("cursor.roundtrip", lambda: decode_cursor(encode_cursor("ente", 123456), "ente")),
+        ("cursor.decode", lambda: decode_cursor(cursor, "ente")),
+    ]
+
+
+def calibrate(fn, target=0.05):
+    """
+    Calls per timed run so that one run takes about ``target`` seconds
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= target / 10:
+            return max(1, int(number * target / (time.perf_counter() - start)))
+        number *= 10
+
+
+def run(selected, rounds):
+    numbers = {name: calibrate(fn) for name, fn in selected}
+    samples = {name: [] for name, _ in selected}
+    # Alternate the cases round by round so drift affects all alike
+    for _ in range(rounds):
+        for name, fn in selected:
+            number = numbers[name]
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples[name].append((time.perf_counter() - start) / number * 1e6)
+    return {
+        name: {"calls": numbers[name], "best_us": round(min(values), 3),
+               "median_us": round(statistics.median(values), 3)}
+        for name, values in samples.items()
+    }
+
+
+def compare(baseline, current, tolerance):
+    """
+    Print the change of every case present in both runs; return the regressed ones
+    """
+    regressed = []
+    print(f"\nvs {baseline['meta'].get('started_at')} (tolerance {tolerance:.0f}%)")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = (result["best_us"] - before["best_us"]) / before["best_us"] * 100
+        flag = ""
+        if change > tolerance:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<30} {before['best_us']:>10.2f} -> {result['best_us']:>10.2f} µs  {change:+6.1f}%{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=7, help="Timed runs per case (best and median are kept)")
+    parser.add_argument("--cases", default="", help="Only cases containing this text")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=25, help="Allowed slowdown in percent with --compare")
+    args = parser.parse_args()
+
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+
+    selected = [(name, fn) for name, fn in cases() if args.cases in name]
+    report = {
+        "meta": {"started_at": datetime.now().isoformat(timespec="seconds"), "rounds": args.rounds,
+                 "python": sys.version.split()[0]},
+        "results": run(selected, args.rounds),
+    }
+
+    for name, result in report["results"].items():
+        print(f"{name:<30} best {result['best_us']:>10.2f} µs  median {result['median_us']:>10.2f} µs")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressed = compare(json.load(f), report, args.tolerance)
+        if regressed:
+            print(f"❌ {len(regressed)} case(s) slower than the baseline: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Overhead of MetricsMiddleware per request
+
+Drives a minimal FastAPI app directly through ASGI (no server, no database)
+with and without the metrics middleware and reports the added time per
+request. Also times rendering /metrics for the number of routes given.
+
+Usage: python -m benchmarks.metrics_overhead [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from .common import BACKEND_DIR
+
+
+def build_app(with_metrics, metrics=None):
+    from fastapi import FastAPI
+    from app.metrics import MetricsMiddleware
+
+    app = FastAPI()
+
+    @app.get("/api/records/{table_name}")
+    async def records(table_name: str):
+        return {"table": table_name, "data": []}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return app
+
+
+def make_scope(path):
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+
+async def drive(app, requests):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(make_scope(f"/api/records/table{i % 50}"), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="Requests per run")
+    parser.add_argument("--rounds", type=int, default=5, help="Alternating runs per variant (best is kept)")
+    parser.add_argument("--routes", type=int, default=60, help="Distinct route templates when timing render()")
+    args = parser.parse_args()
+
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    from app.metrics import RequestMetrics
+
+    metrics = RequestMetrics()
+    plain = build_app(False)
+    instrumented = build_app(True, metrics)
+    loop = asyncio.new_event_loop()
+
+    # Warm up both apps, then alternate runs so drift affects both alike
+    loop.run_until_complete(drive(plain, 1000))
+    loop.run_until_complete(drive(instrumented, 1000))
+    plain_us, instrumented_us = [], []
+    for _ in range(args.rounds):
+        plain_us.append(loop.run_until_complete(drive(plain, args.requests)))
+        instrumented_us.append(loop.run_until_complete(drive(instrumented, args.requests)))
+    loop.close()
+
+    rendered = RequestMetrics()
+    for n in range(args.routes):
+        for status in (200, 404, 500):
+            rendered.observe("GET", f"/api/route{n}/{{id}}", status, 0.01 * n, 100 * n)
+    start = time.perf_counter()
+    lines = rendered.render()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    result = {
+        "requests": args.requests,
+        "plain_us": round(min(plain_us), 2),
+        "instrumented_us": round(min(instrumented_us), 2),
+        "overhead_us": round(min(instrumented_us) - min(plain_us), 2),
+        "render_routes": args.routes,
+        "render_lines": len(lines),
+        "render_ms": round(render_ms, 3),
+    }
+    print(f"per request: plain {result['plain_us']:.2f} µs  with metrics {result['instrumented_us']:.2f} µs  "
+          f"overhead {result['overhead_us']:.2f} µs")
+    print(f"render: {result['render_lines']} lines for {args.routes} routes in {result['render_ms']:.3f} ms")
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Persona listing: whole-table GROUP BY vs paginate-then-aggregate
+
+Seeds persona at growing sizes and times the SQL that GET /api/records/persona
+issues for its first page against the previous query plan.
+
+Usage: BENCH_DATABASE_URL=... python -m benchmarks.persona_listing [--sizes 1000,10000,100000]
+"""
+
+import argparse
+import asyncio
+import json
+
+from .common import connect, prepare_schema, import_backend, measure, endpoint_kwargs, capture_statements
+
+# Plan used before the listing was reworked: aggregates every persona, applies
+# the search as HAVING, then pages
+LEGACY_QUERY = """
+    SELECT p.*,
+           STRING_AGG(DISTINCT e.razonsocial, ', ' ORDER BY e.razonsocial) as empresas,
+           STRING_AGG(DISTINCT c.cargo, ', ' ORDER BY c.cargo) as cargos
+    FROM persona p
+    LEFT JOIN relacion_ente_persona rep ON p.personaid = rep.personaid
+    LEFT JOIN ente e ON rep.enteid = e.enteid
+    LEFT JOIN cargo c ON rep.cargoid = c.cargoid
+    GROUP BY p.personaid, p.fecha_de_carga, p.nombre_apellido, p.telefono, p.celular, p.correo_electronico, p.consorcistaid
+    {having}
+    ORDER BY p.personaid
+    LIMIT %(limit)s OFFSET 0
+"""
+
+LEGACY_SEARCH_HAVING = """
+    HAVING (p.nombre_apellido ILIKE %(search)s OR p.correo_electronico ILIKE %(search)s OR p.telefono ILIKE %(search)s)
+"""
+
+
+def seed_personas(conn, total):
+    """
+    Replace persona and relacion_ente_persona with ``total`` synthetic personas
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM ente")
+        if cursor.fetchone()[0] == 0:
+            cursor.execute("""
+                INSERT INTO ente (razonsocial, cuit, esconsorcista, es_socio)
+                SELECT 'Empresa ' || g, 30000000 + g, g % 3 = 0, g % 2 = 0
+                FROM generate_series(1, 333) g
+            """)
+        cursor.execute("SELECT COUNT(*) FROM cargo")
+        if cursor.fetchone()[0] == 0:
+            cursor.execute("INSERT INTO cargo (cargo) SELECT 'Cargo ' || g FROM generate_series(1, 284) g")
+
+        cursor.execute("TRUNCATE persona, relacion_ente_persona RESTART IDENTITY")
+        cursor.execute("""
+            INSERT INTO persona (fecha_de_carga, nombre_apellido, telefono, correo_electronico)
+            SELECT CURRENT_TIMESTAMP, 'Persona ' || g, '341' || g, 'persona' || g || '@example.com'
+            FROM generate_series(1, %(total)s) g
+        """, {"total": total})
+        cursor.execute("""
+            INSERT INTO relacion_ente_persona (ente_persona_id, enteid, personaid, cargoid, fecha_de_carga)
+            SELECT g, (SELECT MIN(enteid) FROM ente) + g %% 333, g, (SELECT MIN(cargoid) FROM cargo) + g %% 284, CURRENT_DATE
+            FROM generate_series(1, %(total)s) g
+        """, {"total": total})
+        cursor.execute("ANALYZE persona")
+        cursor.execute("ANALYZE relacion_ente_persona")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Persona row counts to test")
+    parser.add_argument("--limit", type=int, default=20, help="Page size")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per case")
+    parser.add_argument("--search", default="zzz", help="Search term for the filtered case (rare terms show the gap)")
+    args = parser.parse_args()
+
+    conn = connect()
+    prepare_schema(conn)
+
+    import_backend()
+    from app.database import AsyncSessionLocal, async_engine
+    from app.routes.records import get_records
+
+    loop = asyncio.new_event_loop()
+    results = []
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        seed_personas(conn, size)
+
+        db = AsyncSessionLocal()
+        try:
+            for search in (None, args.search):
+                def legacy():
+                    with conn.cursor() as cursor:
+                        having = LEGACY_SEARCH_HAVING if search else ""
+                        cursor.execute(LEGACY_QUERY.format(having=having),
+                                       {"limit": args.limit, "search": f"%{search}%"})
+                        cursor.fetchall()
+
+                kwargs = endpoint_kwargs(get_records, table_name="persona", limit=args.limit, search=search,
+                                         count="none", db=db, current_user={})
+                with capture_statements(async_engine.sync_engine) as statements:
+                    loop.run_until_complete(get_records(**kwargs))
+                page_sql, page_params = statements[-1]
+
+                def current():
+                    with conn.cursor() as cursor:
+                        cursor.execute(page_sql, page_params)
+                        cursor.fetchall()
+
+                result = {
+                    "personas": size,
+                    "search": search,
+                    "legacy_ms": measure(legacy, repeat=args.repeat),
+                    "current_ms": measure(current, repeat=args.repeat),
+                }
+                results.append(result)
+                print(f"personas={size:>7}  search={search or '-':<10}  "
+                      f"legacy p50={result['legacy_ms']['p50']:>9.2f} ms  "
+                      f"current p50={result['current_ms']['p50']:>7.2f} ms")
+        finally:
+            loop.run_until_complete(db.close())
+
+    loop.run_until_complete(async_engine.dispose())
+    loop.close()
+    conn.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Stats endpoints: one COUNT(*) per number vs the current statements
+
+Seeds the core tables at a multiple of production size and times the SQL
+each GET /api/stats/* endpoint issues today (reads of the stats_summary
+read model) against the per-number COUNT(*) statements they originally ran.
+
+Usage: BENCH_DATABASE_URL=... python -m benchmarks.stats_queries [--scale 100]
+"""
+
+import argparse
+import asyncio
+import json
+
+from .common import connect, prepare_schema, import_backend, measure, seed_scaled, capture_statements
+
+# Statements each endpoint ran before the single-pass rewrite
+LEGACY_QUERIES = {
+    "get_stats": [f"SELECT COUNT(*) FROM {table}" for table in (
+        "ente", "persona", "consorcista", "parcela", "sector", "rubro", "subrubro"
+    )],
+    "get_dashboard_stats": [
+        "SELECT COUNT(*) FROM ente",
+        "SELECT COUNT(*) FROM persona",
+        "SELECT COUNT(*) FROM parcela",
+    ],
+    "get_empresas_stats": [
+        "SELECT COUNT(*) FROM ente",
+        "SELECT COUNT(*) FROM ente WHERE es_socio = true",
+        "SELECT COUNT(*) FROM ente WHERE esconsorcista = true",
+        """
+            SELECT COUNT(DISTINCT s.sectorid)
+            FROM ente e
+            JOIN rubro r ON e.actividadprincipalid = r.rubroid
+            JOIN sector s ON r.sectorid = s.sectorid
+        """,
+    ],
+    "get_personas_stats": [
+        "SELECT COUNT(*) FROM persona",
+        "SELECT COUNT(*) FROM persona WHERE correo_electronico IS NOT NULL AND correo_electronico != ''",
+        "SELECT COUNT(*) FROM persona WHERE telefono IS NOT NULL AND telefono != ''",
+        "SELECT to_regclass('persona_ente')",
+    ],
+    "get_consorcistas_stats": [
+        "SELECT COUNT(*) FROM consorcista",
+        "SELECT COALESCE(SUM(parcelas_count), 0) FROM consorcista_counters",
+        "SELECT COUNT(*) FROM ente WHERE esconsorcista = true",
+        "SELECT COUNT(DISTINCT tipoid) FROM consorcista WHERE tipoid IS NOT NULL",
+    ],
+    "get_parcelas_stats": [
+        "SELECT COUNT(*) FROM parcela",
+        "SELECT COUNT(*) FROM parcela WHERE tieneplanta = true",
+        "SELECT COUNT(*) FROM parcela WHERE alquilada = true",
+        """
+            SELECT COALESCE(SUM(CAST(superficie_has_ AS FLOAT)), 0)
+            FROM parcela
+            WHERE superficie_has_ IS NOT NULL
+            AND superficie_has_ != ''
+            AND superficie_has_ ~ '^[0-9]+(\\.[0-9]+)?$'
+        """,
+    ],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100, help="Multiple of the production row counts")
+    parser.add_argument("--repeat", type=int, default=30, help="Timed runs per endpoint")
+    args = parser.parse_args()
+
+    conn = connect()
+    prepare_schema(conn)
+    rows = seed_scaled(conn, args.scale)
+    print(f"Seeded x{args.scale}: {rows}")
+
+    import_backend()
+    from app.database import AsyncSessionLocal, async_engine
+    from app.routes import stats
+
+    loop = asyncio.new_event_loop()
+    results = []
+
+    db = AsyncSessionLocal()
+    try:
+        for name, legacy_queries in LEGACY_QUERIES.items():
+            endpoint = getattr(stats, name)
+            with capture_statements(async_engine.sync_engine) as statements:
+                loop.run_until_complete(endpoint(db=db))
+            current_queries = list(statements)
+
+            def run(queries):
+                def fn():
+                    with conn.cursor() as cursor:
+                        for query in queries:
+                            if isinstance(query, tuple):
+                                cursor.execute(*query)
+                            else:
+                                cursor.execute(query)
+                            cursor.fetchall()
+                return fn
+
+            result = {
+                "endpoint": name,
+                "legacy_statements": len(legacy_queries),
+                "current_statements": len(current_queries),
+                "legacy_ms": measure(run(legacy_queries), repeat=args.repeat),
+                "current_ms": measure(run(current_queries), repeat=args.repeat),
+            }
+            results.append(result)
+            print(f"{name:<24} legacy {result['legacy_statements']} stmts p50={result['legacy_ms']['p50']:>8.2f} ms  "
+                  f"current {result['current_statements']} stmts p50={result['current_ms']['p50']:>8.2f} ms")
+    finally:
+        loop.run_until_complete(db.close())
+
+    loop.run_until_complete(async_engine.dispose())
+    loop.close()
+    conn.close()
+    print(json.dumps({"scale": args.scale, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -89,6 +89,10 @@ class APIClient {
         return this.get(`/records/${table}?${params.toString()}`);
     }
 
+    async getLookups(names) {
+        return this.get(`/records/lookup?names=${encodeURIComponent(names.join(','))}`);
+    }
+
     async getRecord(table, id) {
         return this.get(`/records/${table}/${id}`);
     }
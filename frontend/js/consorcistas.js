@@ -49,7 +49,7 @@ class ConsorcistaManager {
         }
     }
 
-    async loadConsorcistas() {
+    async loadConsorcistas(countMode = 'exact') {
         console.log('Loading consorcistas...');
         
         const tableBody = document.getElementById('consorcistas-table-body');
@@ -59,7 +59,7 @@ class ConsorcistaManager {
         
         try {
             // Load consorcistas data from API with filters
-            const response = await api.getRecords('consorcista', this.currentPage, this.recordsPerPage, this.currentFilters);
+            const response = await api.getRecords('consorcista', this.currentPage, this.recordsPerPage, { ...this.currentFilters, count: countMode });
             this.consorcistas = response.data || [];
             
             // Load statistics
@@ -69,7 +69,7 @@ class ConsorcistaManager {
             this.renderConsorcistaTable();
             
             // Render pagination
-            this.renderPagination(response.pagination);
+            this.renderPagination(this.resolvePagination(response.pagination));
             
         } catch (error) {
             console.error('Error loading consorcistas:', error);
@@ -163,6 +163,16 @@ class ConsorcistaManager {
         }
     }
 
+    resolvePagination(pagination) {
+        // Page changes skip the count; reuse the totals from the last counted load
+        if (pagination && pagination.total === null && this.pagination) {
+            pagination.total = this.pagination.total;
+            pagination.pages = this.pagination.pages;
+        }
+        this.pagination = pagination;
+        return pagination;
+    }
+
     renderPagination(pagination) {
         const paginationContainer = document.getElementById('consorcistas-pagination');
         if (!paginationContainer || !pagination) return;
@@ -223,7 +233,7 @@ class ConsorcistaManager {
 
     async changePage(page) {
         this.currentPage = page;
-        await this.loadConsorcistas();
+        await this.loadConsorcistas('none');
         
         // Scroll to top of table
         const tableContainer = document.querySelector('#consorcistas .table-container');
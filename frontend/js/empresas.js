@@ -61,7 +61,7 @@ class EmpresasManager {
         }
     }
 
-    async loadEmpresas() {
+    async loadEmpresas(countMode = 'exact') {
         console.log('Loading empresas...');
         
         const tableBody = document.getElementById('empresas-table-body');
@@ -75,7 +75,7 @@ class EmpresasManager {
         try {
             console.log('Calling API...');
             // Load empresas data from API with filters
-            const response = await api.getRecords('ente', this.currentPage, this.recordsPerPage, this.currentFilters);
+            const response = await api.getRecords('ente', this.currentPage, this.recordsPerPage, { ...this.currentFilters, count: countMode });
             console.log('API response:', response);
             this.empresas = response.data || [];
             console.log('Empresas loaded:', this.empresas.length);
@@ -89,7 +89,7 @@ class EmpresasManager {
             this.renderEmpresasTable();
             
             // Render pagination
-            this.renderPagination(response.pagination);
+            this.renderPagination(this.resolvePagination(response.pagination));
             
         } catch (error) {
             console.error('Error loading empresas:', error);
@@ -190,6 +190,16 @@ class EmpresasManager {
         return `<a href="http://${web}" target="_blank" class="web-link">${web}</a>`;
     }
 
+    resolvePagination(pagination) {
+        // Page changes skip the count; reuse the totals from the last counted load
+        if (pagination && pagination.total === null && this.pagination) {
+            pagination.total = this.pagination.total;
+            pagination.pages = this.pagination.pages;
+        }
+        this.pagination = pagination;
+        return pagination;
+    }
+
     renderPagination(pagination) {
         const paginationContainer = document.getElementById('empresas-pagination');
         if (!paginationContainer || !pagination) return;
@@ -228,7 +238,7 @@ class EmpresasManager {
 
     async changePage(page) {
         this.currentPage = page;
-        await this.loadEmpresas();
+        await this.loadEmpresas('none');
     }
 
     applyFilters() {
@@ -366,55 +376,42 @@ class EmpresasManager {
 
     async loadEmpresaRelations(ente_id) {
         try {
-            // Load direcciones, camaras, and sindicatos in parallel
-            const [direccionesRes, camarasRes, sindicatosRes] = await Promise.all([
-                fetch(`/api/records/ente/${ente_id}/direcciones`),
-                fetch(`/api/records/ente/${ente_id}/camaras`),
-                fetch(`/api/records/ente/${ente_id}/sindicatos`)
-            ]);
+            // Load direcciones, camaras, and sindicatos in a single request
+            const detail = await api.get(`/records/ente/${ente_id}/detail`);
 
             // Update direcciones
-            if (direccionesRes.ok) {
-                const direccionesData = await direccionesRes.json();
-                const direccionesContainer = document.getElementById('empresa-direcciones');
-                if (direccionesContainer) {
-                    if (direccionesData.direcciones && direccionesData.direcciones.length > 0) {
-                        direccionesContainer.innerHTML = direccionesData.direcciones.map(dir => 
-                            `<div class="relation-item">📍 ${dir.calle} ${dir.altura}</div>`
-                        ).join('');
-                    } else {
-                        direccionesContainer.innerHTML = '<div class="text-muted">Sin direcciones registradas</div>';
-                    }
+            const direccionesContainer = document.getElementById('empresa-direcciones');
+            if (direccionesContainer) {
+                if (detail.direcciones && detail.direcciones.length > 0) {
+                    direccionesContainer.innerHTML = detail.direcciones.map(dir => 
+                        `<div class="relation-item">📍 ${dir.calle} ${dir.altura}</div>`
+                    ).join('');
+                } else {
+                    direccionesContainer.innerHTML = '<div class="text-muted">Sin direcciones registradas</div>';
                 }
             }
 
             // Update camaras
-            if (camarasRes.ok) {
-                const camarasData = await camarasRes.json();
-                const camarasContainer = document.getElementById('empresa-camaras');
-                if (camarasContainer) {
-                    if (camarasData.camaras && camarasData.camaras.length > 0) {
-                        camarasContainer.innerHTML = camarasData.camaras.map(camara => 
-                            `<div class="relation-item">🏢 ${camara.camara}</div>`
-                        ).join('');
-                    } else {
-                        camarasContainer.innerHTML = '<div class="text-muted">Sin cámaras asociadas</div>';
-                    }
+            const camarasContainer = document.getElementById('empresa-camaras');
+            if (camarasContainer) {
+                if (detail.camaras && detail.camaras.length > 0) {
+                    camarasContainer.innerHTML = detail.camaras.map(camara => 
+                        `<div class="relation-item">🏢 ${camara.camara}</div>`
+                    ).join('');
+                } else {
+                    camarasContainer.innerHTML = '<div class="text-muted">Sin cámaras asociadas</div>';
                 }
             }
 
             // Update sindicatos
-            if (sindicatosRes.ok) {
-                const sindicatosData = await sindicatosRes.json();
-                const sindicatosContainer = document.getElementById('empresa-sindicatos');
-                if (sindicatosContainer) {
-                    if (sindicatosData.sindicatos && sindicatosData.sindicatos.length > 0) {
-                        sindicatosContainer.innerHTML = sindicatosData.sindicatos.map(sindicato => 
-                            `<div class="relation-item">👥 ${sindicato.siglas} - ${sindicato.sindicato}</div>`
-                        ).join('');
-                    } else {
-                        sindicatosContainer.innerHTML = '<div class="text-muted">Sin sindicatos asociados</div>';
-                    }
+            const sindicatosContainer = document.getElementById('empresa-sindicatos');
+            if (sindicatosContainer) {
+                if (detail.sindicatos && detail.sindicatos.length > 0) {
+                    sindicatosContainer.innerHTML = detail.sindicatos.map(sindicato => 
+                        `<div class="relation-item">👥 ${sindicato.siglas} - ${sindicato.sindicato}</div>`
+                    ).join('');
+                } else {
+                    sindicatosContainer.innerHTML = '<div class="text-muted">Sin sindicatos asociados</div>';
                 }
             }
 
@@ -62,7 +62,7 @@ class ParcelasManager {
         }
     }
 
-    async loadParcelas() {
+    async loadParcelas(countMode = 'exact') {
         console.log('Loading parcelas...');
         
         const tableBody = document.getElementById('parcelas-table-body');
@@ -72,7 +72,7 @@ class ParcelasManager {
         
         try {
             // Load parcelas data from API with filters
-            const response = await api.getRecords('parcela', this.currentPage, this.recordsPerPage, this.currentFilters);
+            const response = await api.getRecords('parcela', this.currentPage, this.recordsPerPage, { ...this.currentFilters, count: countMode });
             this.parcelas = response.data || [];
             
             // Load statistics
@@ -82,7 +82,7 @@ class ParcelasManager {
             this.renderParcelasTable();
             
             // Render pagination
-            this.renderPagination(response.pagination);
+            this.renderPagination(this.resolvePagination(response.pagination));
             
         } catch (error) {
             console.error('Error loading parcelas:', error);
@@ -179,6 +179,16 @@ class ParcelasManager {
         return `Consorcista #${consorcistaid}`;
     }
 
+    resolvePagination(pagination) {
+        // Page changes skip the count; reuse the totals from the last counted load
+        if (pagination && pagination.total === null && this.pagination) {
+            pagination.total = this.pagination.total;
+            pagination.pages = this.pagination.pages;
+        }
+        this.pagination = pagination;
+        return pagination;
+    }
+
     renderPagination(pagination) {
         const paginationContainer = document.getElementById('parcelas-pagination');
         if (!paginationContainer || !pagination) return;
@@ -217,7 +227,7 @@ class ParcelasManager {
 
     async changePage(page) {
         this.currentPage = page;
-        await this.loadParcelas();
+        await this.loadParcelas('none');
     }
 
     applyFilters() {
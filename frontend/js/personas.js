@@ -106,7 +106,7 @@ class PersonasManager {
         }
     }
 
-    async loadPersonas() {
+    async loadPersonas(countMode = 'exact') {
         console.log('Loading personas...');
         
         const tableBody = document.getElementById('personas-table-body');
@@ -116,7 +116,7 @@ class PersonasManager {
         
         try {
             // Load personas data from API with filters
-            const response = await api.getRecords('persona', this.currentPage, this.recordsPerPage, this.currentFilters);
+            const response = await api.getRecords('persona', this.currentPage, this.recordsPerPage, { ...this.currentFilters, count: countMode });
             this.personas = response.data || [];
             
             // Load statistics
@@ -126,7 +126,7 @@ class PersonasManager {
             this.renderPersonasTable();
             
             // Render pagination
-            this.renderPagination(response.pagination);
+            this.renderPagination(this.resolvePagination(response.pagination));
             
         } catch (error) {
             console.error('Error loading personas:', error);
@@ -223,6 +223,16 @@ class PersonasManager {
         return `<span title="${cargos}">${cargos}</span>`;
     }
 
+    resolvePagination(pagination) {
+        // Page changes skip the count; reuse the totals from the last counted load
+        if (pagination && pagination.total === null && this.pagination) {
+            pagination.total = this.pagination.total;
+            pagination.pages = this.pagination.pages;
+        }
+        this.pagination = pagination;
+        return pagination;
+    }
+
     renderPagination(pagination) {
         const paginationContainer = document.getElementById('personas-pagination');
         if (!paginationContainer || !pagination) return;
@@ -261,7 +271,7 @@ class PersonasManager {
 
     async changePage(page) {
         this.currentPage = page;
-        await this.loadPersonas();
+        await this.loadPersonas('none');
     }
 
     applyFilters() {
@@ -280,28 +290,11 @@ class PersonasManager {
 
     async loadLookupData() {
         try {
-            // Load empresas, cargos, and areas for dropdowns
-            const [empresasResponse, cargosResponse, areasResponse] = await Promise.all([
-                fetch('/api/records/lookup/empresas'),
-                fetch('/api/records/lookup/cargos'),
-                fetch('/api/records/lookup/areas')
-            ]);
-
-            if (empresasResponse.ok) {
-                const empresasData = await empresasResponse.json();
-                this.empresas = empresasData.empresas || [];
-            }
-
-            if (cargosResponse.ok) {
-                const cargosData = await cargosResponse.json();
-                this.cargos = cargosData.cargos || [];
-            }
-
-            if (areasResponse.ok) {
-                const areasData = await areasResponse.json();
-                this.areas = areasData.areas || [];
-            }
-
+            // Load empresas, cargos, and areas for dropdowns in one request
+            const lookups = await api.getLookups(['empresas', 'cargos', 'areas']);
+            this.empresas = lookups.empresas || [];
+            this.cargos = lookups.cargos || [];
+            this.areas = lookups.areas || [];
         } catch (error) {
             console.error('Error loading lookup data:', error);
         }
@@ -0,0 +1,60 @@
+"""
+Concurrent logins: first logins claim the admin slot exactly once and
+repeated logins of one account never duplicate it
+
+Runs the rounds of benchmarks/concurrent_logins.py against the scratch
+database in BENCH_DATABASE_URL (its users are rewritten); skipped when it is
+not set.
+
+Usage: BENCH_DATABASE_URL=... python -m pytest tests
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+pytestmark = pytest.mark.skipif(not os.getenv("BENCH_DATABASE_URL"), reason="BENCH_DATABASE_URL no está configurada")
+
+WORKERS = 32
+ROUNDS = 3
+
+
+@pytest.fixture(scope="module")
+def conn():
+    from benchmarks.common import connect, prepare_schema
+
+    conn = connect()
+    prepare_schema(conn)
+    yield conn
+    conn.close()
+
+
+async def run_round(workers):
+    from benchmarks.concurrent_logins import login_engine, login_round
+
+    engine, login = login_engine(workers)
+    try:
+        return await login_round(workers, login)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize("round_number", range(ROUNDS))
+def test_parallel_logins_create_one_admin_and_one_row_per_account(conn, round_number):
+    from benchmarks.concurrent_logins import count_users, reset_users
+
+    reset_users(conn)
+
+    errors = asyncio.run(run_round(WORKERS))
+
+    assert errors == []
+    users, admins, emails, shared = count_users(conn)
+    assert admins == 1
+    assert users == emails == WORKERS + 1
+    assert shared == 1